@@ -14,7 +14,12 @@ from conans.util.files import load
 
 # complex_search: With ORs and not filtering by not restricted settings
 COMPLEX_SEARCH_CAPABILITY = "complex_search"
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, ]
+# paginated_search: Search results requested in pages with the "limit" and "after" parameters
+PAGINATED_SEARCH_CAPABILITY = "paginated_search"
+# package_files: Download urls of single files of the packages, to update only the changed ones
+PACKAGE_FILES_CAPABILITY = "package_files"
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, PAGINATED_SEARCH_CAPABILITY,
+                       PACKAGE_FILES_CAPABILITY]
 
 __version__ = '0.30.0-dev'
 
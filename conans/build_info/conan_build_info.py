@@ -5,7 +5,6 @@ from collections import defaultdict
 from conans.build_info.model import BuildInfo, BuildInfoModule, BuildInfoModuleArtifact, BuildInfoModuleDependency
 from conans.model.info import ConanInfo, PackageReference
 from conans.model.ref import ConanFileReference
-from conans.util.files import load
 
 
 def _extract_uploads_from_conan_trace(path):
@@ -65,7 +64,7 @@ def _get_upload_modules_with_deps(uploaded_files, downloaded_files):
                            if file_doc["name"] == "conaninfo.txt"]
             if conan_infos:
                 conan_info = conan_infos[0]["path"]
-                info = ConanInfo.loads(load(conan_info))
+                info = ConanInfo.load_file_cached(conan_info)
                 for package_reference in info.full_requires:
                     deps[str(module_id.conan)].add(str(package_reference.conan))
                     deps[str(module_id)].add(str(package_reference))
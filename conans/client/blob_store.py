@@ -0,0 +1,207 @@
+""" Content addressable storage of the files of the local cache, enabled with the
+CONAN_CACHE_BLOBS env var (general.cache_blobs)
+
+The files of the export, export_source and package folders are stored once in the blobs folder,
+named by the md5 of their manifests, and hardlinked from the cache folders. The number of links
+of every blob is its reference count: removing a package folder decrements it, and a blob linked
+only from the blobs folder is garbage, removed by DiskRemover or by "conan cache gc".
+
+The blobs, and so all the linked files, are read-only, a linked file must never be written.
+The blobs folder must be in the same file system than the storage folder, otherwise the files
+are kept as plain copies.
+"""
+import os
+import stat
+from collections import namedtuple
+
+from conans.model.manifest import FileTreeManifest
+from conans.paths import CONAN_MANIFEST
+from conans.util.files import load, md5sum, mkdir
+from conans.util.log import logger
+
+BLOBS_FOLDER = "blobs"
+EXPORT_SOURCE_PREFIX = "export_source/"
+
+BlobStats = namedtuple("BlobStats", "blobs size saved")
+
+
+class BlobStore(object):
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    @property
+    def folder(self):
+        return self._folder
+
+    def _blob_path(self, digest):
+        return os.path.join(self._folder, digest[:2], digest)
+
+    @staticmethod
+    def folder_manifest(folder):
+        manifest_path = os.path.join(folder, CONAN_MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            return FileTreeManifest.loads(load(manifest_path))
+        except Exception as e:  # Corrupted manifest, nothing to store or release
+            logger.debug("Invalid manifest %s: %s" % (manifest_path, str(e)))
+            return None
+
+    @staticmethod
+    def _manifest_files(manifest, folder, exports_sources_folder=None):
+        """ {abs_path: md5} of the files of the manifest. The "export_source/" files are in
+        the 'exports_sources_folder' (only for export manifests)
+        """
+        result = {}
+        for filename, digest in manifest.file_sums.items():
+            if filename.startswith(EXPORT_SOURCE_PREFIX):
+                if not exports_sources_folder:
+                    continue
+                path = os.path.join(exports_sources_folder,
+                                    filename[len(EXPORT_SOURCE_PREFIX):])
+            else:
+                path = os.path.join(folder, filename)
+            result[os.path.normpath(path)] = digest
+        return result
+
+    def store_folder(self, folder, exports_sources_folder=None):
+        """ Moves the files of the 'folder' manifest to the store, replacing them with links.
+        Files already linked, missing, symlinked or with contents different to their manifest
+        md5 are skipped. Returns the number of files linked to existing blobs
+        """
+        manifest = self.folder_manifest(folder)
+        if manifest is None:
+            return 0
+        reused = 0
+        for path, digest in self._manifest_files(manifest, folder,
+                                                 exports_sources_folder).items():
+            try:
+                reused += self._store_file(path, digest)
+            except (IOError, OSError) as e:
+                # Different file systems, too many links... the file is kept as is
+                logger.debug("Not storing blob of %s: %s" % (path, str(e)))
+        return reused
+
+    def _store_file(self, path, digest):
+        if not os.path.isfile(path) or os.path.islink(path):
+            return False
+        blob = self._blob_path(digest)
+        if os.path.exists(blob):
+            blob_stat, file_stat = os.stat(blob), os.stat(path)
+            if blob_stat.st_ino == file_stat.st_ino and blob_stat.st_dev == file_stat.st_dev:
+                return False
+            # Never trust a manifest not matching the contents
+            if blob_stat.st_size != file_stat.st_size or md5sum(path) != digest:
+                return False
+            _replace_with_link(blob, path)
+            return True
+        if md5sum(path) != digest:
+            return False
+        mkdir(os.path.dirname(blob))
+        _make_read_only(path)
+        try:
+            os.link(path, blob)
+        except OSError:
+            if not os.path.exists(blob):  # Otherwise, stored concurrently, link it next time
+                raise
+        return False
+
+    def link_files(self, folder):
+        """ Links into 'folder' the files of its manifest already in the store, before
+        extracting a downloaded package there. Returns the set of linked relative paths,
+        that have not to be extracted
+        """
+        manifest = self.folder_manifest(folder)
+        if manifest is None:
+            return set()
+        linked = set()
+        for filename, digest in manifest.file_sums.items():
+            blob = self._blob_path(digest)
+            path = os.path.join(folder, filename)
+            if not os.path.exists(blob) or os.path.lexists(path):
+                continue
+            try:
+                mkdir(os.path.dirname(path))
+                os.link(blob, path)
+                linked.add(filename)
+            except OSError as e:  # Blob removed concurrently, different file systems...
+                logger.debug("Not linking blob %s: %s" % (blob, str(e)))
+        return linked
+
+    def folder_digests(self, folder):
+        """ The digests of the files of the 'folder' manifest, to release() them
+        after removing the folder
+        """
+        manifest = self.folder_manifest(folder)
+        return set(manifest.file_sums.values()) if manifest else set()
+
+    def release(self, digests):
+        """ Removes the given blobs if they are no longer linked from the cache
+        """
+        removed = 0
+        for digest in digests:
+            removed += self._remove_unused(self._blob_path(digest)) is not None
+        return removed
+
+    @staticmethod
+    def _remove_unused(blob):
+        try:
+            blob_stat = os.stat(blob)
+            if blob_stat.st_nlink > 1:
+                return None
+            os.chmod(blob, stat.S_IWRITE | stat.S_IREAD)  # For Windows
+            os.remove(blob)
+            return blob_stat.st_size
+        except OSError:  # Already removed
+            return None
+
+    def _blobs(self):
+        if not os.path.isdir(self._folder):
+            return
+        for subfolder in sorted(os.listdir(self._folder)):
+            subfolder = os.path.join(self._folder, subfolder)
+            if os.path.isdir(subfolder):
+                for name in sorted(os.listdir(subfolder)):
+                    yield os.path.join(subfolder, name)
+
+    def gc(self):
+        """ Removes all the blobs not linked from the cache.
+        Returns the number of removed blobs and the freed bytes
+        """
+        removed, freed = 0, 0
+        for blob in self._blobs():
+            size = self._remove_unused(blob)
+            if size is not None:
+                removed += 1
+                freed += size
+        return removed, freed
+
+    def stats(self):
+        """ Number of blobs, their size and the bytes saved linking them instead of copying:
+        a blob with N links (one of them from the blobs folder) saves N - 2 copies
+        """
+        blobs, size, saved = 0, 0, 0
+        for blob in self._blobs():
+            blob_stat = os.stat(blob)
+            blobs += 1
+            size += blob_stat.st_size
+            saved += blob_stat.st_size * max(blob_stat.st_nlink - 2, 0)
+        return BlobStats(blobs, size, saved)
+
+
+def _make_read_only(path):
+    mode = os.stat(path).st_mode
+    os.chmod(path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def _replace_with_link(blob, path):
+    tmp = path + ".blob"
+    os.link(blob, tmp)
+    try:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)  # For Windows
+        os.remove(path)
+    except OSError:
+        os.remove(tmp)
+        raise
+    os.rename(tmp, path)
@@ -54,6 +54,9 @@ class BuildRequires(object):
         self._registry = registry
         # Do not alter the original
         self._profile_build_requires = copy.copy(profile_build_requires)
+        # {(references, options, profile build_requires patterns): installed deps_graph}
+        # the same build requirements of several packages are installed once per command
+        self._installed_graphs = {}
 
     @staticmethod
     def _get_recipe_build_requires(conanfile):
@@ -79,8 +82,16 @@ class BuildRequires(object):
                               % ", ".join(str(r) for r in package_build_requires.values()))
             # clear root package options, they won't match the build-require
             conanfile.build_requires_options.clear_unscoped_options()
-            build_require_graph = self._install(package_build_requires.values(),
-                                                conanfile.build_requires_options, installer)
+            key = (tuple(sorted(str(r) for r in package_build_requires.values())),
+                   conanfile.build_requires_options.dumps(),
+                   tuple(sorted(self._profile_build_requires)))
+            build_require_graph = self._installed_graphs.get(key)
+            if build_require_graph is None:
+                build_require_graph = self._install(package_build_requires.values(),
+                                                    conanfile.build_requires_options, installer)
+                self._installed_graphs[key] = build_require_graph
+            else:
+                self._output.info("Build requirements already installed")
 
             _apply_build_requires(build_require_graph, conanfile)
             self._output.info("Installed build requirements of: %s" % (str_ref or "PROJECT"))
@@ -1,17 +1,22 @@
 import os
 from collections import OrderedDict
 
+from conans.client.blob_store import BlobStore, BLOBS_FOLDER
 from conans.client.conf import ConanClientConfigParser, default_client_conf, default_settings_yml
 from conans.client.conf.detect import detect_defaults_settings
+from conans.client.lower_caches import lower_caches
 from conans.client.output import Color
+from conans.client.rest.metadata_store import MetadataStore, METADATA_FOLDER
+from conans.client.trash import Trash, TRASH_FOLDER
 from conans.client.profile_loader import read_profile
 from conans.errors import ConanException
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.profile import Profile
-from conans.model.ref import ConanFileReference
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.model.settings import Settings
 from conans.paths import SimplePaths, CONANINFO, PUT_HEADERS
+from conans.util.env_reader import get_env
 from conans.util.files import save, load, normalize
 from conans.util.locks import SimpleLock, ReadLock, WriteLock, NoLock
 
@@ -21,6 +26,7 @@ CONAN_SETTINGS = "settings.yml"
 LOCALDB = ".conan.db"
 REGISTRY = "registry.txt"
 PROFILES_FOLDER = "profiles"
+PACKAGES_TGZ_FOLDER = "package_tgz"
 
 
 class ClientCache(SimplePaths):
@@ -88,6 +94,47 @@ class ClientCache(SimplePaths):
     def registry(self):
         return os.path.join(self.conan_folder, REGISTRY)
 
+    @property
+    def blobs_folder(self):
+        return os.path.join(self.conan_folder, BLOBS_FOLDER)
+
+    @property
+    def blob_store(self):
+        """ The store of the files of the cache, None if CONAN_CACHE_BLOBS is not enabled
+        """
+        if not get_env("CONAN_CACHE_BLOBS", False, environment=os.environ):
+            return None
+        return BlobStore(self.blobs_folder)
+
+    @property
+    def lower_caches(self):
+        """ The read-only LowerCaches looked up before the remotes, None if CONAN_LOWER_CACHES
+        is not defined
+        """
+        return lower_caches()
+
+    @property
+    def metadata_store(self):
+        """ The remote metadata files downloaded, to check for updates with conditional requests
+        """
+        return MetadataStore(os.path.join(self.conan_folder, METADATA_FOLDER))
+
+    @property
+    def trash(self):
+        """ The removed folders, deleted in the background """
+        return Trash(os.path.join(self.conan_folder, TRASH_FOLDER))
+
+    def packages_tgz(self, conan_reference):
+        """ folder of the compressed packages of a recipe, reused by the uploads """
+        assert isinstance(conan_reference, ConanFileReference)
+        return os.path.normpath(os.path.join(self.conan_folder, PACKAGES_TGZ_FOLDER,
+                                             "/".join(conan_reference)))
+
+    def package_tgz(self, package_reference):
+        assert isinstance(package_reference, PackageReference)
+        return os.path.join(self.packages_tgz(package_reference.conan),
+                            package_reference.package_id)
+
     @property
     def conan_config(self):
         if not self._conan_config:
@@ -198,7 +245,7 @@ class ClientCache(SimplePaths):
     @staticmethod
     def read_package_recipe_hash(package_folder):
         filename = os.path.join(package_folder, CONANINFO)
-        info = ConanInfo.loads(load(filename))
+        info = ConanInfo.load_file_cached(filename)
         return info.recipe_hash
 
     def conan_manifests(self, conan_reference):
@@ -1,7 +1,7 @@
 from conans.model.ref import PackageReference, ConanFileReference
 import os
 from conans.util.files import rmdir
-import shutil
+from conans.util.materialize import materialize_tree, HARDLINK
 from conans.errors import ConanException
 from conans.client.loader_parse import load_conanfile_class
 from conans.client.proxy import ConanProxy
@@ -56,14 +56,15 @@ def package_copy(src_ref, user_channel, package_ids, paths, user_io,
                                                      % str(dest_ref)):
             return
         rmdir(export_dest)
-    shutil.copytree(export_origin, export_dest, symlinks=True)
+    materialize_tree(export_origin, export_dest, HARDLINK, symlinks=True)
     user_io.out.info("Copied %s to %s" % (str(src_ref), str(dest_ref)))
 
     export_sources_origin = paths.export_sources(src_ref, short_paths)
     export_sources_dest = paths.export_sources(dest_ref, short_paths)
     if os.path.exists(export_sources_dest):
         rmdir(export_sources_dest)
-    shutil.copytree(export_sources_origin, export_sources_dest, symlinks=True)
+    materialize_tree(export_sources_origin, export_sources_dest, HARDLINK,
+                     symlinks=True)
     user_io.out.info("Copied sources %s to %s" % (str(src_ref), str(dest_ref)))
 
     # Copy packages
@@ -77,5 +78,5 @@ def package_copy(src_ref, user_channel, package_ids, paths, user_io,
                                                          " Override?" % str(package_id)):
                 continue
             rmdir(package_path_dest)
-        shutil.copytree(package_path_origin, package_path_dest, symlinks=True)
+        materialize_tree(package_path_origin, package_path_dest, HARDLINK, symlinks=True)
         user_io.out.info("Copied %s to %s" % (str(package_id), str(dest_ref)))
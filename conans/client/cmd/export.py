@@ -106,6 +106,9 @@ def _export_conanfile(output, paths, conanfile, origin_folder, conan_ref, keep_s
         output.info('Folder: %s' % destination_folder)
         modified_recipe = True
     save(os.path.join(destination_folder, CONAN_MANIFEST), str(digest))
+    blob_store = paths.blob_store
+    if blob_store:
+        blob_store.store_folder(destination_folder, exports_source_folder)
 
     source = paths.source(conan_ref, conanfile.short_paths)
     remove = False
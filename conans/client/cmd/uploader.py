@@ -1,11 +1,19 @@
 import os
+import threading
 import time
+from multiprocessing.pool import ThreadPool
+
+import six
 
 from conans.errors import ConanException, NotFoundException
 from conans.model.ref import PackageReference, ConanFileReference
+from conans.paths import CONAN_MANIFEST
+from conans.util.files import md5sum
 from conans.util.log import logger
+from conans.util.tracer import tracing_enabled
 from conans.client.loader_parse import load_conanfile_class
 from conans.client.proxy import ConanProxy
+from conans.client.tools.files import human_size
 
 
 def _is_a_reference(ref):
@@ -17,6 +25,77 @@ def _is_a_reference(ref):
     return False
 
 
+def _folders_size(*folders):
+    size = 0
+    for folder in folders:
+        for root, _, files in os.walk(folder):
+            size += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return size
+
+
+class _ThreadOutputStream(object):
+    """ Output stream of the parallel uploads: the thread that created it writes to the
+    wrapped stream, the worker threads to the buffer of their current capture()
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self._main_thread = threading.current_thread()
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = six.StringIO()
+        return self._local.buffer
+
+    def _target(self):
+        if threading.current_thread() is self._main_thread:
+            return self.stream
+        buffer = getattr(self._local, "buffer", None)
+        return buffer if buffer is not None else self.capture()
+
+    def write(self, data):
+        self._target().write(data)
+
+    def flush(self):
+        self._target().flush()
+
+    def isatty(self):
+        target = self._target()
+        return hasattr(target, "isatty") and target.isatty()
+
+
+class _UploadSummary(object):
+    """ Counts the uploaded and the skipped (already in the remote) recipes and packages
+    """
+    def __init__(self):
+        self.uploaded, self.uploaded_bytes = 0, 0
+        self.skipped, self.skipped_bytes = 0, 0
+        self._lock = threading.Lock()  # Parallel package uploads
+
+    def add_uploaded(self, upload_result):
+        """ upload_result is the {filename: abs_path} of the uploaded files, False or the
+        deleted files if nothing was transferred
+        """
+        if isinstance(upload_result, dict) and upload_result:
+            size = sum(os.path.getsize(path) for path in upload_result.values())
+            with self._lock:
+                self.uploaded += 1
+                self.uploaded_bytes += size
+        elif not upload_result:
+            with self._lock:
+                self.skipped += 1
+
+    def add_skipped(self, size):
+        with self._lock:
+            self.skipped += 1
+            self.skipped_bytes += size
+
+    def report(self, output):
+        if self.uploaded or self.skipped:
+            output.info("Upload summary: %d uploaded (%s), %d already in the remote, skipped (%s)"
+                        % (self.uploaded, human_size(self.uploaded_bytes),
+                           self.skipped, human_size(self.skipped_bytes)))
+
+
 class CmdUpload(object):
 
     def __init__(self, client_cache, user_io, remote_manager, search_manager, remote):
@@ -24,11 +103,17 @@ class CmdUpload(object):
         self._user_io = user_io
         self._remote_proxy = ConanProxy(self._client_cache, self._user_io, remote_manager, remote)
         self._search_manager = search_manager
+        self._summary = _UploadSummary()
+        self._authenticated = set()
 
     def upload(self, conan_reference_or_pattern, package_id=None, all_packages=None,
                force=False, confirm=False, retry=0, retry_wait=0, skip_upload=False,
-               integrity_check=False):
-        """If package_id is provided, conan_reference_or_pattern is a ConanFileReference"""
+               integrity_check=False, parallel=1):
+        """If package_id is provided, conan_reference_or_pattern is a ConanFileReference
+        parallel: number of packages compressed and uploaded at the same time with --all
+        """
+        if parallel < 1:
+            raise ConanException("--parallel must be a positive number of uploads")
         if package_id and not _is_a_reference(conan_reference_or_pattern):
             raise ConanException("-p parameter only allowed with a valid recipe reference, "
                                  "not with a pattern")
@@ -43,12 +128,15 @@ class CmdUpload(object):
             self._run_upload(conan_reference_or_pattern, all_packages=all_packages,
                              force=force, confirm=confirm,
                              retry=retry, retry_wait=retry_wait, skip_upload=skip_upload,
-                             integrity_check=integrity_check)
+                             integrity_check=integrity_check, parallel=parallel)
 
+        if not skip_upload:
+            self._summary.report(self._user_io.out)
         logger.debug("====> Time manager upload: %f" % (time.time() - t1))
 
     def _run_upload(self, pattern, force=False, all_packages=False, confirm=False,
-                    retry=None, retry_wait=None, skip_upload=False, integrity_check=False):
+                    retry=None, retry_wait=None, skip_upload=False, integrity_check=False,
+                    parallel=1):
         """Upload all the recipes matching 'pattern'"""
         if _is_a_reference(pattern):
             ref = ConanFileReference.loads(pattern)
@@ -71,22 +159,92 @@ class CmdUpload(object):
                 upload = self._user_io.request_boolean(msg)
             if upload:
                 self._upload(conan_ref, force, all_packages, retry, retry_wait, skip_upload,
-                             integrity_check)
+                             integrity_check, parallel)
 
     def _upload(self, conan_ref, force, all_packages, retry, retry_wait, skip_upload,
-                integrity_check):
+                integrity_check, parallel=1):
         """Uploads the recipes and binaries identified by conan_ref"""
-        if not force:
-            self._check_recipe_date(conan_ref)
         self._user_io.out.info("Uploading %s" % str(conan_ref))
-        self._remote_proxy.upload_recipe(conan_ref, retry, retry_wait, skip_upload)
+        if skip_upload:
+            self._remote_proxy.upload_recipe(conan_ref, retry, retry_wait, skip_upload)
+        elif not self._recipe_up_to_date(conan_ref, force):
+            result = self._remote_proxy.upload_recipe(conan_ref, retry, retry_wait, skip_upload)
+            self._summary.add_uploaded(result)
         if all_packages:
             self._check_reference(conan_ref)
 
-            for index, package_id in enumerate(self._client_cache.conan_packages(conan_ref)):
-                total = len(self._client_cache.conan_packages(conan_ref))
+            package_ids = self._client_cache.conan_packages(conan_ref)
+            remote_digests = None
+            if self._skip_unchanged(skip_upload) and package_ids:
+                remote_digests = self._remote_proxy.get_packages_digests(conan_ref, package_ids)
+                # Not supported by the server, never requested again for every package
+                if remote_digests is None:
+                    remote_digests = {}
+            if parallel > 1 and len(package_ids) > 1:
+                self._upload_packages_parallel(conan_ref, package_ids, parallel, retry,
+                                               retry_wait, skip_upload, integrity_check,
+                                               remote_digests)
+                return
+            total = len(package_ids)
+            for index, package_id in enumerate(package_ids):
                 self.upload_package(PackageReference(conan_ref, package_id), index + 1, total,
-                                    retry, retry_wait, skip_upload, integrity_check)
+                                    retry, retry_wait, skip_upload, integrity_check,
+                                    remote_digests)
+
+    def _upload_packages_parallel(self, conan_ref, package_ids, parallel, retry, retry_wait,
+                                  skip_upload, integrity_check, remote_digests):
+        """ Compresses and uploads the packages with a pool of 'parallel' threads, after the
+        recipe. Every file keeps its own retries. The output of every package is buffered, and
+        only printed if its upload fails, the progress is one line per finished package.
+        At the first failure no more packages are started, and its error is raised once the
+        running ones finish
+        """
+        if not skip_upload:
+            self._check_credentials(conan_ref)  # Never request the login from a worker
+        output = self._user_io.out
+        stream = _ThreadOutputStream(output.stream)
+        total = len(package_ids)
+        failed = threading.Event()
+
+        def upload(args):
+            """ Returns (package_id, status, error, buffered output), without status if
+            cancelled after a failure
+            """
+            index, package_id = args
+            if failed.is_set():
+                return package_id, None, None, None
+            log = stream.capture()
+            try:
+                result = self.upload_package(PackageReference(conan_ref, package_id), index,
+                                             total, retry, retry_wait, skip_upload,
+                                             integrity_check, remote_digests)
+            except Exception as exc:
+                failed.set()
+                return package_id, None, exc, log.getvalue()
+            status = "compressed" if skip_upload else "uploaded" if result else "up to date"
+            return package_id, status, None, None
+
+        output.info("Uploading %d packages, %d in parallel" % (total, parallel))
+        error = None
+        pool = ThreadPool(parallel)
+        with output.redirect(stream):
+            try:
+                done = 0
+                results = pool.imap_unordered(upload, enumerate(package_ids, 1))
+                for package_id, status, exc, log in results:
+                    if exc is not None:
+                        output.write(log)
+                        output.error("Package %s upload failed: %s" % (package_id, str(exc)))
+                        error = error or exc
+                    elif status:
+                        done += 1
+                        output.info("[%d/%d] Package %s: %s" % (done, total, package_id,
+                                                                status))
+            finally:
+                pool.close()
+                pool.join()
+        if error is not None:
+            raise error
 
     def _check_reference(self, conan_reference):
         try:
@@ -102,26 +260,76 @@ class CmdUpload(object):
                                  "no packages can be uploaded")
 
     def upload_package(self, package_ref, index=1, total=1, retry=None, retry_wait=None,
-                       skip_upload=False, integrity_check=False):
-        """Uploads the package identified by package_id"""
+                       skip_upload=False, integrity_check=False, remote_digests=None):
+        """Uploads the package identified by package_id
+        remote_digests: {package_id: md5 of the manifest} of the packages in the remote, if
+        already requested, empty if not supported by the remote. The packages with the same
+        manifest are not compressed nor uploaded
+        """
         msg = ("Uploading package %d/%d: %s" % (index, total, str(package_ref.package_id)))
         t1 = time.time()
         self._user_io.out.info(msg)
-        self._remote_proxy.upload_package(package_ref, retry, retry_wait, skip_upload,
-                                          integrity_check)
+        if self._skip_unchanged(skip_upload):
+            if remote_digests is None:
+                remote_digests = self._remote_proxy.get_packages_digests(
+                    package_ref.conan, [package_ref.package_id])
+            package_folder = self._client_cache.package(package_ref, short_paths=None)
+            manifest_path = os.path.join(package_folder, CONAN_MANIFEST)
+            remote_digest = (remote_digests or {}).get(package_ref.package_id)
+            if remote_digest and os.path.exists(manifest_path) and \
+                    md5sum(manifest_path) == remote_digest:
+                self._check_credentials(package_ref.conan)
+                self._user_io.out.info("Package is up to date, upload skipped")
+                self._summary.add_skipped(_folders_size(package_folder))
+                return False
+        result = self._remote_proxy.upload_package(package_ref, retry, retry_wait, skip_upload,
+                                                   integrity_check)
+        if not skip_upload:
+            self._summary.add_uploaded(result)
 
         logger.debug("====> Time uploader upload_package: %f" % (time.time() - t1))
+        return result
+
+    @staticmethod
+    def _skip_unchanged(skip_upload):
+        """ The build info extraction from the trace file needs the checksums of the compressed
+        files of every uploaded recipe and package, so nothing is skipped while tracing
+        """
+        return not skip_upload and not tracing_enabled()
 
-    def _check_recipe_date(self, conan_ref):
+    def _check_credentials(self, conan_ref):
+        """ Skipped uploads authenticate too, as the uploads do, once per reference
+        """
+        if conan_ref not in self._authenticated:
+            self._remote_proxy.check_credentials(conan_ref)
+            self._authenticated.add(conan_ref)
+
+    def _recipe_up_to_date(self, conan_ref, force):
+        """ Compares the local and the remote manifests, raising if the remote recipe is newer,
+        unless force. Returns True if they are equal, so the recipe is not compressed nor
+        uploaded
+        """
+        skip_unchanged = self._skip_unchanged(skip_upload=False)
+        if force and not skip_unchanged:
+            return False
         try:
             remote_recipe_manifest = self._remote_proxy.get_conan_digest(conan_ref)
         except NotFoundException:
-            return  # First upload
+            return False  # First upload
 
         local_manifest = self._client_cache.load_manifest(conan_ref)
 
-        if (remote_recipe_manifest != local_manifest and
+        if skip_unchanged and remote_recipe_manifest == local_manifest:
+            self._check_credentials(conan_ref)
+            self._user_io.out.info("Recipe is up to date, upload skipped")
+            self._summary.add_skipped(_folders_size(
+                self._client_cache.export(conan_ref),
+                self._client_cache.export_sources(conan_ref, short_paths=None)))
+            return True
+
+        if (not force and remote_recipe_manifest != local_manifest and
                 remote_recipe_manifest.time > local_manifest.time):
             raise ConanException("Remote recipe is newer than local recipe: "
                                  "\n Remote date: %s\n Local date: %s" %
                                  (remote_recipe_manifest.time, local_manifest.time))
+        return False
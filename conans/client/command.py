@@ -6,6 +6,7 @@ from argparse import ArgumentError
 
 from conans import __version__ as client_version
 from conans.client.conan_api import (Conan, default_manifest_folder)
+from conans.client.command_profiler import CommandProfiler
 from conans.client.conan_command_output import CommandOutputer
 from conans.client.output import Color
 
@@ -362,6 +363,20 @@ class Command(object):
         elif args.subcommand == "install":
             return self._conan.config_install(args.item)
 
+    def cache(self, *args):
+        """Manages the local cache. Deletes the removed folders left in the trash, and the
+        unused blobs of the CONAN_CACHE_BLOBS store.
+        """
+        parser = argparse.ArgumentParser(description=self.cache.__doc__, prog="conan cache")
+        subparsers = parser.add_subparsers(dest='subcommand', help='sub-command help')
+        subparsers.add_parser('gc', help='empty the trash, remove the blobs not used by any '
+                                         'package or recipe, and report the space saved by the '
+                                         'blob store')
+        args = parser.parse_args(*args)
+
+        if args.subcommand == "gc":
+            return self._conan.cache_gc()
+
     def info(self, *args):
         """Gets information about the dependency graph of a recipe.
         You can use it for your current project, by passing a path to a conanfile.py as the
@@ -693,9 +708,12 @@ class Command(object):
         """Removes packages or binaries matching pattern from local cache or remote.
         It can also be used to remove temporary source or build folders in the local conan cache.
         If no remote is specified, the removal will be done by default in the local conan cache.
+        Several patterns can be removed at once. The local folders are moved to the cache trash
+        and deleted in the background, "conan cache gc" deletes any leftover.
         """
         parser = argparse.ArgumentParser(description=self.remove.__doc__, prog="conan remove")
-        parser.add_argument('pattern', help='Pattern name, e.g., openssl/*')
+        parser.add_argument('pattern', nargs="+",
+                            help='Pattern name, e.g., openssl/*, or several of them')
         parser.add_argument('-p', '--packages',
                             help='By default, remove all the packages or select one, '
                                  'specifying the package ID',
@@ -721,7 +739,14 @@ class Command(object):
         parser.add_argument("--outdated", "-o", help="Remove only outdated from recipe packages",
                             default=False, action="store_true")
         args = parser.parse_args(*args)
-        reference = self._check_query_parameter_and_get_reference(args.pattern, args.query)
+        if len(args.pattern) == 1:
+            pattern = args.pattern[0]
+            pattern = self._check_query_parameter_and_get_reference(pattern, args.query) or pattern
+        elif args.query:
+            raise ConanException("-q parameter only allowed with a single valid recipe "
+                                 "reference as search pattern")
+        else:
+            pattern = args.pattern
 
         if args.packages is not None and args.query:
             raise ConanException("'-q' and '-p' parameters can't be used at the same time")
@@ -729,7 +754,7 @@ class Command(object):
         if args.builds is not None and args.query:
             raise ConanException("'-q' and '-b' parameters can't be used at the same time")
 
-        return self._conan.remove(pattern=reference or args.pattern, query=args.query,
+        return self._conan.remove(pattern=pattern, query=args.query,
                                   packages=args.packages, builds=args.builds, src=args.src,
                                   force=args.force, remote=args.remote, outdated=args.outdated)
 
@@ -841,8 +866,8 @@ class Command(object):
                 raise ConanException("'--table' argument can only be used with a "
                                      "reference in the 'pattern' argument")
 
-            refs = self._conan.search_recipes(args.pattern, remote=args.remote,
-                                              case_sensitive=args.case_sensitive)
+            refs = self._conan.iter_search_recipes(args.pattern, remote=args.remote,
+                                                   case_sensitive=args.case_sensitive)
             self._check_query_parameter_and_get_reference(args.pattern, args.query)
             self._outputer.print_search_references(refs, args.pattern, args.raw)
 
@@ -856,6 +881,8 @@ class Command(object):
             If you use the --retry option you can specify how many times should conan try to upload
             the packages in case of failure. The default is 2.
             With --retry_wait you can specify the seconds to wait between upload attempts.
+            With --all, --parallel compresses and uploads that number of packages at the same
+            time, printing one line per finished package.
             If no remote is specified, the first configured remote (by default conan.io, use
             'conan remote list' to list the remotes) will be used.
         """
@@ -889,13 +916,17 @@ class Command(object):
         parser.add_argument('--retry-wait', '--retry_wait', default=5, type=int,
                             help='Waits specified seconds before retry again',
                             action=OnceArgument)
+        parser.add_argument('--parallel', default=1, type=int,
+                            help='With --all, number of packages uploaded in parallel',
+                            action=OnceArgument)
 
         args = parser.parse_args(*args)
         return self._conan.upload(pattern=args.pattern, package=args.package, remote=args.remote,
                                   all_packages=args.all,
                                   force=args.force, confirm=args.confirm, retry=args.retry,
                                   retry_wait=args.retry_wait,
-                                  skip_upload=args.skip_upload, integrity_check=args.check)
+                                  skip_upload=args.skip_upload, integrity_check=args.check,
+                                  parallel=args.parallel)
 
     def remote(self, *args):
         """ Manages the remote list and the package recipes associated to a remote.
@@ -1073,7 +1104,7 @@ class Command(object):
                 ("Creator commands", ("new", "create", "upload", "export", "export-pkg", "test")),
                 ("Package development commands", ("source", "build", "package")),
                 ("Misc commands", ("profile", "remote", "user", "imports", "copy", "remove",
-                                   "alias", "download")),
+                                   "alias", "download", "cache")),
                 ("Deprecated", ("test_package",))]
 
         def check_all_commands_listed():
@@ -1099,6 +1130,8 @@ class Command(object):
         self._user_io.out.writeln("")
         self._user_io.out.writeln('Conan commands. Type "conan <command> -h" for help',
                                   Color.BRIGHT_YELLOW)
+        self._user_io.out.writeln('Any command accepts "--profile-output <file>" (or the '
+                                  'CONAN_PROFILE_OUTPUT env var) to profile it')
 
     def _commands(self):
         """ returns a list of available commands
@@ -1133,9 +1166,11 @@ class Command(object):
         methods
         """
         errors = False
+        args = list(args[0])
         try:
+            profile_output = _pop_profile_output(args)
             try:
-                command = args[0][0]
+                command = args[0]
                 commands = self._commands()
                 method = commands[command]
             except KeyError as exc:
@@ -1149,7 +1184,11 @@ class Command(object):
             except IndexError:  # No parameters
                 self._show_help()
                 return False
-            method(args[0][1:])
+            if profile_output:
+                with CommandProfiler(profile_output, self._user_io.out):
+                    method(args[1:])
+            else:
+                method(args[1:])
         except KeyboardInterrupt as exc:
             logger.error(exc)
             errors = True
@@ -1172,6 +1211,23 @@ class Command(object):
         return errors
 
 
+def _pop_profile_output(args):
+    """ Removes from the command line the --profile-output <file> argument, valid for all the
+    commands. Defaults to the CONAN_PROFILE_OUTPUT env var
+    """
+    for index, arg in enumerate(args):
+        if arg == "--profile-output":
+            if index + 1 == len(args):
+                raise ConanException("argument --profile-output: expected one argument")
+            value = args[index + 1]
+            del args[index:index + 2]
+            return value
+        if arg.startswith("--profile-output="):
+            del args[index]
+            return arg.split("=", 1)[1]
+    return os.environ.get("CONAN_PROFILE_OUTPUT") or None
+
+
 def get_reference_fields(arg_reference):
     """
     :param arg_reference: String with a complete reference, or only user/channel
@@ -0,0 +1,160 @@
+""" Profiling of conan commands, enabled with the --profile-output <file> argument or the
+CONAN_PROFILE_OUTPUT environment variable:
+
+    - <file>: pstats of the command run under cProfile, e.g. to load it with
+      "python -m pstats <file>", snakeviz...
+    - <file>.collapsed: collapsed stacks "frame1;frame2;frame3 count", the input of
+      flamegraph.pl, speedscope... Sampled every few ms (CPU time) where signal.setitimer is
+      available, otherwise the cProfile caller->callee times in microseconds
+    - A summary table of the time spent per install phase, per retrieved node and per REST
+      call, printed at the end of the command
+"""
+import cProfile
+import os
+import pstats
+import signal
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+from six.moves.urllib.parse import urlsplit
+
+from conans.util.tracer import add_action_listener, remove_action_listener
+
+
+def _frame_name(filename, firstlineno, name):
+    return "%s (%s:%d)" % (name, os.path.basename(filename), firstlineno)
+
+
+class _StackSampler(object):
+    """ Samples the stack of the main thread with a SIGPROF timer
+    """
+    interval = 0.005
+
+    def __init__(self):
+        self.stacks = Counter()
+        self._previous_handler = None
+
+    @staticmethod
+    def available():
+        return (hasattr(signal, "setitimer") and
+                isinstance(threading.current_thread(), threading._MainThread))
+
+    def start(self):
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.siginterrupt(signal.SIGPROF, False)  # Restart interrupted system calls
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+    def _sample(self, signum, frame):  # @UnusedVariable
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(_frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        self.stacks[";".join(reversed(stack))] += 1
+
+
+def _collapsed_from_stats(stats):
+    """ Caller;callee stacks with the time of the callee in microseconds, when there are
+    no sampled stacks
+    """
+    stacks = Counter()
+    for func, (_, _, tottime, _, callers) in stats.stats.items():
+        callee = _frame_name(*func)
+        if not callers:
+            stacks[callee] += int(tottime * 1e6)
+        for caller, caller_stats in callers.items():
+            stacks["%s;%s" % (_frame_name(*caller), callee)] += int(caller_stats[2] * 1e6)
+    return stacks
+
+
+class TimingSummary(object):
+    """ Accumulates the durations of the tracer actions of a command
+    """
+    def __init__(self):
+        self.phases = OrderedDict()  # {name: [count, total, max]}
+        self.nodes = defaultdict(float)  # {reference: seconds retrieving it}
+        self.rest_calls = OrderedDict()  # {method + url path: [count, total, max]}
+
+    @staticmethod
+    def _add(table, key, duration):
+        entry = table.setdefault(key, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] = max(entry[2], duration)
+
+    def __call__(self, action, props):
+        duration = props.get("duration")
+        if duration is None:
+            return
+        if action == "SPAN":
+            self._add(self.phases, props["name"], duration)
+        elif action == "REST_API_CALL":
+            path = urlsplit(props["url"]).path.rstrip("/").rsplit("/", 1)[-1]
+            self._add(self.rest_calls, "%s .../%s" % (props["method"], path), duration)
+        else:
+            self._add(self.phases, action.lower(), duration)
+            if action in ("DOWNLOADED_RECIPE", "DOWNLOADED_RECIPE_SOURCES",
+                          "DOWNLOADED_PACKAGE", "PACKAGE_BUILT_FROM_SOURCES"):
+                self.nodes[props["_id"]] += duration
+
+    def write(self, output, total, max_nodes=20):
+        def table(title, rows):
+            if not rows:
+                return
+            output.writeln("")
+            output.writeln("%-60s %7s %10s %10s" % (title, "count", "total s", "max s"))
+            for name, (count, duration, max_duration) in rows:
+                output.writeln("%-60s %7d %10.3f %10.3f" % (name, count, duration, max_duration))
+
+        output.writeln("")
+        output.writeln("Command time: %.3f s" % total)
+        table("Phase", sorted(self.phases.items(), key=lambda x: -x[1][1]))
+        nodes = sorted(self.nodes.items(), key=lambda x: -x[1])[:max_nodes]
+        table("Node retrieval/build", [(ref, (1, duration, duration)) for ref, duration in nodes])
+        table("REST call", sorted(self.rest_calls.items(), key=lambda x: -x[1][1]))
+
+
+class CommandProfiler(object):
+    """ Context manager profiling the wrapped command, writing the pstats to 'output_path',
+    the collapsed stacks next to it and the timing summary to 'output'
+    """
+    def __init__(self, output_path, output):
+        self._output_path = os.path.abspath(output_path)
+        self._output = output
+        self._profile = cProfile.Profile()
+        self._sampler = _StackSampler() if _StackSampler.available() else None
+        self.summary = TimingSummary()
+        self._start = None
+
+    def __enter__(self):
+        add_action_listener(self.summary)
+        if self._sampler:
+            self._sampler.start()
+        self._start = time.time()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profile.disable()
+        total = time.time() - self._start
+        if self._sampler:
+            self._sampler.stop()
+        remove_action_listener(self.summary)
+
+        self._profile.dump_stats(self._output_path)
+        stacks = self._sampler.stacks if self._sampler else None
+        if not stacks:
+            stacks = _collapsed_from_stats(pstats.Stats(self._profile))
+        with open(self._output_path + ".collapsed", "w") as collapsed:
+            for stack, count in sorted(stacks.items()):
+                if count:
+                    collapsed.write("%s %d\n" % (stack, count))
+
+        self.summary.write(self._output, total)
+        self._output.info("Profile written to %s, collapsed stacks to %s.collapsed"
+                          % (self._output_path, self._output_path))
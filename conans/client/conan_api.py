@@ -6,6 +6,7 @@ import requests
 
 import conans
 from conans import __version__ as client_version, tools
+from conans.client.blob_store import BlobStore
 from conans.client.client_cache import ClientCache
 from conans.client.conf import MIN_SERVER_COMPATIBLE_VERSION, ConanClientConfigParser
 from conans.client.conf.detect import detect_defaults_settings
@@ -15,12 +16,13 @@ from conans.client.output import ConanOutput, ScopedOutput
 from conans.client.profile_loader import read_profile, get_profile_path, profile_from_args, \
     read_conaninfo_profile
 from conans.client.remote_manager import RemoteManager
-from conans.client.remote_registry import RemoteRegistry
+from conans.client.remote_registry import RemoteRegistry, registry_batch
 from conans.client.rest.auth_manager import ConanApiAuthManager
 from conans.client.rest.rest_client import RestApiClient
 from conans.client.rest.version_checker import VersionCheckerRequester
 from conans.client.runner import ConanRunner
 from conans.client.store.localdb import LocalDB
+from conans.client.trash import wait_background_purges
 from conans.client.cmd.test import PackageTester
 from conans.client.userio import UserIO
 from conans.errors import ConanException
@@ -35,7 +37,7 @@ from conans.search.search import DiskSearchManager, DiskSearchAdapter
 from conans.util.env_reader import get_env
 from conans.util.files import rmdir, save_files, exception_message_safe, save, mkdir
 from conans.util.log import configure_logger
-from conans.util.tracer import log_command, log_exception
+from conans.util.tracer import log_command, log_exception, flush_trace
 from conans.client.loader_parse import load_conanfile_class
 from conans.client import settings_preprocessor
 from conans.tools import set_global_instances
@@ -64,7 +66,8 @@ def api_method(f):
             log_command(f.__name__, kwargs)
             with tools.environment_append(the_self._client_cache.conan_config.env_vars):
                 # Patch the globals in tools
-                return f(*args, **kwargs)
+                with registry_batch():  # The registered references are saved once, at the end
+                    return f(*args, **kwargs)
         except Exception as exc:
             msg = exception_message_safe(exc)
             try:
@@ -72,6 +75,8 @@ def api_method(f):
             except:
                 pass
             raise
+        finally:
+            flush_trace()
 
     return wrapper
 
@@ -101,7 +106,8 @@ class ConanAPIV1(object):
             # To handle remote connections
             put_headers = client_cache.read_put_headers()
             rest_api_client = RestApiClient(out, requester=version_checker_req,
-                                            put_headers=put_headers)
+                                            put_headers=put_headers,
+                                            metadata_store=client_cache.metadata_store)
             # To store user and token
             localdb = LocalDB(client_cache.localdb)
             # Wraps RestApiClient to add authentication support (same interface)
@@ -683,6 +689,24 @@ class ConanAPIV1(object):
                              src=src, force=force, remote=remote, packages_query=query,
                              outdated=outdated)
 
+    @api_method
+    def cache_gc(self):
+        """ Deletes the removed folders in the trash, and the blobs of the cache store no longer
+        used by any package or recipe
+        """
+        wait_background_purges()
+        purged = self._client_cache.trash.purge()
+        if purged:
+            self._user_io.out.info("Deleted %d removed folders from the trash" % purged)
+        blob_store = BlobStore(self._client_cache.blobs_folder)
+        removed, freed = blob_store.gc()
+        stats = blob_store.stats()
+        out = self._user_io.out
+        out.info("Removed %d unused blobs, %s freed" % (removed, tools.human_size(freed)))
+        out.info("Blob store: %d blobs, %s, %s saved by links"
+                 % (stats.blobs, tools.human_size(stats.size), tools.human_size(stats.saved)))
+        return removed, freed, stats
+
     @api_method
     def copy(self, reference, user_channel, force=False, packages=None):
         """
@@ -707,6 +731,26 @@ class ConanAPIV1(object):
         refs = self._manager.search_recipes(pattern, remote, ignorecase=not case_sensitive)
         return refs
 
+    @api_method
+    def search_recipes_page(self, pattern, remote=None, case_sensitive=False, after=None):
+        """ A page of search_recipes(), after the 'after' cursor of the previous page.
+        Returns (references, next page cursor or None)
+        """
+        return self._manager.search_recipes_page(pattern, remote, not case_sensitive, after)
+
+    def iter_search_recipes(self, pattern, remote=None, case_sensitive=False):
+        """ search_recipes(), but yielding the references while they are received from the
+        remote, in pages if supported by the server. Every page is an API call
+        """
+        refs, next_page = self.search_recipes_page(pattern, remote, case_sensitive)
+        for ref in refs:
+            yield ref
+        while next_page:
+            refs, next_page = self.search_recipes_page(pattern, remote, case_sensitive,
+                                                       next_page)
+            for ref in refs:
+                yield ref
+
     @api_method
     def search_packages(self, reference, query=None, remote=None, outdated=False):
         ret = self._manager.search_packages(reference, remote, packages_query=query,
@@ -715,13 +759,14 @@ class ConanAPIV1(object):
 
     @api_method
     def upload(self, pattern, package=None, remote=None, all_packages=False, force=False,
-               confirm=False, retry=2, retry_wait=5, skip_upload=False, integrity_check=False):
+               confirm=False, retry=2, retry_wait=5, skip_upload=False, integrity_check=False,
+               parallel=1):
         """ Uploads a package recipe and the generated binary packages to a specified remote
         """
         uploader = CmdUpload(self._client_cache, self._user_io, self._manager._remote_manager,
                              self._manager._search_manager, remote)
         return uploader.upload(pattern, package, all_packages, force, confirm, retry,
-                               retry_wait, skip_upload, integrity_check)
+                               retry_wait, skip_upload, integrity_check, parallel)
 
     @api_method
     def remote_list(self):
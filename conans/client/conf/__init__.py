@@ -71,6 +71,7 @@ sysrequires_sudo = True               # environment CONAN_SYSREQUIRES_SUDO
 # bash_path = ""                      # environment CONAN_BASH_PATH (only windows)
 # recipe_linter = False               # environment CONAN_RECIPE_LINTER
 # read_only_cache = True              # environment CONAN_READ_ONLY_CACHE
+# cache_blobs = True                  # environment CONAN_CACHE_BLOBS (store identical files once, hardlinked)
 # pylintrc = path/to/pylintrc_file    # environment CONAN_PYLINTRC
 # cache_no_locks = True
 # user_home_short = your_path         # environment CONAN_USER_HOME_SHORT
@@ -89,6 +90,12 @@ sysrequires_sudo = True               # environment CONAN_SYSREQUIRES_SUDO
 # cmake_find_root_path_mode_include   # environment CONAN_CMAKE_FIND_ROOT_PATH_MODE_INCLUDE
 
 # cpu_count = 1             # environment CONAN_CPU_COUNT
+# copy_threads = 1          # environment CONAN_COPY_THREADS (parallel file copies of package() and imports())
+# materialize_mode = copy   # environment CONAN_MATERIALIZE_MODE (copy, reflink, hardlink, symlink)
+# download_cache = /path/to/download_cache  # environment CONAN_DOWNLOAD_CACHE (files of tools.get() and tools.download())
+# download_cache_size = 10000               # environment CONAN_DOWNLOAD_CACHE_SIZE (MB, least recently used files are removed)
+# lower_caches = /nfs/conan/data            # environment CONAN_LOWER_CACHES (read-only storage folders looked up before the remotes, separated by os.pathsep)
+# delta_updates = True      # environment CONAN_DELTA_UPDATES (--update downloads only the changed files of the packages)
 
 
 [storage]
@@ -135,7 +142,14 @@ class ConanClientConfigParser(ConfigParser, object):
                "CONAN_SYSREQUIRES_SUDO": self._env_c("general.sysrequires_sudo", "CONAN_SYSREQUIRES_SUDO", "False"),
                "CONAN_RECIPE_LINTER": self._env_c("general.recipe_linter", "CONAN_RECIPE_LINTER", "True"),
                "CONAN_CPU_COUNT": self._env_c("general.cpu_count", "CONAN_CPU_COUNT", None),
+               "CONAN_COPY_THREADS": self._env_c("general.copy_threads", "CONAN_COPY_THREADS", None),
+               "CONAN_MATERIALIZE_MODE": self._env_c("general.materialize_mode", "CONAN_MATERIALIZE_MODE", None),
+               "CONAN_DOWNLOAD_CACHE": self._env_c("general.download_cache", "CONAN_DOWNLOAD_CACHE", None),
+               "CONAN_DOWNLOAD_CACHE_SIZE": self._env_c("general.download_cache_size", "CONAN_DOWNLOAD_CACHE_SIZE", None),
+               "CONAN_LOWER_CACHES": self._env_c("general.lower_caches", "CONAN_LOWER_CACHES", None),
+               "CONAN_DELTA_UPDATES": self._env_c("general.delta_updates", "CONAN_DELTA_UPDATES", None),
                "CONAN_READ_ONLY_CACHE": self._env_c("general.read_only_cache", "CONAN_READ_ONLY_CACHE", None),
+               "CONAN_CACHE_BLOBS": self._env_c("general.cache_blobs", "CONAN_CACHE_BLOBS", None),
                "CONAN_USER_HOME_SHORT": self._env_c("general.user_home_short", "CONAN_USER_HOME_SHORT", None),
                "CONAN_VERBOSE_TRACEBACK": self._env_c("general.verbose_traceback", "CONAN_VERBOSE_TRACEBACK", None),
                # http://www.vtk.org/Wiki/CMake_Cross_Compiling
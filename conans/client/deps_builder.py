@@ -9,6 +9,7 @@ from conans.errors import ConanException, conanfile_exception_formatter, ConanEx
 from conans.client.output import ScopedOutput
 import time
 from conans.util.log import logger
+from conans.util.tracer import trace_span
 from collections import defaultdict
 from conans.tools import environment_append
 
@@ -272,11 +273,13 @@ class DepsGraphBuilder(object):
         # enter recursive computation
         t1 = time.time()
         loop_ancestors = []
-        self._load_deps(root_node, Requirements(), dep_graph, public_deps, None, None,
-                        loop_ancestors)
+        with trace_span("graph_load"):
+            self._load_deps(root_node, Requirements(), dep_graph, public_deps, None, None,
+                            loop_ancestors)
         logger.debug("Deps-builder: Time to load deps %s" % (time.time() - t1))
         t1 = time.time()
-        dep_graph.propagate_info()
+        with trace_span("graph_propagate_info"):
+            dep_graph.propagate_info()
         logger.debug("Deps-builder: Propagate info %s" % (time.time() - t1))
         return dep_graph
 
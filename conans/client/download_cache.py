@@ -0,0 +1,145 @@
+""" Cache of the files downloaded with tools.get() and tools.download(), enabled with the
+CONAN_DOWNLOAD_CACHE env var (general.download_cache), the folder of the cache. It can be
+shared by several local caches and processes.
+
+The files are keyed by their URL and the checksums given to tools.get(). Every file is stored
+with its md5, checked, with the given checksums, before using it. The optional
+CONAN_DOWNLOAD_CACHE_SIZE (general.download_cache_size, in MB) limits the size of the cache,
+removing the least recently used files.
+"""
+import os
+import tempfile
+
+from conans.errors import ConanException
+from conans.util.env_reader import get_env
+from conans.util.files import (load, save, md5sum, sha1sum, sha256sum, replace_file, rmdir,
+                               mkdir)
+from conans.util.log import logger
+from conans.util.materialize import materialize_file, REFLINK
+from conans.util.sha import sha1
+
+MD5_EXTENSION = ".md5"
+TMP_PREFIX = "tmp"
+_checksum_functions = {"md5": md5sum, "sha1": sha1sum, "sha256": sha256sum}
+
+
+def download_cache():
+    """ The configured DownloadCache, None if disabled
+    """
+    folder = get_env("CONAN_DOWNLOAD_CACHE", None, environment=os.environ)
+    if not folder:
+        return None
+    max_size = get_env("CONAN_DOWNLOAD_CACHE_SIZE", None, environment=os.environ)
+    try:
+        max_size = int(max_size) * 1024 * 1024 if max_size else None
+    except ValueError:
+        raise ConanException("Invalid CONAN_DOWNLOAD_CACHE_SIZE '%s', it has to be a number "
+                             "of MB" % max_size)
+    return DownloadCache(folder, max_size)
+
+
+class DownloadCache(object):
+
+    def __init__(self, folder, max_size=None):
+        self._folder = folder
+        self._max_size = max_size
+
+    @property
+    def folder(self):
+        return self._folder
+
+    def _entry(self, url, checksums):
+        key = [url] + ["%s:%s" % (name, value) for name, value in sorted(checksums.items())
+                       if value]
+        return os.path.join(self._folder, sha1("\n".join(key).encode()))
+
+    def get(self, url, filename, checksums, download):
+        """ Materializes in 'filename' the cached file of 'url'. If it is not cached, or it is
+        corrupted, download(path) is called to download it to 'path', and it is stored.
+        'checksums' is a {algorithm: value} dict, as given to tools.get().
+        Returns True if the file was cached
+        """
+        entry = self._entry(url, checksums)
+        if self._valid(entry, checksums):
+            try:
+                os.utime(entry, None)  # Last used, for the LRU eviction
+                materialize_file(entry, filename, REFLINK)
+                return True
+            except (IOError, OSError) as e:  # Evicted concurrently
+                logger.debug("Cached download %s not used: %s" % (entry, str(e)))
+
+        mkdir(self._folder)
+        tmp_folder = tempfile.mkdtemp(prefix=TMP_PREFIX, dir=self._folder)
+        try:
+            tmp_file = os.path.join(tmp_folder, os.path.basename(filename))
+            download(tmp_file)
+            if self._matches(tmp_file, checksums):
+                self._store(entry, tmp_file)
+                self._evict(keep=entry)
+                materialize_file(entry, filename, REFLINK)
+            else:  # Never cached, the caller will fail checking the checksums
+                replace_file(tmp_file, filename)
+        finally:
+            rmdir(tmp_folder)
+        return False
+
+    @staticmethod
+    def _store(entry, tmp_file):
+        """ Both files are replaced atomically, a reader of a partially updated entry sees
+        its md5 not matching, and will download it again
+        """
+        md5_file = tmp_file + MD5_EXTENSION
+        save(md5_file, md5sum(tmp_file))
+        replace_file(md5_file, entry + MD5_EXTENSION)
+        replace_file(tmp_file, entry)
+
+    @staticmethod
+    def _matches(path, checksums):
+        for name, value in checksums.items():
+            if value and _checksum_functions[name](path) != value.lower():
+                return False
+        return True
+
+    def _valid(self, entry, checksums):
+        try:
+            stored_md5 = load(entry + MD5_EXTENSION)
+            if md5sum(entry) != stored_md5:
+                logger.debug("Corrupted cached download %s" % entry)
+                return False
+        except (IOError, OSError):  # Not cached
+            return False
+        return self._matches(entry, checksums)
+
+    def _entries(self):
+        """ [(mtime, size, path)] of the cached files
+        """
+        result = []
+        for name in os.listdir(self._folder):
+            if name.startswith(TMP_PREFIX) or name.endswith(MD5_EXTENSION):
+                continue
+            path = os.path.join(self._folder, name)
+            try:
+                st = os.stat(path)
+            except OSError:  # Removed concurrently
+                continue
+            result.append((st.st_mtime, st.st_size, path))
+        return result
+
+    def _evict(self, keep=None):
+        """ Removes the least recently used files over the maximum size, except 'keep'
+        """
+        if not self._max_size:
+            return
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self._max_size:
+                break
+            if path == keep:
+                continue
+            for file_path in (path, path + MD5_EXTENSION):
+                try:
+                    os.remove(file_path)
+                except OSError:  # Removed concurrently
+                    pass
+            total -= size
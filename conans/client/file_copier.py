@@ -1,9 +1,13 @@
 import os
 import fnmatch
-import shutil
-from collections import defaultdict
+import time
+from collections import defaultdict, OrderedDict
+from multiprocessing.pool import ThreadPool
 
 from conans import tools
+from conans.util.env_reader import get_env
+from conans.util.lru_cache import LRUCache
+from conans.util.materialize import materialize_file, materialize_mode, COPY, REFLINK
 
 
 def report_copied_files(copied, output, warn=False):
@@ -20,13 +24,145 @@ def report_copied_files(copied, output, warn=False):
         output.warn("No files copied!")
 
 
+class _FolderIndex(object):
+    """ The names of the files in a folder tree, walked once and reused by all the copy()
+    calls over it, from any FileCopier. It is outdated when a walked folder changes its
+    mtime (a file or folder was added or removed inside it). Folders modified in the last
+    seconds are also listed again, as the mtime resolution could hide a recent change
+    """
+    racy_seconds = 2
+
+    def __init__(self, root, links, excluded):
+        self.root = root
+        self._checked = time.time()  # Folders modified after it have to be listed to check
+        self._files = {}  # {relative folder: (files, linked_folders)} cache of files()
+        self.folders = OrderedDict()  # {relative folder: [files]}, in os.walk order
+        self.linked_folders = []
+        self._mtimes = OrderedDict()  # {abs folder: (mtime, entries)}
+        self._walk(links, excluded)
+
+    def _walk(self, links, excluded):
+        root_src = self.root
+        if not os.path.isdir(root_src):
+            self._mtimes[root_src] = (None, None)
+            return
+        for root, subfolders, files in os.walk(root_src, followlinks=True):
+            if root in excluded:
+                subfolders[:] = []
+                continue
+
+            if links and os.path.islink(root):
+                self.linked_folders.append(os.path.relpath(root, root_src))
+                subfolders[:] = []
+                continue
+            self._mtimes[root] = (os.stat(root).st_mtime, set(subfolders + files))
+            basename = os.path.basename(root)
+            # Skip git or svn subfolders
+            if basename in [".git", ".svn"]:
+                subfolders[:] = []
+                continue
+            if basename == "test_package":  # DO NOT export test_package/build folder
+                try:
+                    subfolders.remove("build")
+                except:
+                    pass
+
+            self.folders[os.path.normpath(os.path.relpath(root, root_src))] = files
+
+    def is_valid(self):
+        checked = time.time()
+        racy_time = self._checked - self.racy_seconds
+        for folder, (mtime, entries) in self._mtimes.items():
+            try:
+                current = os.stat(folder).st_mtime
+            except OSError:
+                current = None
+            if current != mtime:
+                return False
+            if mtime is not None and mtime >= racy_time and set(os.listdir(folder)) != entries:
+                return False
+        # Changes after this check will have a newer mtime than the not racy folders
+        self._checked = checked
+        return True
+
+    def contains(self, folder):
+        """ If the walk of 'folder' is already included in this index
+        """
+        relative = os.path.normpath(os.path.relpath(folder, self.root))
+        return relative in self.folders
+
+    def files(self, folder):
+        """ returns the files of a walked folder and its linked folders, with paths relative
+        to it, as os.walk(folder) would find them
+        """
+        relative = os.path.normpath(os.path.relpath(folder, self.root))
+        result = self._files.get(relative)
+        if result is None:
+            result = self._files[relative] = self._folder_files(relative)
+        return result
+
+    def _folder_files(self, relative):
+        if relative == ".":
+            prefix = ""
+        else:
+            prefix = relative + os.sep
+
+        filenames = []
+        for relative_path, files in self.folders.items():
+            if relative_path == relative:
+                relative_path = "."
+            elif relative_path.startswith(prefix):
+                relative_path = relative_path[len(prefix):]
+            else:
+                continue
+            for f in files:
+                filenames.append(os.path.normpath(os.path.join(relative_path, f)))
+        linked_folders = [linked[len(prefix):] for linked in self.linked_folders
+                          if linked.startswith(prefix)]
+        return filenames, linked_folders
+
+
+# {(root, links, excluded): _FolderIndex}
+_folder_indexes = LRUCache(32)
+
+
+def _get_folder_index(src, root, links, excluded):
+    """ returns an up to date index containing the 'src' folder tree. It is searched in the
+    indexes of 'root' (the FileCopier base folder) and then 'src', creating the index of
+    'root' if 'src' is inside it
+    """
+    def inside(folder, parent):
+        return folder.startswith(parent.rstrip(os.sep) + os.sep)
+
+    candidates = [root, src] if inside(src, root) else [src]
+    # Only the excluded folders inside the tree change the index, usually none
+    excluded = [os.path.normpath(folder) for folder in excluded]
+    excluded = tuple(folder for folder in excluded if inside(folder, candidates[0]))
+    for folder in candidates:
+        key = (folder, links, excluded)
+        index = _folder_indexes.get(key)
+        if index is not None:
+            if index.is_valid():
+                if index.contains(src) or folder == src:
+                    return index
+            else:
+                _folder_indexes.pop(key)
+
+    for folder in candidates:
+        index = _FolderIndex(folder, links, excluded)
+        _folder_indexes.put((folder, links, excluded), index)
+        if index.contains(src) or folder == src:
+            return index
+
+
 class FileCopier(object):
     """ main responsible of copying files from place to place:
     package: build folder -> package folder
     imports: package folder -> user folder
     export: user folder -> store "export" folder
     """
-    def __init__(self, root_source_folder, root_destination_folder, excluded=None):
+    def __init__(self, root_source_folder, root_destination_folder, excluded=None,
+                 max_materialize_mode=REFLINK):
         """
         Takes the base folders to copy resources src -> dst. These folders names
         will not be used in the relative names while copying
@@ -34,9 +170,12 @@ class FileCopier(object):
                                   store build folder
         param root_destination_folder: The base folder to copy things to, typicall the
                                        store package folder
+        param max_materialize_mode: the most sharing CONAN_MATERIALIZE_MODE allowed for
+                                    the copied files
         """
         self._base_src = root_source_folder
         self._base_dst = root_destination_folder
+        self._max_materialize_mode = max_materialize_mode
         self._copied = []
         self._excluded = [root_destination_folder]
         if excluded:
@@ -74,7 +213,8 @@ class FileCopier(object):
 
         files_to_copy, link_folders = self._filter_files(src, pattern, links, excludes,
                                                          ignore_case)
-        copied_files = self._copy_files(files_to_copy, src, dst, keep_path, links)
+        mode = materialize_mode(self._max_materialize_mode)
+        copied_files = self._copy_files(files_to_copy, src, dst, keep_path, links, mode)
         self._link_folders(src, dst, link_folders)
         self._copied.extend(files_to_copy)
         return copied_files
@@ -84,32 +224,9 @@ class FileCopier(object):
         """ return a list of the files matching the patterns
         The list will be relative path names wrt to the root src folder
         """
-        filenames = []
-        linked_folders = []
-        for root, subfolders, files in os.walk(src, followlinks=True):
-            if root in self._excluded:
-                subfolders[:] = []
-                continue
-
-            if links and os.path.islink(root):
-                linked_folders.append(os.path.relpath(root, src))
-                subfolders[:] = []
-                continue
-            basename = os.path.basename(root)
-            # Skip git or svn subfolders
-            if basename in [".git", ".svn"]:
-                subfolders[:] = []
-                continue
-            if basename == "test_package":  # DO NOT export test_package/build folder
-                try:
-                    subfolders.remove("build")
-                except:
-                    pass
-
-            relative_path = os.path.relpath(root, src)
-            for f in files:
-                relative_name = os.path.normpath(os.path.join(relative_path, f))
-                filenames.append(relative_name)
+        src = os.path.normpath(src)
+        index = _get_folder_index(src, os.path.normpath(self._base_src), links, self._excluded)
+        filenames, linked_folders = index.files(src)
 
         if ignore_case:
             filenames = {f.lower(): f for f in filenames}
@@ -147,19 +264,27 @@ class FileCopier(object):
                     os.symlink(link, linked_folder)
 
     @staticmethod
-    def _copy_files(files, src, dst, keep_path, symlinks):
+    def _copy_files(files, src, dst, keep_path, symlinks, mode=COPY):
         """ executes a multiple file copy from [(src_file, dst_file), (..)]
-        managing symlinks if necessary
+        managing symlinks if necessary. The destination folders are created first, and the
+        files are copied by CONAN_COPY_THREADS threads if defined
         """
-        copied_files = []
+        copies = []
         for filename in files:
             abs_src_name = os.path.join(src, filename)
             filename = filename if keep_path else os.path.basename(filename)
             abs_dst_name = os.path.normpath(os.path.join(dst, filename))
-            try:
-                os.makedirs(os.path.dirname(abs_dst_name))
-            except:
-                pass
+            copies.append((abs_src_name, abs_dst_name))
+
+        for folder in sorted(set(os.path.dirname(dst_name) for _, dst_name in copies)):
+            if not os.path.isdir(folder):
+                try:
+                    os.makedirs(folder)
+                except:
+                    pass
+
+        def copy_file(names):
+            abs_src_name, abs_dst_name = names
             if symlinks and os.path.islink(abs_src_name):
                 linkto = os.readlink(abs_src_name)  # @UndefinedVariable
                 try:
@@ -168,6 +293,19 @@ class FileCopier(object):
                     pass
                 os.symlink(linkto, abs_dst_name)  # @UndefinedVariable
             else:
-                shutil.copy2(abs_src_name, abs_dst_name)
-            copied_files.append(abs_dst_name)
-        return copied_files
+                materialize_file(abs_src_name, abs_dst_name, mode)
+            return abs_dst_name
+
+        threads = get_env("CONAN_COPY_THREADS", 1)
+        if threads > 1 and len(copies) > 1:
+            # Same destination from different sources (keep_path=False), the last one wins
+            unique_copies = OrderedDict((dst_name, src_name) for src_name, dst_name in copies)
+            pool = ThreadPool(min(threads, len(unique_copies)))
+            try:
+                pool.map(copy_file, [(src_name, dst_name)
+                                     for dst_name, src_name in unique_copies.items()])
+            finally:
+                pool.close()
+                pool.join()
+            return [dst_name for _, dst_name in copies]
+        return [copy_file(names) for names in copies]
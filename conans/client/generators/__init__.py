@@ -2,7 +2,7 @@ from os.path import join
 
 from conans.client.generators.pkg_config import PkgConfigGenerator
 from conans.errors import ConanException
-from conans.util.files import save, normalize
+from conans.util.files import save_if_changed, normalize
 
 from .virtualrunenv import VirtualRunEnvGenerator
 from .text import TXTGenerator
@@ -64,6 +64,8 @@ registered_generators.add("pkg_config", PkgConfigGenerator)
 
 def write_generators(conanfile, path, output):
     """ produces auxiliary files, required to build a project or a package.
+    Only the files with different contents are written, not to trigger rebuilds of the
+    consumer projects
     """
     for generator_name in conanfile.generators:
         if generator_name not in registered_generators:
@@ -85,14 +87,15 @@ def write_generators(conanfile, path, output):
                     if generator.filename:
                         output.warn("Generator %s is multifile. Property 'filename' not used"
                                     % (generator_name,))
-                    for k, v in content.items():
-                        v = normalize(v)
-                        output.info("Generator %s created %s" % (generator_name, k))
-                        save(join(path, k), v)
+                    files = content
                 else:
-                    content = normalize(content)
-                    output.info("Generator %s created %s" % (generator_name, generator.filename))
-                    save(join(path, generator.filename), content)
+                    files = {generator.filename: content}
+                for filename, file_content in sorted(files.items()):
+                    if save_if_changed(join(path, filename), normalize(file_content)):
+                        output.info("Generator %s created %s" % (generator_name, filename))
+                    else:
+                        output.info("Generator %s: %s is up to date"
+                                    % (generator_name, filename))
             except Exception as e:
                 output.error("Generator %s(file:%s) failed\n%s"
                              % (generator_name, generator.filename, str(e)))
@@ -10,6 +10,7 @@ from conans.errors import ConanException
 from conans.model.manifest import FileTreeManifest
 from conans.tools import environment_append
 from conans.util.files import save, md5sum, load
+from conans.util.materialize import SYMLINK, REFLINK
 
 IMPORTS_MANIFESTS = "conan_imports_manifest.txt"
 
@@ -78,7 +79,8 @@ def run_imports(conanfile, dest_folder, output):
 
 def run_deploy(conanfile, install_folder, output):
     deploy_output = ScopedOutput("%s deploy()" % output.scope, output)
-    file_importer = _FileImporter(conanfile, install_folder)
+    # The deployed files are taken out of the cache, never linked
+    file_importer = _FileImporter(conanfile, install_folder, max_materialize_mode=REFLINK)
     package_copied = set()
 
     # This is necessary to capture FileCopier full destination paths
@@ -110,9 +112,10 @@ class _FileImporter(object):
     It can be also used for Golang projects, in which the packages are always
     source based and need to be copied to the user folder to be built
     """
-    def __init__(self, conanfile, dst_folder):
+    def __init__(self, conanfile, dst_folder, max_materialize_mode=SYMLINK):
         self._conanfile = conanfile
         self._dst_folder = dst_folder
+        self._max_materialize_mode = max_materialize_mode
         self.copied_files = set()
 
     def __call__(self, pattern, dst="", src="", root_package=None, folder=False,
@@ -134,7 +137,8 @@ class _FileImporter(object):
         matching_paths = self._get_folders(root_package)
         for name, matching_path in matching_paths.items():
             final_dst_path = os.path.join(real_dst_folder, name) if folder else real_dst_folder
-            file_copier = FileCopier(matching_path, final_dst_path)
+            file_copier = FileCopier(matching_path, final_dst_path,
+                                     max_materialize_mode=self._max_materialize_mode)
             files = file_copier(pattern, src=src, links=True, ignore_case=ignore_case,
                                 excludes=excludes)
             self.copied_files.update(files)
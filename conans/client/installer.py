@@ -1,12 +1,12 @@
 import os
 import time
-import shutil
 
 from conans.client import tools
 from conans.model.env_info import EnvInfo
 from conans.model.user_info import UserInfo
 from conans.paths import CONANINFO, BUILD_INFO, RUN_LOG_NAME, long_paths_support
-from conans.util.files import save, rmdir, mkdir, make_read_only
+from conans.util.files import save, rmdir, mkdir, make_read_only, make_writable
+from conans.util.materialize import materialize_tree, REFLINK
 from conans.model.ref import PackageReference
 from conans.util.log import logger
 from conans.errors import (ConanException, conanfile_exception_formatter,
@@ -17,7 +17,7 @@ from conans.model.build_info import CppInfo
 from conans.client.output import ScopedOutput
 from conans.client.source import config_source
 from conans.tools import environment_append
-from conans.util.tracer import log_package_built
+from conans.util.tracer import log_package_built, trace_span
 from conans.util.env_reader import get_env
 
 
@@ -106,7 +106,10 @@ class _ConanPackageBuilder(object):
             else:
                 ignore = None
 
-            shutil.copytree(src_folder, self.build_folder, symlinks=True, ignore=ignore)
+            # The build can modify the sources, so they are never linked
+            materialize_tree(src_folder, self.build_folder, REFLINK, symlinks=True,
+                             ignore=ignore)
+            make_writable(self.build_folder)
             logger.debug("Copied to %s", self.build_folder)
             logger.debug("Files copied %s", os.listdir(self.build_folder))
             self._conan_file.source_folder = self.build_folder
@@ -148,6 +151,9 @@ class _ConanPackageBuilder(object):
 
         if get_env("CONAN_READ_ONLY_CACHE", False):
             make_read_only(package_folder)
+        blob_store = self._client_cache.blob_store
+        if blob_store:
+            blob_store.store_folder(package_folder)
 
     def _build_package(self):
         """ builds the package, creating the corresponding build folder if necessary
@@ -167,7 +173,8 @@ class _ConanPackageBuilder(object):
 
         # Read generators from conanfile and generate the needed files
         logger.debug("Writing generators")
-        write_generators(self._conan_file, self.build_folder, self._out)
+        with trace_span("generators", str(self._package_reference)):
+            write_generators(self._conan_file, self.build_folder, self._out)
         logger.debug("Files copied after generators %s", os.listdir(self.build_folder))
 
         # Build step might need DLLs, binaries as protoc to generate source files
@@ -316,9 +323,11 @@ class ConanInstaller(object):
                 package_reference = PackageReference(conan_ref, package_id)
                 check_outdated = self._build_mode.outdated
 
-                if self._remote_proxy.package_available(package_reference,
-                                                        conanfile.short_paths,
-                                                        check_outdated):
+                with trace_span("package_available", str(package_reference)):
+                    available = self._remote_proxy.package_available(package_reference,
+                                                                     conanfile.short_paths,
+                                                                     check_outdated)
+                if available:
                     skip_nodes.add(node)
 
         # Get the private nodes
@@ -385,8 +394,10 @@ class ConanInstaller(object):
 
                 with self._client_cache.conanfile_read_lock(conan_ref):
                     with self._client_cache.package_lock(builder.build_reference):
-                        builder.build()
-                        builder.package()
+                        with trace_span("build", str(package_ref)):
+                            builder.build()
+                        with trace_span("package", str(package_ref)):
+                            builder.package()
 
                         self._remote_proxy.handle_package_manifest(package_ref, installed=True)
                         package_folder = self._client_cache.package(package_ref, conan_file.short_paths)
@@ -432,6 +443,9 @@ class ConanInstaller(object):
                                         self._client_cache, output)
             if get_env("CONAN_READ_ONLY_CACHE", False):
                 make_read_only(package_folder)
+            blob_store = self._client_cache.blob_store
+            if blob_store:
+                blob_store.store_folder(package_folder)
             return True
 
         _raise_package_not_found_error(conan_file, package_reference.conan, output)
@@ -444,6 +458,11 @@ class ConanInstaller(object):
 
     @staticmethod
     def _propagate_info(conan_file, conan_ref, flat, deps_graph):
+        with trace_span("propagate_info", str(conan_ref) if conan_ref else None):
+            ConanInstaller._propagate_node_info(conan_file, conan_ref, flat, deps_graph)
+
+    @staticmethod
+    def _propagate_node_info(conan_file, conan_ref, flat, deps_graph):
         # Get deps_cpp_info from upstream nodes
         node_order = deps_graph.ordered_closure((conan_ref, conan_file), flat)
         public_deps = [name for name, req in conan_file.requires.items() if not req.private]
@@ -492,9 +511,9 @@ class ConanInstaller(object):
                         if self._build_mode.forced(conan_file, conan_ref):
                             build_node = True
                         else:
-                            available = self._remote_proxy.package_available(package_reference,
-                                                                             conan_file.short_paths,
-                                                                             check_outdated)
+                            with trace_span("package_available", str(package_reference)):
+                                available = self._remote_proxy.package_available(
+                                    package_reference, conan_file.short_paths, check_outdated)
                             build_node = not available
 
                 nodes_to_build.append((conan_ref, package_id, conan_file, build_node))
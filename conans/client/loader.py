@@ -1,5 +1,6 @@
 import os
 
+import six
 
 from conans.client.loader_parse import ConanFileTextLoader, load_conanfile_class
 from conans.errors import ConanException, NotFoundException
@@ -39,11 +40,13 @@ class ConanFileLoader(object):
         try:
             # Prepare the settings for the loaded conanfile
             # Mixing the global settings with the specified for that name if exist
-            tmp_settings = self._settings.copy()
             if self._package_settings and result.name in self._package_settings:
+                tmp_settings = self._settings.copy()
                 # Update the values, keeping old ones (confusing assign)
                 values_tuple = self._package_settings[result.name]
                 tmp_settings.values = Values.from_list(values_tuple)
+            else:
+                tmp_settings = self._settings.copy(self._declared_settings(result))
 
             if reference:
                 result.name = reference.name
@@ -76,6 +79,22 @@ class ConanFileLoader(object):
         except Exception as e:  # re-raise with file name
             raise ConanException("%s: %s" % (conanfile_path, str(e)))
 
+    def _declared_settings(self, conanfile_class):
+        """ The settings the recipe declares, the only ones it keeps, so the others are not
+        copied. None if some of them is not defined, to fail listing all the defined ones
+        """
+        declared = getattr(conanfile_class, "settings", None)
+        if isinstance(declared, six.string_types):
+            declared = [declared]
+        elif not declared:
+            declared = []
+        elif not isinstance(declared, (list, tuple, set, dict)):
+            return None
+        declared = set(str(field) for field in declared)
+        if declared.difference(self._settings.fields):
+            return None
+        return declared
+
     def load_conan_txt(self, conan_txt_path, output):
         if not os.path.exists(conan_txt_path):
             raise NotFoundException("Conanfile not found!")
@@ -0,0 +1,126 @@
+""" Read-only lower caches, enabled with the CONAN_LOWER_CACHES env var (general.lower_caches):
+the storage folders of other caches, separated by os.pathsep, as a cache pre-populated in a
+network or overlay file system. They are looked up in order for the recipes and packages not
+in the local cache, before the remotes.
+
+The recipes found are copied to the local cache. The files of the packages and exported sources
+are symlinked from the local cache (copied if symlinks are not supported), so the binaries are
+not transferred. The lower caches are never written: builds and removals only modify the local
+cache, the only writable one.
+"""
+import os
+import shutil
+import tempfile
+
+from conans.client.loader_parse import load_conanfile_class
+from conans.model.info import ConanInfo
+from conans.paths import SimplePaths, CONANFILE, CONAN_MANIFEST, CONANINFO
+from conans.util.env_reader import get_env
+from conans.util.files import load, rmdir, is_dirty, mkdir
+from conans.util.log import logger
+from conans.util.materialize import link_tree
+from conans.util.windows import CONAN_LINK
+
+
+def lower_caches():
+    """ The configured LowerCaches, None if there are not
+    """
+    folders = get_env("CONAN_LOWER_CACHES", "", environment=os.environ)
+    folders = [f for f in folders.split(os.pathsep) if f.strip()]
+    return LowerCaches(folders) if folders else None
+
+
+def _real_folder(folder):
+    """ The folder the short path 'folder' links to, if it is a short path
+    """
+    link = os.path.join(folder, CONAN_LINK)
+    return load(link) if os.path.exists(link) else folder
+
+
+def _install_folder(src, dst, copy):
+    """ Copies 'src' to a temporary folder, that is renamed to 'dst' when complete, so
+    concurrent processes never see it partially copied. Returns False if 'dst' already exists
+    """
+    parent = os.path.dirname(dst)
+    mkdir(parent)
+    tmp_folder = tempfile.mkdtemp(dir=parent, prefix=".lower")
+    try:
+        tmp = os.path.join(tmp_folder, os.path.basename(dst))
+        copy(src, tmp)
+        try:
+            os.rename(tmp, dst)
+        except OSError:
+            if not os.path.exists(dst):
+                raise
+            return False  # Installed concurrently
+    finally:
+        rmdir(tmp_folder)
+    return True
+
+
+class LowerCaches(object):
+
+    def __init__(self, storage_folders):
+        self._paths = [SimplePaths(os.path.abspath(folder)) for folder in storage_folders]
+
+    def install_recipe(self, conan_reference, client_cache):
+        """ Copies the recipe, and links its exported sources, from the first lower cache
+        that has it to the local 'client_cache'. Returns that lower cache storage folder,
+        None if not found
+        """
+        for paths in self._paths:
+            export = paths.export(conan_reference)
+            if (not os.path.isfile(os.path.join(export, CONANFILE)) or
+                    not os.path.isfile(os.path.join(export, CONAN_MANIFEST))):
+                continue
+            _install_folder(export, client_cache.export(conan_reference), shutil.copytree)
+            export_sources = _real_folder(paths.export_sources(conan_reference))
+            if os.path.isdir(export_sources):
+                conanfile_path = client_cache.conanfile(conan_reference)
+                short_paths = load_conanfile_class(conanfile_path).short_paths
+                _install_folder(export_sources,
+                                client_cache.export_sources(conan_reference, short_paths),
+                                link_tree)
+            return paths.store
+        return None
+
+    def install_package(self, package_reference, short_paths, client_cache):
+        """ Links the files of the package from the first lower cache that has it, built for
+        the same recipe than the local one, to the local 'client_cache'.
+        Returns that lower cache storage folder, None if not found
+        """
+        recipe_manifest = client_cache.load_manifest(package_reference.conan)
+        for paths in self._paths:
+            package_folder = paths.package(package_reference)
+            if is_dirty(package_folder):
+                continue
+            package_folder = _real_folder(package_folder)
+            if (not os.path.isfile(os.path.join(package_folder, CONANINFO)) or
+                    not os.path.isfile(os.path.join(package_folder, CONAN_MANIFEST))):
+                continue
+            try:
+                info = ConanInfo.load_file_cached(os.path.join(package_folder, CONANINFO))
+            except Exception as e:
+                logger.debug("Invalid package %s: %s" % (package_folder, str(e)))
+                continue
+            if info.recipe_hash != recipe_manifest.summary_hash:
+                continue
+            _install_folder(package_folder,
+                            client_cache.package(package_reference, short_paths), link_tree)
+            return paths.store
+        return None
+
+    def resolve_links(self, files):
+        """ The {relative path: abs path} 'files' with the symlinks to the files of the lower
+        caches, installed by link_tree(), replaced by their targets. So they are uploaded
+        with their contents, as they would be dangling links in other machines
+        """
+        stores = [os.path.join(os.path.realpath(paths.store), "") for paths in self._paths]
+        result = {}
+        for name, abs_path in files.items():
+            if os.path.islink(abs_path):
+                target = os.path.realpath(abs_path)
+                if any(target.startswith(store) for store in stores):
+                    abs_path = target
+            result[name] = abs_path
+        return result
@@ -31,6 +31,7 @@ from conans.search.search import filter_outdated
 from conans.tools import environment_append
 from conans.util.files import save, rmdir, normalize, mkdir, load
 from conans.util.log import logger
+from conans.util.tracer import trace_span
 
 
 class BuildMode(object):
@@ -197,6 +198,9 @@ class ConanManager(object):
             package_output = ScopedOutput(str(reference), self._user_io.out)
             packager.create_package(conanfile, source_folder, build_folder, dest_package_folder,
                                     install_folder, package_output, local=True)
+            blob_store = self._client_cache.blob_store
+            if blob_store:
+                blob_store.store_folder(dest_package_folder)
 
     def download(self, reference, package_ids, remote=None):
         """ Download conanfile and specified packages to local repository
@@ -381,7 +385,8 @@ class ConanManager(object):
                 tmp = list(conanfile.generators)  # Add the command line specified generators
                 tmp.extend([g for g in generators if g not in tmp])
                 conanfile.generators = tmp
-                write_generators(conanfile, install_folder, output)
+                with trace_span("generators"):
+                    write_generators(conanfile, install_folder, output)
             if not isinstance(reference, ConanFileReference):
                 # Write conaninfo
                 content = normalize(conanfile.info.dumps())
@@ -505,6 +510,14 @@ class ConanManager(object):
         references = self._get_search_adapter(remote).search(pattern, ignorecase)
         return references
 
+    def search_recipes_page(self, pattern, remote, ignorecase, after=None):
+        """ A page of the references of search_recipes(), after the 'after' cursor of the
+        previous page: (references, next page cursor or None). The local cache in one page
+        """
+        if not remote:
+            return self._search_manager.search(pattern, ignorecase), None
+        return self._get_search_adapter(remote).search_page(pattern, ignorecase, after)
+
     def search_packages(self, reference=None, remote=None, packages_query=None, outdated=False):
         """ Return the single information saved in conan.vars about all the packages
             or the packages which match with a pattern
@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+
 from colorama import Fore, Style
 import six
 from conans.util.files import decode_text
@@ -50,6 +52,20 @@ class ConanOutput(object):
     def is_terminal(self):
         return hasattr(self._stream, "isatty") and self._stream.isatty()
 
+    @property
+    def stream(self):
+        return self._stream
+
+    @contextmanager
+    def redirect(self, stream):
+        """ Writes to 'stream' inside the 'with' block, instead of the wrapped one
+        """
+        previous, self._stream = self._stream, stream
+        try:
+            yield
+        finally:
+            self._stream = previous
+
     def writeln(self, data, front=None, back=None):
         self.write(data, front, back, True)
 
@@ -1,3 +1,4 @@
+import itertools
 from collections import OrderedDict
 
 from conans.paths import SimplePaths
@@ -168,21 +169,30 @@ class Printer(object):
                         self._out.writeln("        %s" % repr(d.conan_ref), Color.BRIGHT_YELLOW)
 
     def print_search_recipes(self, references, pattern, raw):
-        """ Print all the exported conans information
+        """ Print all the exported conans information, while they are iterated if
+        'references' is not a list, already sorted
         param pattern: wildcards, e.g., "opencv/*"
         """
-        if not references and not raw:
-            warn_msg = "There are no packages"
-            pattern_msg = " matching the %s pattern" % pattern
-            self._out.info(warn_msg + pattern_msg if pattern else warn_msg)
+        if isinstance(references, list):
+            references = sorted(references)
+        references = iter(references)
+        first = next(references, None)
+        if first is None:
+            if raw:
+                self._out.writeln("")
+            else:
+                warn_msg = "There are no packages"
+                pattern_msg = " matching the %s pattern" % pattern
+                self._out.info(warn_msg + pattern_msg if pattern else warn_msg)
             return
 
         if not raw:
             self._out.info("Existing package recipes:\n")
-            for conan_ref in sorted(references):
+        for conan_ref in itertools.chain([first], references):
+            if raw:
+                self._out.writeln(str(conan_ref))
+            else:
                 self._print_colored_line(str(conan_ref), indent=0)
-        else:
-            self._out.writeln("\n".join([str(ref) for ref in references]))
 
     def print_search_packages(self, packages_props, reference, recipe_hash, packages_query):
         if not packages_props:
@@ -1,5 +1,6 @@
 from conans.client.local_file_getter import get_path
 from conans.client.output import ScopedOutput
+from conans.util.env_reader import get_env
 from conans.util.files import rmdir, mkdir
 from conans.model.ref import PackageReference
 from conans.errors import (ConanException, ConanConnectionError, ConanOutdatedClient,
@@ -45,7 +46,8 @@ class ConanProxy(object):
 
         remote_info = None
         # No package in local cache
-        if not os.path.exists(package_folder):
+        if (not os.path.exists(package_folder) and
+                not self._install_lower_package(package_ref, short_paths, output)):
             try:
                 remote_info = self.get_package_info(package_ref)
             except ConanException:
@@ -84,6 +86,11 @@ class ConanProxy(object):
                         if upstream_manifest.time > read_manifest.time:
                             output.warn("Current package is older than remote upstream one")
                             if self._update:
+                                if self._update_package(package_ref, package_folder,
+                                                        read_manifest, upstream_manifest,
+                                                        output):
+                                    self.handle_package_manifest(package_ref, True)
+                                    return True
                                 output.warn("Removing it to retrieve or build an updated one")
                                 rmdir(package_folder)
                         else:
@@ -97,12 +104,45 @@ class ConanProxy(object):
             output.success('Already installed!')
             installed = True
             log_package_got_from_local_cache(package_ref)
+        elif self._install_lower_package(package_ref, short_paths, output):
+            installed = True
         else:
             installed = self._retrieve_remote_package(package_ref, package_folder,
                                                       output)
         self.handle_package_manifest(package_ref, installed)
         return installed
 
+    def _update_package(self, package_ref, package_folder, read_manifest, upstream_manifest,
+                        output):
+        """ Downloads only the changed files of the package, if the remote supports it
+        """
+        if not get_env("CONAN_DELTA_UPDATES", True, environment=os.environ):
+            return False
+        remote, _ = self._get_remote(package_ref.conan)
+        try:
+            changed = self._remote_manager.update_package(package_ref, package_folder,
+                                                          read_manifest, upstream_manifest,
+                                                          remote)
+        except (ConanException, IOError, OSError) as e:
+            output.warn("Cannot download the changed files of the package: %s" % str(e))
+            return False
+        if changed is None:
+            return False
+        output.success("Package %s updated, %d changed files downloaded"
+                       % (package_ref.package_id, changed))
+        return True
+
+    def _install_lower_package(self, package_ref, short_paths, output):
+        lower_caches = self._client_cache.lower_caches
+        if not lower_caches:
+            return False
+        lower_cache = lower_caches.install_package(package_ref, short_paths, self._client_cache)
+        if lower_cache:
+            output.info("Package %s linked from lower cache '%s'"
+                        % (package_ref.package_id, lower_cache))
+            return True
+        return False
+
     def handle_package_manifest(self, package_ref, installed):
         if installed and self._manifest_manager:
             remote = self._registry.get_ref(package_ref.conan)
@@ -152,7 +192,9 @@ class ConanProxy(object):
                             output.warn("Refused to install!")
                         else:
                             export_path = self._client_cache.export(conan_reference)
-                            DiskRemover(self._client_cache).remove(conan_reference)
+                            remover = DiskRemover(self._client_cache)
+                            remover.remove(conan_reference)
+                            remover.purge()
                             output.info("Retrieving from remote '%s'..." % remote.name)
                             self._remote_manager.get_recipe(conan_reference, export_path, remote)
                             output.info("Updated!")
@@ -165,7 +207,7 @@ class ConanProxy(object):
                                          "Run 'conan remove %s' and run install again "
                                          "to replace it." % (remote.name, conan_reference))
 
-        else:
+        elif not self._install_lower_recipe(conan_reference, output):
             self._retrieve_recipe(conan_reference, output)
 
         if self._manifest_manager:
@@ -177,6 +219,16 @@ class ConanProxy(object):
 
         return conanfile_path
 
+    def _install_lower_recipe(self, conan_reference, output):
+        lower_caches = self._client_cache.lower_caches
+        if not lower_caches:
+            return False
+        lower_cache = lower_caches.install_recipe(conan_reference, self._client_cache)
+        if lower_cache:
+            output.info("Copied from lower cache '%s'" % lower_cache)
+            return True
+        return False
+
     def update_available(self, conan_reference):
         """Returns 0 if the conanfiles are equal, 1 if there is an update and -1 if
         the local is newer than the remote"""
@@ -318,6 +370,18 @@ class ConanProxy(object):
             self._registry.set_ref(package_ref.conan, remote)
         return result
 
+    def check_credentials(self, conan_ref):
+        """ used by upload to authenticate even if nothing is uploaded
+        """
+        remote, _ = self._get_remote(conan_ref)
+        return self._remote_manager.check_credentials(remote)
+
+    def get_packages_digests(self, conan_ref, package_ids):
+        """ used by upload to skip the packages already in the remote
+        """
+        remote, _ = self._get_remote(conan_ref)
+        return self._remote_manager.get_packages_digests(conan_ref, package_ids, remote)
+
     def get_package_info(self, package_ref):
         """ Gets the package info to check if outdated
         """
@@ -331,6 +395,10 @@ class ConanProxy(object):
         remote, _ = self._get_remote()
         return self._remote_manager.search(remote, pattern, ignorecase)
 
+    def search_page(self, pattern=None, ignorecase=True, after=None):
+        remote, _ = self._get_remote()
+        return self._remote_manager.search_page(remote, pattern, ignorecase, after)
+
     def search_remotes(self, pattern=None, ignorecase=True):
         if self._remote_name:
             remote = self._registry.remote(self._remote_name)
@@ -1,17 +1,19 @@
 import os
 import shutil
 import tarfile
+import tempfile
 import time
 import traceback
 
 from requests.exceptions import ConnectionError
 
 from conans.errors import ConanException, ConanConnectionError, NotFoundException
-from conans.model.manifest import gather_files
+from conans.model.manifest import gather_files, FileTreeManifest
 from conans.paths import PACKAGE_TGZ_NAME, CONANINFO, CONAN_MANIFEST, CONANFILE, EXPORT_TGZ_NAME, \
     rm_conandir, EXPORT_SOURCES_TGZ_NAME, EXPORT_SOURCES_DIR_OLD
 from conans.util.files import gzopen_without_timestamps
-from conans.util.files import tar_extract, rmdir, exception_message_safe, mkdir
+from conans.util.files import tar_extract, rmdir, exception_message_safe, mkdir, load, md5, \
+    replace_file
 from conans.util.files import touch
 from conans.util.log import logger
 from conans.util.tracer import log_package_upload, log_recipe_upload,\
@@ -38,6 +40,9 @@ class RemoteManager(object):
             raise ConanException("Cannot upload corrupted recipe '%s'" % str(conan_reference))
         export_src_folder = self._client_cache.export_sources(conan_reference, short_paths=None)
         src_files, src_symlinks = gather_files(export_src_folder)
+        lower_caches = self._client_cache.lower_caches
+        if lower_caches:
+            src_files = lower_caches.resolve_links(src_files)
         the_files = _compress_recipe_files(files, symlinks, src_files, src_symlinks, export_folder,
                                            self._output)
         if skip_upload:
@@ -71,12 +76,7 @@ class RemoteManager(object):
                 self._output.warn("Mismatched checksum '%s' (manifest: %s, file: %s)"
                                   % (fname, h1, h2))
 
-            if PACKAGE_TGZ_NAME in files:
-                try:
-                    tgz_path = os.path.join(package_folder, PACKAGE_TGZ_NAME)
-                    os.unlink(tgz_path)
-                except Exception:
-                    pass
+            rmdir(self._client_cache.package_tgz(package_reference))
             error_msg = os.linesep.join("Mismatched checksum '%s' (manifest: %s, file: %s)"
                                         % (fname, h1, h2) for fname, (h1, h2) in diff.items())
             logger.error("Manifests doesn't match!\n%s" % error_msg)
@@ -100,12 +100,23 @@ class RemoteManager(object):
 
         logger.debug("====> Time remote_manager build_files_set : %f" % (time.time() - t1))
 
+        if PACKAGE_TGZ_NAME in files:  # Compressed in the package folder by previous versions
+            try:
+                os.unlink(files.pop(PACKAGE_TGZ_NAME))
+            except OSError:
+                pass
+
+        lower_caches = self._client_cache.lower_caches
+        if lower_caches:  # Never before removing the tgz above, it could be a lower cache one
+            files = lower_caches.resolve_links(files)
+
         if integrity_check:
             self._package_integrity_check(package_reference, files, package_folder)
             logger.debug("====> Time remote_manager check package integrity : %f"
                          % (time.time() - t1))
 
-        the_files = compress_package_files(files, symlinks, package_folder, self._output)
+        tgz_folder = self._client_cache.package_tgz(package_reference)
+        the_files = compress_package_files(files, symlinks, tgz_folder, self._output)
         if skip_upload:
             return None
 
@@ -136,6 +147,19 @@ class RemoteManager(object):
         returns (ConanDigest, remote_name)"""
         return self._call_remote(remote, "get_package_digest", package_reference)
 
+    def check_credentials(self, remote):
+        """
+        Checks the remote credentials, requesting them if needed
+        """
+        return self._call_remote(remote, "check_credentials")
+
+    def get_packages_digests(self, conan_reference, package_ids, remote):
+        """
+        Read the md5 of the manifests of the given packages from the remote, in one request
+
+        returns {package_id: md5} or None if the remote doesn't support it"""
+        return self._call_remote(remote, "get_packages_digests", conan_reference, package_ids)
+
     def get_package_info(self, package_reference, remote):
         """
         Read a package ConanInfo from remotes
@@ -171,6 +195,9 @@ class RemoteManager(object):
         for dirname, _, filenames in os.walk(dest_folder):
             for fname in filenames:
                 touch(os.path.join(dirname, fname))
+        blob_store = self._client_cache.blob_store
+        if blob_store:
+            blob_store.store_folder(dest_folder)
 
     def get_recipe_sources(self, conan_reference, export_folder, export_sources_folder, remote):
         t1 = time.time()
@@ -200,6 +227,9 @@ class RemoteManager(object):
         for dirname, _, filenames in os.walk(export_sources_folder):
             for fname in filenames:
                 touch(os.path.join(dirname, fname))
+        blob_store = self._client_cache.blob_store
+        if blob_store:
+            blob_store.store_folder(export_folder, export_sources_folder)
 
     def get_package(self, package_reference, dest_folder, remote):
         """
@@ -212,12 +242,58 @@ class RemoteManager(object):
         zipped_files = self._call_remote(remote, "get_package", package_reference, dest_folder)
         duration = time.time() - t1
         log_package_download(package_reference, duration, remote, zipped_files)
-        unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME)
+        blob_store = self._client_cache.blob_store
+        # The files already in the blob store are linked, not extracted
+        linked = blob_store.link_files(dest_folder) if blob_store else None
+        unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME, excluded=linked)
         # Issue #214 https://github.com/conan-io/conan/issues/214
         for dirname, _, filenames in os.walk(dest_folder):
             for fname in filenames:
                 touch(os.path.join(dirname, fname))
 
+    def update_package(self, package_reference, package_folder, local_manifest, remote_manifest,
+                       remote):
+        """
+        Updates the package_folder downloading only the files changed in the remote package,
+        in a copy of it that replaces the folder only if it matches the remote_manifest
+
+        returns the number of changed files, None if the remote doesn't support it"""
+        difference = local_manifest.difference(remote_manifest)
+        changed = sorted(f for f, (_, remote_md5) in difference.items() if remote_md5)
+        tmp_folder = tempfile.mkdtemp(dir=os.path.dirname(os.path.dirname(package_folder)),
+                                      prefix=".update")
+        try:
+            new_folder = os.path.join(tmp_folder, "package")
+            _link_tree(package_folder, new_folder)
+            for filename in list(difference) + [CONAN_MANIFEST]:
+                path = os.path.join(new_folder, filename)
+                if os.path.lexists(path):
+                    os.remove(path)
+                    _remove_empty_parents(os.path.dirname(path), new_folder)
+            t1 = time.time()
+            downloaded = self._call_remote(remote, "get_package_files", package_reference,
+                                           changed + [CONAN_MANIFEST], new_folder)
+            if downloaded is None:
+                return None
+            duration = time.time() - t1
+            log_package_download(package_reference, duration, remote, downloaded)
+            for path in downloaded.values():
+                touch(path)
+            manifest = FileTreeManifest.loads(load(os.path.join(new_folder, CONAN_MANIFEST)))
+            if manifest != remote_manifest or FileTreeManifest.create(new_folder) != manifest:
+                raise ConanException("The updated package doesn't match the remote manifest")
+
+            old_folder = os.path.join(tmp_folder, "old")
+            os.rename(package_folder, old_folder)
+            try:
+                os.rename(new_folder, package_folder)
+            except OSError:
+                os.rename(old_folder, package_folder)
+                raise
+        finally:
+            rmdir(tmp_folder)
+        return len(changed)
+
     def search(self, remote, pattern=None, ignorecase=True):
         """
         Search exported conans information from remotes
@@ -225,6 +301,13 @@ class RemoteManager(object):
         returns (dict str(conan_ref): {packages_info}"""
         return self._call_remote(remote, "search", pattern, ignorecase)
 
+    def search_page(self, remote, pattern=None, ignorecase=True, after=None):
+        """
+        A page of the references in the remote, after the 'after' cursor of the previous one
+
+        returns (references, next page cursor or None)"""
+        return self._call_remote(remote, "search_page", pattern, ignorecase, after)
+
     def search_packages(self, remote, reference, query):
         return self._call_remote(remote, "search_packages", reference, query)
 
@@ -260,6 +343,31 @@ class RemoteManager(object):
             raise ConanException(exc)
 
 
+def _link_tree(src, dst):
+    """ Creates 'dst' with the folders of 'src' and hardlinks to its files, copied where
+    hardlinks are not supported. The symlinks of 'src' are copied as they are
+    """
+    for root, dirs, files in os.walk(src):
+        dst_root = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+        mkdir(dst_root)
+        for name in dirs + files:
+            src_path = os.path.join(root, name)
+            dst_path = os.path.join(dst_root, name)
+            if os.path.islink(src_path):
+                os.symlink(os.readlink(src_path), dst_path)
+            elif name in files:
+                try:
+                    os.link(src_path, dst_path)
+                except (OSError, AttributeError):  # Python 2 in Windows has no os.link
+                    shutil.copy2(src_path, dst_path)
+
+
+def _remove_empty_parents(folder, base):
+    while folder != base and not os.listdir(folder):
+        os.rmdir(folder)
+        folder = os.path.dirname(folder)
+
+
 def _compress_recipe_files(files, symlinks, src_files, src_symlinks, dest_folder, output):
     # This is the minimum recipe
     result = {CONANFILE: files.pop(CONANFILE),
@@ -283,12 +391,37 @@ def _compress_recipe_files(files, symlinks, src_files, src_symlinks, dest_folder
     return result
 
 
-def compress_package_files(files, symlinks, dest_folder, output):
-    tgz_path = files.get(PACKAGE_TGZ_NAME)
-    if not tgz_path:
+def _package_tgz_key(manifest, symlinks):
+    """ The compressed package only depends on the packaged files, identified by the
+    manifest summary, the symlinks and the compression level
+    """
+    compress_level = int(os.getenv("CONAN_COMPRESSION_LEVEL", 9))
+    symlinks = "".join("%s -> %s\n" % (name, dest) for name, dest in sorted(symlinks.items()))
+    return md5("%s\n%d\n%s" % (manifest.summary_hash, compress_level, symlinks))
+
+
+def compress_package_files(files, symlinks, tgz_folder, output):
+    """ Compresses the package files into 'tgz_folder', unless they were already compressed
+    there for the same manifest and settings, as when uploading to several remotes.
+    The compressed files of previous manifests are removed
+    """
+    manifest = FileTreeManifest.loads(load(files[CONAN_MANIFEST]))
+    tgz_path = os.path.join(tgz_folder, "%s.tgz" % _package_tgz_key(manifest, symlinks))
+    if os.path.exists(tgz_path):
+        logger.debug("Reusing compressed package %s" % tgz_path)
+    else:
         output.rewrite_line("Compressing package...")
         tgz_files = {f: path for f, path in files.items() if f not in [CONANINFO, CONAN_MANIFEST]}
-        tgz_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, dest_dir=dest_folder)
+        mkdir(tgz_folder)
+        tmp_folder = tempfile.mkdtemp(dir=tgz_folder)
+        try:
+            tmp_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, dest_dir=tmp_folder)
+            for name in os.listdir(tgz_folder):
+                if name.endswith(".tgz"):
+                    os.remove(os.path.join(tgz_folder, name))
+            replace_file(tmp_path, tgz_path)
+        finally:
+            rmdir(tmp_folder)
 
     return {PACKAGE_TGZ_NAME: tgz_path,
             CONANINFO: files[CONANINFO],
@@ -331,21 +464,21 @@ def compress_files(files, symlinks, name, dest_dir):
     return tgz_path
 
 
-def unzip_and_get_files(files, destination_dir, tgz_name):
+def unzip_and_get_files(files, destination_dir, tgz_name, excluded=None):
     """Moves all files from package_files, {relative_name: tmp_abs_path}
     to destination_dir, unzipping the "tgz_name" if found"""
 
     tgz_file = files.pop(tgz_name, None)
     if tgz_file:
-        uncompress_file(tgz_file, destination_dir)
+        uncompress_file(tgz_file, destination_dir, excluded)
         os.remove(tgz_file)
 
 
-def uncompress_file(src_path, dest_folder):
+def uncompress_file(src_path, dest_folder, excluded=None):
     t1 = time.time()
     try:
         with open(src_path, 'rb') as file_handler:
-            tar_extract(file_handler, dest_folder)
+            tar_extract(file_handler, dest_folder, excluded)
     except Exception as e:
         error_msg = "Error while downloading/extracting files to %s\n%s\n" % (dest_folder, str(e))
         # try to remove the files
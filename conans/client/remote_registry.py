@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
 from conans.errors import ConanException
 from conans.util.files import load, save
 from collections import OrderedDict, namedtuple
@@ -13,6 +16,64 @@ conan-transit https://conan-transit.bintray.com True
 
 Remote = namedtuple("Remote", "name url verify_ssl")
 
+# The parsed registry files of this process {filename: _ParsedRegistry}, and the number of
+# nested registry_batch() in course
+_registries = {}
+_parsed_lock = threading.RLock()
+_batch = {"depth": 0}
+# A file modified less than this before it was read could be modified again keeping its mtime
+RACY_SECONDS = 1
+
+
+def _file_stat(filename):
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return getattr(st, "st_mtime_ns", st.st_mtime), st.st_mtime, st.st_size, st.st_ino
+
+
+class _ParsedRegistry(object):
+
+    def __init__(self, contents, stat, remotes, refs):
+        self.contents = contents
+        self.stat = stat
+        self.read_time = time.time()
+        self.remotes = remotes
+        self.refs = refs
+        self.pending = OrderedDict()  # {ref: remote name, None if removed} not saved yet
+        self.output = None
+
+    def up_to_date(self, stat):
+        """ Unchanged file, and not modified right before it was read """
+        return (stat is not None and stat == self.stat and
+                self.read_time - stat[1] > RACY_SECONDS)
+
+    def apply(self, changes):
+        for ref, remote in changes.items():
+            if remote is None:
+                self.refs.pop(ref, None)
+            else:
+                self.refs[ref] = remote
+
+
+@contextmanager
+def registry_batch():
+    """ The references registered or removed inside it are saved at the end, loading and
+    saving every registry file once
+    """
+    with _parsed_lock:
+        _batch["depth"] += 1
+    try:
+        yield
+    finally:
+        with _parsed_lock:
+            _batch["depth"] -= 1
+            if not _batch["depth"]:
+                for filename, parsed in list(_registries.items()):
+                    if parsed.pending:
+                        RemoteRegistry(filename, parsed.output)._update(lambda _, __: True)
+
 
 class RemoteRegistry(object):
     """ conan_ref: remote
@@ -68,10 +129,74 @@ class RemoteRegistry(object):
                               % self._filename)
             contents = default_remotes
             save(self._filename, contents)
-        return self._parse(contents)
+        return contents
 
-    def _save(self, remotes, refs):
-        save(self._filename, self._to_string(remotes, refs))
+    def _parsed(self, locked=False):
+        """ The parsed registry, shared by all the RemoteRegistry of this process. The file is
+        read again only if its stat changed, and parsed again only if its contents changed.
+        The references not saved yet are applied over it
+        """
+        with _parsed_lock:
+            parsed = _registries.get(self._filename)
+            if parsed is not None and parsed.up_to_date(_file_stat(self._filename)):
+                return parsed
+            if locked:
+                stat, contents = _file_stat(self._filename), self._load()
+            else:
+                with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
+                    stat, contents = _file_stat(self._filename), self._load()
+            pending = parsed.pending if parsed is not None else OrderedDict()
+            if parsed is not None and parsed.contents == contents and not pending:
+                remotes, refs = parsed.remotes, parsed.refs
+            else:
+                remotes, refs = self._parse(contents)
+            parsed = _ParsedRegistry(contents, stat or _file_stat(self._filename), remotes, refs)
+            parsed.pending = pending
+            parsed.apply(pending)
+            _registries[self._filename] = parsed
+            return parsed
+
+    def _update(self, update):
+        """ Calls update(remotes, refs) with a copy of the registry, and saves it if it
+        returns True, all of it under the lock
+        """
+        with _parsed_lock:
+            with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
+                parsed = self._parsed(locked=True)
+                remotes, refs = OrderedDict(parsed.remotes), dict(parsed.refs)
+                if update(remotes, refs):
+                    contents = self._to_string(remotes, refs)
+                    save(self._filename, contents)
+                    _registries[self._filename] = _ParsedRegistry(contents,
+                                                              _file_stat(self._filename),
+                                                              remotes, refs)
+
+    def _update_refs(self, changes):
+        """ changes: {ref: remote name, None to remove it}, saved at the end of the current
+        registry_batch(), if any
+        """
+        def update(_, refs):
+            for ref, remote in changes.items():
+                if remote is None:
+                    refs.pop(ref, None)
+                else:
+                    refs[ref] = remote
+            return True
+
+        # The InterProcessLock does not serialize the threads of this process, as the ones
+        # of "conan upload --parallel", so the whole update is done under _parsed_lock
+        with _parsed_lock:
+            parsed = self._parsed()
+            changes = {ref: remote for ref, remote in changes.items()
+                       if parsed.refs.get(ref) != remote}
+            if not changes:
+                return
+            if _batch["depth"]:
+                parsed.apply(changes)
+                parsed.pending.update(changes)
+                parsed.output = self._output
+                return
+            self._update(update)
 
     @property
     def default_remote(self):
@@ -82,74 +207,69 @@ class RemoteRegistry(object):
 
     @property
     def remotes(self):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, _ = self._load()
-            return [Remote(ref, remote, verify_ssl) for ref, (remote, verify_ssl) in remotes.items()]
+        remotes = self._parsed().remotes
+        return [Remote(ref, remote, verify_ssl) for ref, (remote, verify_ssl) in remotes.items()]
 
     @property
     def refs(self):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            _, refs = self._load()
-            return refs
+        return dict(self._parsed().refs)
 
     def remote(self, name):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, _ = self._load()
-            try:
-                return Remote(name, remotes[name][0], remotes[name][1])
-            except KeyError:
-                raise ConanException("No remote '%s' defined in remotes in file %s"
-                                     % (name, self._filename))
+        remotes = self._parsed().remotes
+        try:
+            return Remote(name, remotes[name][0], remotes[name][1])
+        except KeyError:
+            raise ConanException("No remote '%s' defined in remotes in file %s"
+                                 % (name, self._filename))
 
     def get_ref(self, conan_reference):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, refs = self._load()
-            remote_name = refs.get(str(conan_reference))
-            try:
-                return Remote(remote_name, remotes[remote_name][0], remotes[remote_name][1])
-            except:
-                return None
+        parsed = self._parsed()
+        remote_name = parsed.refs.get(str(conan_reference))
+        try:
+            return Remote(remote_name, parsed.remotes[remote_name][0],
+                          parsed.remotes[remote_name][1])
+        except:
+            return None
 
     def remove_ref(self, conan_reference, quiet=False):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
-            try:
-                del refs[conan_reference]
-                self._save(remotes, refs)
-            except:
-                if not quiet:
-                    self._output.warn("Couldn't delete '%s' from remote registry"
-                                      % conan_reference)
+        conan_reference = str(conan_reference)
+        if conan_reference not in self._parsed().refs:
+            if not quiet:
+                self._output.warn("Couldn't delete '%s' from remote registry"
+                                  % conan_reference)
+            return
+        self._update_refs({conan_reference: None})
+
+    def remove_refs(self, conan_references):
+        """ Removes several references loading and saving the registry once """
+        self._update_refs({str(ref): None for ref in conan_references})
 
     def set_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
-            refs[conan_reference] = remote.name
-            self._save(remotes, refs)
+        self._update_refs({str(conan_reference): remote.name})
 
     def add_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
+        conan_reference = str(conan_reference)
+
+        def update(remotes, refs):
             if conan_reference in refs:
                 raise ConanException("%s already exists. Use update" % conan_reference)
             if remote not in remotes:
                 raise ConanException("%s not in remotes" % remote)
             refs[conan_reference] = remote
-            self._save(remotes, refs)
+            return True
+        self._update(update)
 
     def update_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
+        conan_reference = str(conan_reference)
+
+        def update(remotes, refs):
             if conan_reference not in refs:
                 raise ConanException("%s does not exist. Use add" % conan_reference)
             if remote not in remotes:
                 raise ConanException("%s not in remotes" % remote)
             refs[conan_reference] = remote
-            self._save(remotes, refs)
+            return True
+        self._update(update)
 
     def add(self, remote_name, remote, verify_ssl=True, insert=None):
         def exists_function(remotes):
@@ -159,13 +279,14 @@ class RemoteRegistry(object):
         self._add_update(remote_name, remote, verify_ssl, exists_function, insert)
 
     def remove(self, remote_name):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, refs = self._load()
+        def update(remotes, refs):
             if remote_name not in remotes:
                 raise ConanException("Remote '%s' not found in remotes" % remote_name)
             del remotes[remote_name]
-            refs = {k: v for k, v in refs.items() if v != remote_name}
-            self._save(remotes, refs)
+            for ref in [k for k, v in refs.items() if v == remote_name]:
+                del refs[ref]
+            return True
+        self._update(update)
 
     def update(self, remote_name, remote, verify_ssl=True, insert=None):
         def exists_function(remotes):
@@ -174,18 +295,18 @@ class RemoteRegistry(object):
         self._add_update(remote_name, remote, verify_ssl, exists_function, insert)
 
     def define_remotes(self, remotes):
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            _, refs = self._load()
-            new_remotes = OrderedDict()
+        def update(old_remotes, refs):
+            old_remotes.clear()
             for remote in remotes:
-                new_remotes[remote.name] = (remote.url, remote.verify_ssl)
-            refs = {k: v for k, v in refs.items() if v in new_remotes}
-            self._save(new_remotes, refs)
+                old_remotes[remote.name] = (remote.url, remote.verify_ssl)
+            for ref in [k for k, v in refs.items() if v not in old_remotes]:
+                del refs[ref]
+            return True
+        self._update(update)
 
     def _add_update(self, remote_name, remote, verify_ssl, exists_function, insert=None):
 
-        with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
-            remotes, refs = self._load()
+        def update(remotes, refs):
             exists_function(remotes)
             urls = {r[0]: name for name, r in remotes.items() if name != remote_name}
             if remote in urls:
@@ -198,7 +319,10 @@ class RemoteRegistry(object):
                 remotes.pop(remote_name, None)  # Remove if exists (update)
                 remotes_list = list(remotes.items())
                 remotes_list.insert(insert_index, (remote_name, (remote, verify_ssl)))
-                remotes = OrderedDict(remotes_list)
+                items = OrderedDict(remotes_list)
+                remotes.clear()
+                remotes.update(items)
             else:
                 remotes[remote_name] = (remote, verify_ssl)
-            self._save(remotes, refs)
+            return True
+        self._update(update)
@@ -9,13 +9,17 @@ from conans.search.search import filter_outdated
 
 
 class DiskRemover(object):
+    """ Removes the folders moving them to the trash, purge() deletes them after """
     def __init__(self, paths):
         self._paths = paths
+        self._trash = paths.trash
+        self._digests = set()
 
     def _remove(self, path, conan_ref, msg=""):
         try:
             logger.debug("Removing folder %s" % path)
-            rm_conandir(path)
+            if not self._trash.put(path):
+                rm_conandir(path)
         except OSError:
             error_msg = "Folder busy (open or some file open): %s" % path
             raise ConanException("%s: Unable to remove %s\n\t%s"
@@ -31,13 +35,36 @@ class DiskRemover(object):
             raise ConanException("Unable to remove %s %s\n\t%s"
                                  % (repr(conan_ref), msg, error_msg))
 
+    def _blob_digests(self, folders):
+        """ digests of the stored files of the folders, to release them once removed
+        """
+        blob_store = self._paths.blob_store
+        if not blob_store:
+            return set()
+        return set().union(*[blob_store.folder_digests(folder) for folder in folders])
+
+    def _release_blobs(self, digests):
+        """ The blobs are still linked from the trash, they are released after the purge
+        """
+        self._digests.update(digests)
+
+    def purge(self):
+        """ Deletes the removed folders in a background thread
+        """
+        digests, self._digests = self._digests, set()
+        blob_store = self._paths.blob_store if digests else None
+        callback = (lambda: blob_store.release(digests)) if blob_store else None
+        return self._trash.purge_background(callback)
+
     def remove(self, conan_ref):
+        digests = self._blob_digests([self._paths.export(conan_ref)])
         self.remove_src(conan_ref)
         self.remove_builds(conan_ref)
         self.remove_packages(conan_ref)
         self._remove(self._paths.export(conan_ref), conan_ref, "export folder")
         self._remove(self._paths.export_sources(conan_ref), conan_ref, "export_source folder")
         self._remove(self._paths.conan(conan_ref), conan_ref)
+        self._release_blobs(digests)
 
     def remove_src(self, conan_ref):
         self._remove(self._paths.source(conan_ref), conan_ref, "src folder")
@@ -57,16 +84,38 @@ class DiskRemover(object):
     def remove_packages(self, conan_ref, ids_filter=None):
         if not ids_filter:  # Remove all
             path = self._paths.packages(conan_ref)
-            for package in self._paths.conan_packages(conan_ref):
+            packages = self._paths.conan_packages(conan_ref)
+            digests = self._blob_digests([os.path.join(path, package) for package in packages])
+            for package in packages:
                 self._remove(os.path.join(path, package), conan_ref, "package folder:%s" % package)
             self._remove(path, conan_ref, "packages")
+            self._remove(self._paths.packages_tgz(conan_ref), conan_ref, "compressed packages")
             self._remove_file(self._paths.system_reqs(conan_ref), conan_ref, SYSTEM_REQS)
         else:
-            for id_ in ids_filter:  # remove just the specified packages
-                package_ref = PackageReference(conan_ref, id_)
+            package_refs = [PackageReference(conan_ref, id_) for id_ in ids_filter]
+            digests = self._blob_digests([self._paths.package(package_ref)
+                                          for package_ref in package_refs])
+            for package_ref in package_refs:  # remove just the specified packages
+                id_ = package_ref.package_id
                 self._remove(self._paths.package(package_ref), conan_ref, "package:%s" % id_)
+                self._remove(self._paths.package_tgz(package_ref), conan_ref,
+                             "compressed package:%s" % id_)
                 self._remove_file(self._paths.system_reqs_package(package_ref),
                                   conan_ref, "%s/%s" % (id_, SYSTEM_REQS))
+        self._remove_empty_tgz_folders(conan_ref)
+        self._release_blobs(digests)
+
+    def _remove_empty_tgz_folders(self, conan_ref):
+        """ The compressed packages folders of the reference left empty, up to the name one
+        """
+        path = self._paths.packages_tgz(conan_ref)
+        for _ in range(4):
+            if os.path.exists(path):
+                try:  # Take advantage that os.rmdir does not delete non-empty dirs
+                    os.rmdir(path)
+                except OSError:
+                    break  # not empty
+            path = os.path.dirname(path)
 
 
 class ConanRemover(object):
@@ -84,8 +133,10 @@ class ConanRemover(object):
         else:
             self._remote_proxy.remove_packages(reference, package_ids)
 
-    def _local_remove(self, reference, src, build_ids, package_ids):
-        remover = DiskRemover(self._client_cache)
+    @staticmethod
+    def _local_remove(remover, reference, src, build_ids, package_ids):
+        """ Returns True if the whole reference was removed
+        """
         if src:
             remover.remove_src(reference)
         if build_ids is not None:
@@ -94,14 +145,22 @@ class ConanRemover(object):
             remover.remove_packages(reference, package_ids)
         if not src and build_ids is None and package_ids is None:
             remover.remove(reference)
-            registry = self._remote_proxy.registry
-            registry.remove_ref(reference, quiet=True)
+            return True
+        return False
+
+    @staticmethod
+    def _search(searcher, patterns):
+        references = []
+        for pattern in patterns:
+            references.extend(ref for ref in searcher.search(pattern) if ref not in references)
+        return references
 
     def remove(self, pattern, src=None, build_ids=None, package_ids_filter=None, force=False,
                packages_query=None, outdated=False):
         """ Remove local/remote conans, package folders, etc.
         @param src: Remove src folder
-        @param pattern: it could be OpenCV* or OpenCV or a ConanFileReference
+        @param pattern: it could be OpenCV* or OpenCV or a ConanFileReference, or a list of them
+        to remove all in a single pass
         @param build_ids: Lists with ids or empty for all. (Its a filter)
         @param package_ids_filter: Lists with ids or empty for all. (Its a filter)
         @param force: if True, it will be deleted without requesting anything
@@ -112,13 +171,16 @@ class ConanRemover(object):
         if has_remote and (build_ids is not None or src):
             raise ConanException("Remotes don't have 'build' or 'src' folder, just packages")
 
+        patterns = pattern if isinstance(pattern, list) else [pattern]
         searcher = self._remote_proxy if has_remote else self._search_manager
-        references = searcher.search(pattern)
+        references = self._search(searcher, patterns)
         if not references:
-            self._user_io.out.warn("No package recipe matches '%s'" % str(pattern))
+            self._user_io.out.warn("No package recipe matches '%s'"
+                                   % "', '".join(str(p) for p in patterns))
             return
 
-        deleted_refs = []
+        remover = DiskRemover(self._client_cache)
+        deleted_refs, removed_refs = [], []
         for reference in references:
             assert isinstance(reference, ConanFileReference)
             package_ids = package_ids_filter
@@ -146,10 +208,14 @@ class ConanRemover(object):
                     self._remote_remove(reference, package_ids)
                 else:
                     deleted_refs.append(reference)
-                    self._local_remove(reference, src, build_ids, package_ids)
+                    if self._local_remove(remover, reference, src, build_ids, package_ids):
+                        removed_refs.append(reference)
 
         if not has_remote:
+            if removed_refs:
+                self._remote_proxy.registry.remove_refs(removed_refs)
             self._client_cache.delete_empty_dirs(deleted_refs)
+            remover.purge()
 
     def _ask_permission(self, conan_ref, src, build_ids, package_ids_filter, force):
         def stringlist(alist):
@@ -143,6 +143,14 @@ class ConanApiAuthManager(object):
     def get_package_digest(self, package_reference):
         return self._rest_client.get_package_digest(package_reference)
 
+    @input_credentials_if_unauthorized
+    def check_credentials(self):
+        return self._rest_client.check_credentials()
+
+    @input_credentials_if_unauthorized
+    def get_packages_digests(self, conan_reference, package_ids):
+        return self._rest_client.get_packages_digests(conan_reference, package_ids)
+
     @input_credentials_if_unauthorized
     def get_recipe(self, conan_reference, dest_folder, filter_function):
         return self._rest_client.get_recipe(conan_reference, dest_folder, filter_function)
@@ -151,6 +159,10 @@ class ConanApiAuthManager(object):
     def get_package(self, package_reference, dest_folder):
         return self._rest_client.get_package(package_reference, dest_folder)
 
+    @input_credentials_if_unauthorized
+    def get_package_files(self, package_reference, files, dest_folder):
+        return self._rest_client.get_package_files(package_reference, files, dest_folder)
+
     @input_credentials_if_unauthorized
     def get_package_info(self, package_reference):
         return self._rest_client.get_package_info(package_reference)
@@ -159,6 +171,10 @@ class ConanApiAuthManager(object):
     def search(self, pattern, ignorecase):
         return self._rest_client.search(pattern, ignorecase)
 
+    @input_credentials_if_unauthorized
+    def search_page(self, pattern, ignorecase, after):
+        return self._rest_client.search_page(pattern, ignorecase, after)
+
     @input_credentials_if_unauthorized
     def search_packages(self, reference, query):
         return self._rest_client.search_packages(reference, query)
@@ -0,0 +1,50 @@
+""" The last downloaded contents of the remote metadata files, conanmanifest.txt and
+conaninfo.txt, with their ETags. They are downloaded again with conditional requests, so the
+server answers 304 Not Modified, without contents, if they didn't change.
+
+The entries are named by the sha1 of the file URL without the query string, as it contains the
+signature of the download, different in every request.
+"""
+import hashlib
+import os
+
+from six.moves.urllib.parse import urlsplit, urlunsplit
+
+from conans.util.files import load, save, replace_file
+from conans.util.log import logger
+
+METADATA_FOLDER = "metadata"
+
+
+class MetadataStore(object):
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    def _path(self, url):
+        scheme, netloc, path, _, _ = urlsplit(url)
+        key = urlunsplit((scheme, netloc, path, "", ""))
+        return os.path.join(self._folder, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def get(self, url):
+        """ (etag, contents) of the last download of 'url', None if not stored
+        """
+        try:
+            content = load(self._path(url), binary=True)
+        except (IOError, OSError):
+            return None
+        etag, _, content = content.partition(b"\n")
+        return etag.decode("utf-8"), content
+
+    def put(self, url, etag, content):
+        """ Stores the downloaded 'content' of 'url' with its 'etag'
+        """
+        path = self._path(url)
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            save(tmp_path, etag.encode("utf-8") + b"\n" + content)
+            replace_file(tmp_path, path)
+        except (IOError, OSError) as e:  # Only a cache
+            logger.debug("Cannot store metadata of %s: %s" % (url, str(e)))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -1,5 +1,5 @@
 from conans.errors import EXCEPTION_CODE_MAPPING, NotFoundException, ConanException, \
-    AuthenticationException
+    AuthenticationException, RequestErrorException
 from requests.auth import AuthBase, HTTPBasicAuth
 from conans.util.log import logger
 import json
@@ -12,11 +12,14 @@ from conans.model.manifest import FileTreeManifest
 from conans.client.rest.uploader_downloader import Uploader, Downloader
 from conans.model.ref import ConanFileReference
 from six.moves.urllib.parse import urlsplit, parse_qs, urlencode
-from conans import COMPLEX_SEARCH_CAPABILITY
+from conans import COMPLEX_SEARCH_CAPABILITY, PAGINATED_SEARCH_CAPABILITY, \
+    PACKAGE_FILES_CAPABILITY
 from conans.search.search import filter_packages
 from conans.model.info import ConanInfo
 from conans.util.tracer import log_client_rest_api_call
 
+SEARCH_PAGE_SIZE = 1000
+
 
 def handle_return_deserializer(deserializer=None):
     """Decorator for rest api methods.
@@ -68,7 +71,7 @@ class RestApiClient(object):
         Rest Api Client for handle remote.
     """
 
-    def __init__(self, output, requester, put_headers=None):
+    def __init__(self, output, requester, put_headers=None, metadata_store=None):
 
         # Set to instance
         self.token = None
@@ -78,6 +81,8 @@ class RestApiClient(object):
         self.requester = requester
         self._verify_ssl = True
         self._put_headers = put_headers
+        self._metadata_store = metadata_store
+        self._server_capabilities = {}  # {remote_url: capabilities}
 
     @property
     def verify_ssl(self):
@@ -106,10 +111,8 @@ class RestApiClient(object):
         urls = self._get_json(url)
 
         # Get the digest
-        contents = self.download_files(urls)
-        # Unroll generator and decode shas (plain text)
-        contents = {key: decode_text(value) for key, value in dict(contents).items()}
-        return FileTreeManifest.loads(contents[CONAN_MANIFEST])
+        content = self._download_metadata(urls, CONAN_MANIFEST)
+        return FileTreeManifest.loads(decode_text(content))
 
     def get_package_digest(self, package_reference):
         """Gets a FileTreeManifest from a package"""
@@ -121,10 +124,17 @@ class RestApiClient(object):
         urls = self._get_json(url)
 
         # Get the digest
-        contents = self.download_files(urls)
-        # Unroll generator and decode shas (plain text)
-        contents = {key: decode_text(value) for key, value in dict(contents).items()}
-        return FileTreeManifest.loads(contents[CONAN_MANIFEST])
+        content = self._download_metadata(urls, CONAN_MANIFEST)
+        return FileTreeManifest.loads(decode_text(content))
+
+    def get_packages_digests(self, conan_reference, package_ids):
+        """Gets a {package_id: md5} with the md5 of the manifests of the packages in the
+        remote, or None if the server doesn't support it"""
+        url = "%s/conans/%s/packages/digests" % (self._remote_api_url, "/".join(conan_reference))
+        try:
+            return self._get_json(url, data={"package_ids": list(package_ids)})
+        except (NotFoundException, RequestErrorException):  # Old server, 404 or 405
+            return None
 
     def get_package_info(self, package_reference):
         """Gets a ConanInfo file from a package"""
@@ -140,10 +150,8 @@ class RestApiClient(object):
             raise NotFoundException("Package %s doesn't have the %s file!" % (package_reference,
                                                                               CONANINFO))
         # Get the info (in memory)
-        contents = self.download_files({CONANINFO: urls[CONANINFO]})
-        # Unroll generator and decode shas (plain text)
-        contents = {key: decode_text(value) for key, value in dict(contents).items()}
-        return ConanInfo.loads(contents[CONANINFO])
+        content = self._download_metadata(urls, CONANINFO)
+        return ConanInfo.loads(decode_text(content))
 
     def get_recipe(self, conan_reference, dest_folder, filter_files_function):
         """Gets a dict of filename:contents from conans"""
@@ -173,6 +181,21 @@ class RestApiClient(object):
         file_paths = self.download_files_to_folder(urls, dest_folder, self._output)
         return file_paths
 
+    def get_package_files(self, package_reference, files, dest_folder):
+        """Downloads the given files of the package to dest_folder, to update only the changed
+        ones. Returns a dict of filename:abs_path, None if the server doesn't support it"""
+        if PACKAGE_FILES_CAPABILITY not in self._capabilities():
+            return None
+        url = "%s/conans/%s/packages/%s/file_urls" % (self._remote_api_url,
+                                                      "/".join(package_reference.conan),
+                                                      package_reference.package_id)
+        urls = self._get_json(url, data={"files": list(files)})
+        missing = set(files).difference(urls)
+        if missing:
+            raise NotFoundException("Package %s files not found: %s"
+                                    % (str(package_reference), ", ".join(sorted(missing))))
+        return self.download_files_to_folder(urls, dest_folder, self._output)
+
     def upload_recipe(self, conan_reference, the_files, retry, retry_wait, ignore_deleted_file):
         """
         the_files: dict with relative_path: content
@@ -274,37 +297,69 @@ class RestApiClient(object):
         """
         the_files: dict with relative_path: content
         """
-        query = ''
+        references, next_page = self.search_page(pattern, ignorecase)
+        while next_page:
+            page, next_page = self.search_page(pattern, ignorecase, next_page)
+            references.extend(page)
+        return references
+
+    def search_page(self, pattern=None, ignorecase=True, after=None):
+        """ A page of the references matching the pattern, starting after the 'after' cursor
+        of the previous page. Returns (references, next page cursor or None). The servers
+        not supporting pages return all of them in the first one
+        """
+        params = {}
         if pattern:
-            params = {"q": pattern}
+            params["q"] = pattern
             if not ignorecase:
                 params["ignorecase"] = "False"
-            query = "?%s" % urlencode(params)
 
-        url = "%s/conans/search%s" % (self._remote_api_url, query)
-        response = self._get_json(url)["results"]
-        return [ConanFileReference.loads(ref) for ref in response]
+        if PAGINATED_SEARCH_CAPABILITY not in self._capabilities():
+            query = "?%s" % urlencode(params) if params else ""
+            url = "%s/conans/search%s" % (self._remote_api_url, query)
+            response = self._get_json(url)["results"]
+            return [ConanFileReference.loads(ref) for ref in response], None
 
-    def search_packages(self, reference, query):
-
-        url = "%s/conans/%s/search?" % (self._remote_api_url, "/".join(reference))
-        if not query:
-            package_infos = self._get_json(url)
-            return package_infos
-
-        # Read capabilities
-        try:
-            _, _, capabilities = self.server_info()
-        except NotFoundException:
-            capabilities = []
+        url = "%s/conans/search?%s" % (self._remote_api_url,
+                                       urlencode(_page_params(params, after)))
+        result = self._get_json(url)
+        return [ConanFileReference.loads(ref) for ref in result["results"]], result.get("next")
 
-        if COMPLEX_SEARCH_CAPABILITY in capabilities:
-            url += urlencode({"q": query})
-            package_infos = self._get_json(url)
-            return package_infos
+    def search_packages(self, reference, query):
+        url = "%s/conans/%s/search" % (self._remote_api_url, "/".join(reference))
+        capabilities = self._capabilities()
+        params = {}
+        if query and COMPLEX_SEARCH_CAPABILITY in capabilities:
+            params["q"] = query
+
+        if PAGINATED_SEARCH_CAPABILITY in capabilities:
+            package_infos = {}
+            next_page = None
+            while True:
+                result = self._get_json("%s?%s" % (url,
+                                                   urlencode(_page_params(params, next_page))))
+                package_infos.update(result["results"])
+                next_page = result.get("next")
+                if not next_page:
+                    break
         else:
-            package_infos = self._get_json(url)
+            package_infos = self._get_json("%s?%s" % (url, urlencode(params)))
+
+        if query and COMPLEX_SEARCH_CAPABILITY not in capabilities:
             return filter_packages(query, package_infos)
+        return package_infos
+
+    def _capabilities(self):
+        """ The capabilities of the server of the remote, requested once
+        """
+        capabilities = self._server_capabilities.get(self.remote_url)
+        if capabilities is None:
+            try:
+                _, _, capabilities = self.server_info()
+            except NotFoundException:
+                capabilities = []
+            self._server_capabilities[self.remote_url] = capabilities
+        return capabilities
 
     @handle_return_deserializer()
     def remove_conanfile(self, conan_reference):
@@ -432,6 +487,32 @@ class RestApiClient(object):
             dedup = True
         return auth, dedup
 
+    def _download_metadata(self, file_urls, filename):
+        """Downloads the 'filename' metadata file in memory. With a metadata store, it is a
+        conditional request for the ETag of the stored contents, not downloaded again if
+        the server answers 304 Not Modified"""
+        resource_url = file_urls[filename]
+        if not self._metadata_store:
+            return dict(self.download_files({filename: resource_url}))[filename]
+
+        stored = self._metadata_store.get(resource_url)
+        headers = {"If-None-Match": stored[0]} if stored else {}
+        auth, _ = self._file_server_capabilities(resource_url)
+        t1 = time.time()
+        response = self.requester.get(resource_url, auth=auth, headers=headers,
+                                      verify=self.verify_ssl)
+        log_client_rest_api_call(resource_url, "GET", time.time() - t1, headers)
+        if response.status_code == 304 and stored:
+            return stored[1]
+        if not response.ok:
+            raise ConanException("Error %d downloading file %s" % (response.status_code,
+                                                                    resource_url))
+        content = response.content
+        etag = response.headers.get("ETag")
+        if etag:
+            self._metadata_store.put(resource_url, etag, content)
+        return content
+
     def download_files(self, file_urls, output=None):
         """
         :param: file_urls is a dict with {filename: url}
@@ -476,8 +557,18 @@ class RestApiClient(object):
         failed = []
         uploader = Uploader(self.requester, output, self.verify_ssl)
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
-        # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
-        for filename, resource_url in sorted(file_urls.items(), reverse=True):
+        # can be < conanfile, conaninfo, and sent always the last, so smaller files go first.
+        # The manifest goes the very last, and only if everything else was uploaded: the
+        # upload skips the recipes and packages with the same remote manifest
+        filenames = sorted(file_urls, reverse=True)
+        if CONAN_MANIFEST in filenames:
+            filenames.remove(CONAN_MANIFEST)
+            filenames.append(CONAN_MANIFEST)
+        for filename in filenames:
+            if filename == CONAN_MANIFEST and failed:
+                failed.append(filename)
+                break
+            resource_url = file_urls[filename]
             output.rewrite_line("Uploading %s" % filename)
             auth, dedup = self._file_server_capabilities(resource_url)
             try:
@@ -540,3 +631,13 @@ class RestApiClient(object):
             content = downloader.download(urls[path], auth=auth)
 
             return decode_text(content)
+
+
+def _page_params(params, after):
+    """ The query parameters to request the page of search results after the 'after' cursor
+    """
+    result = dict(params)
+    result["limit"] = SEARCH_PAGE_SIZE
+    if after:
+        result["after"] = after
+    return result
@@ -4,8 +4,9 @@ import traceback
 from conans.util.files import save, sha1sum, exception_message_safe, to_file_bytes, mkdir
 import os
 import time
-from conans.util.tracer import log_download
+from conans.util.tracer import log_download, tracing_enabled, register_file_checksums
 import conans.tools
+import hashlib
 
 
 class Uploader(object):
@@ -18,12 +19,15 @@ class Uploader(object):
 
     def upload(self, url, abs_path, auth=None, dedup=False, retry=1, retry_wait=0, headers=None):
         if dedup:
-            dedup_headers = {"X-Checksum-Deploy": "true", "X-Checksum-Sha1": sha1sum(abs_path)}
+            sha1 = sha1sum(abs_path)
+            dedup_headers = {"X-Checksum-Deploy": "true", "X-Checksum-Sha1": sha1}
             if headers:
                 dedup_headers.update(headers)
             response = self.requester.put(url, data="", verify=self.verify, headers=dedup_headers,
                                           auth=auth)
             if response.status_code != 404:
+                if tracing_enabled():
+                    register_file_checksums(abs_path, sha1=sha1)
                 return response
 
         headers = headers or {}
@@ -31,6 +35,10 @@ class Uploader(object):
         # Actual transfer of the real content
         it = load_in_chunks(abs_path, self.chunk_size)
         # Now it is a chunked read file
+        hashes = None
+        if tracing_enabled():  # The tracer logs the checksums, compute them while uploading
+            hashes = hashlib.md5(), hashlib.sha1()
+            it = _hashed_chunks(it, hashes)
         file_size = os.stat(abs_path).st_size
         it = upload_with_progress(file_size, it, self.chunk_size, self.output)
         # Now it will print progress in each iteration
@@ -38,6 +46,8 @@ class Uploader(object):
         # Now it is prepared to work with request
         ret = call_with_retry(self.output, retry, retry_wait, self._upload_file, url,
                               data=iterable_to_file, headers=headers, auth=auth)
+        if hashes:
+            register_file_checksums(abs_path, *[h.hexdigest() for h in hashes])
 
         return ret
 
@@ -105,6 +115,13 @@ def load_in_chunks(path, chunk_size=1024):
             yield data
 
 
+def _hashed_chunks(chunks, hashes):
+    for chunk in chunks:
+        for h in hashes:
+            h.update(chunk)
+        yield chunk
+
+
 class Downloader(object):
 
     def __init__(self, requester, output, verify, chunk_size=1000):
@@ -152,12 +169,15 @@ class Downloader(object):
                 # chunked can be a problem: https://www.greenbytes.de/tech/webdav/rfc2616.html#rfc.section.4.4
                 # It will not send content-length or should be ignored
 
-                def download_chunks(file_handler=None, ret_buffer=None):
+                def download_chunks(file_handler=None, ret_buffer=None, hashes=None):
                     """Write to a buffer or to a file handler"""
                     chunk_size = 1024 if not file_path else 1024 * 100
                     download_size = 0
                     last_progress = None
-                    for data in response.iter_content(chunk_size=chunk_size):
+                    chunks = response.iter_content(chunk_size=chunk_size)
+                    if hashes:
+                        chunks = _hashed_chunks(chunks, hashes)
+                    for data in chunks:
                         download_size += len(data)
                         if ret_buffer is not None:
                             ret_buffer.extend(data)
@@ -174,8 +194,12 @@ class Downloader(object):
 
                 if file_path:
                     mkdir(os.path.dirname(file_path))
+                    # The tracer logs the checksums, compute them while downloading
+                    hashes = (hashlib.md5(), hashlib.sha1()) if tracing_enabled() else None
                     with open(file_path, 'wb') as handle:
-                        dl_size = download_chunks(file_handler=handle)
+                        dl_size = download_chunks(file_handler=handle, hashes=hashes)
+                    if hashes:
+                        register_file_checksums(file_path, *[h.hexdigest() for h in hashes])
                 else:
                     dl_size = download_chunks(ret_buffer=ret)
 
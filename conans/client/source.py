@@ -7,10 +7,13 @@ from conans import tools
 from conans.errors import ConanException, conanfile_exception_formatter, \
     ConanExceptionInUserConanfileMethod
 from conans.paths import EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME, CONANFILE, CONAN_MANIFEST
-from conans.util.files import rmdir, set_dirty, is_dirty, clean_dirty
+from conans.util.files import rmdir, set_dirty, is_dirty, clean_dirty, make_writable
+from conans.util.materialize import materialize_tree, materialize_file, materialize_mode, \
+    REFLINK
 
 
 def merge_directories(src, dst):
+    mode = materialize_mode(REFLINK)  # source() can modify the files, do not link them
     for src_dir, _, files in os.walk(src):
         dst_dir = os.path.join(dst, os.path.relpath(src_dir, src))
         if not os.path.exists(dst_dir):
@@ -18,7 +21,7 @@ def merge_directories(src, dst):
         for file_ in files:
             src_file = os.path.join(src_dir, file_)
             dst_file = os.path.join(dst_dir, file_)
-            shutil.copy2(src_file, dst_file)
+            materialize_file(src_file, dst_file, mode)
 
 
 def config_source(export_folder, export_source_folder, src_folder,
@@ -53,7 +56,7 @@ def config_source(export_folder, export_source_folder, src_folder,
 
     if not os.path.exists(src_folder):
         output.info('Configuring sources in %s' % src_folder)
-        shutil.copytree(export_folder, src_folder, symlinks=True)
+        materialize_tree(export_folder, src_folder, REFLINK, symlinks=True)
         # Now move the export-sources to the right location
         merge_directories(export_source_folder, src_folder)
         for f in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME, CONANFILE+"c",
@@ -66,6 +69,8 @@ def config_source(export_folder, export_source_folder, src_folder,
             shutil.rmtree(os.path.join(src_folder, "__pycache__"))
         except OSError:
             pass
+        # The copies keep the mode of the read-only blobs and cache files
+        make_writable(src_folder)
 
         set_dirty(src_folder)
         os.chdir(src_folder)
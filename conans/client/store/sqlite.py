@@ -1,5 +1,6 @@
 import sqlite3
 import os
+import threading
 from conans.errors import ConanException
 
 
@@ -12,15 +13,26 @@ class SQLiteDB(object):
             dbfile = open(dbfile_path, 'w+')
             dbfile.close()
         self.dbfile = dbfile_path
+        # The parallel uploads read the credentials from their worker threads, every thread
+        # with its own connection
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.connect()
+            connection = self._local.connection
+        return connection
 
     def connect(self):
         try:
-            self.connection = sqlite3.connect(self.dbfile,
-                                              detect_types=sqlite3.PARSE_DECLTYPES)
-            self.connection.text_factory = str
+            connection = sqlite3.connect(self.dbfile, detect_types=sqlite3.PARSE_DECLTYPES)
+            connection.text_factory = str
+            self._local.connection = connection
             statement = None
             try:
-                statement = self.connection.cursor()
+                statement = connection.cursor()
             except Exception as e:
                 raise ConanException(e)
             finally:
@@ -31,3 +43,4 @@ class SQLiteDB(object):
 
     def disconnect(self):
         self.connection.close()
+        self._local.connection = None
@@ -9,6 +9,7 @@ from patch import fromfile, fromstring
 
 from conans.client.output import ConanOutput
 from conans.errors import ConanException
+from conans.util.extract import extract_zip, extract_tar
 from conans.util.files import load, save, _generic_algorithm_sum
 
 
@@ -78,40 +79,31 @@ def unzip(filename, destination=".", keep_permissions=False):
 
     with zipfile.ZipFile(filename, "r") as z:
         uncompress_size = sum((file_.file_size for file_ in z.infolist()))
-        if uncompress_size > 100000:
-            _global_output.info("Unzipping %s, this can take a while" % human_size(uncompress_size))
-        else:
-            _global_output.info("Unzipping %s" % human_size(uncompress_size))
-        extracted_size = 0
-
-        print_progress.last_size = -1
-        if platform.system() == "Windows":
-            for file_ in z.infolist():
-                extracted_size += file_.file_size
-                print_progress(extracted_size, uncompress_size)
-                try:
-                    z.extract(file_, full_path)
-                except Exception as e:
-                    _global_output.error("Error extract %s\n%s" % (file_.filename, str(e)))
-        else:  # duplicated for, to avoid a platform check for each zipped file
-            for file_ in z.infolist():
-                extracted_size += file_.file_size
-                print_progress(extracted_size, uncompress_size)
-                try:
-                    z.extract(file_, full_path)
-                    if keep_permissions:
-                        # Could be dangerous if the ZIP has been created in a non nix system
-                        # https://bugs.python.org/issue15795
-                        perm = file_.external_attr >> 16 & 0xFFF
-                        os.chmod(os.path.join(full_path, file_.filename), perm)
-                except Exception as e:
-                    _global_output.error("Error extract %s\n%s" % (file_.filename, str(e)))
-
-
-def untargz(filename, destination="."):
-    import tarfile
-    with tarfile.TarFile.open(filename, 'r:*') as tarredgzippedFile:
-        tarredgzippedFile.extractall(destination)
+    if uncompress_size > 100000:
+        _global_output.info("Unzipping %s, this can take a while" % human_size(uncompress_size))
+    else:
+        _global_output.info("Unzipping %s" % human_size(uncompress_size))
+
+    print_progress.last_size = -1
+    print_progress.extracted_size = 0
+
+    def progress(file_):
+        print_progress.extracted_size += file_.file_size
+        print_progress(print_progress.extracted_size, uncompress_size)
+
+    def error(file_, exc):
+        _global_output.error("Error extract %s\n%s" % (file_.filename, str(exc)))
+
+    # The permissions of zips created in Windows are meaningless
+    keep_permissions = keep_permissions and platform.system() != "Windows"
+    extract_zip(filename, full_path, keep_permissions=keep_permissions, progress=progress,
+                error=error)
+
+
+def untargz(filename, destination=".", fileobj=None):
+    """ Extracts the 'filename' tar, or the one read from the 'fileobj' stream, as a download
+    """
+    extract_tar(filename, destination, fileobj=fileobj)
 
 
 def check_with_algorithm_sum(algorithm_name, file_path, signature):
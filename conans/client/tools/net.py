@@ -1,6 +1,7 @@
 import sys
 
 import os
+from conans.client.download_cache import download_cache as _download_cache
 from conans.client.output import ConanOutput
 from conans.client.rest.uploader_downloader import Downloader
 from conans.client.tools.files import unzip, check_md5, check_sha1, check_sha256
@@ -13,7 +14,7 @@ def get(url, md5='', sha1='', sha256=''):
     """ high level downloader + unzipper + (optional hash checker) + delete temporary zip
     """
     filename = os.path.basename(url)
-    download(url, filename)
+    _download(url, filename, checksums={"md5": md5, "sha1": sha1, "sha256": sha256})
 
     if md5:
         check_md5(filename, md5)
@@ -47,12 +48,31 @@ def ftp_download(ip, filename, login='', password=''):
 
 def download(url, filename, verify=True, out=None, retry=2, retry_wait=5, overwrite=False,
              auth=None, headers=None):
+    _download(url, filename, verify=verify, out=out, retry=retry, retry_wait=retry_wait,
+              overwrite=overwrite, auth=auth, headers=headers)
+
+
+def _download(url, filename, verify=True, out=None, retry=2, retry_wait=5, overwrite=False,
+              auth=None, headers=None, checksums=None):
     out = out or ConanOutput(sys.stdout, True)
     if verify:
         # We check the certificate using a list of known verifiers
         import conans.client.rest.cacert as cacert
         verify = cacert.file_path
     downloader = Downloader(_global_requester, out, verify=verify)
-    downloader.download(url, filename, retry=retry, retry_wait=retry_wait, overwrite=overwrite,
-                        auth=auth, headers=headers)
-    out.writeln("")
+
+    def download_file(file_path):
+        downloader.download(url, file_path, retry=retry, retry_wait=retry_wait,
+                            overwrite=overwrite, auth=auth, headers=headers)
+        out.writeln("")
+
+    cache = _download_cache()
+    # Authenticated downloads are never shared, the headers can authenticate them too
+    if cache is None or auth or headers:
+        download_file(filename)
+        return
+
+    if os.path.exists(filename) and not overwrite:
+        raise ConanException("Error, the file to download already exists: '%s'" % filename)
+    if cache.get(url, filename, checksums or {}, download_file):
+        out.info("Using cached download of %s" % url)
@@ -0,0 +1,112 @@
+""" Fast removal of the folders of the local cache: they are renamed into the trash folder,
+so they are gone for any other command instantly, and deleted later in parallel, by a
+background thread of the command that removed them, or by "conan cache gc".
+
+The trash folder must be in the same file system than the storage folder, otherwise the
+folders are deleted synchronously, as before.
+"""
+import os
+import tempfile
+import threading
+from multiprocessing.pool import ThreadPool
+
+from conans.util.files import rmdir, load, mkdir
+from conans.util.log import logger
+from conans.util.windows import CONAN_LINK
+
+TRASH_FOLDER = "trash"
+PURGE_THREADS = 8  # Deleting is I/O bound
+
+_background_purges = []
+_background_lock = threading.Lock()
+
+
+class Trash(object):
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    @property
+    def folder(self):
+        return self._folder
+
+    def put(self, path):
+        """ Moves the 'path' folder, and the short path folder it links to, if any, to the
+        trash. Returns False if not possible, so it has to be removed in place
+        """
+        if not os.path.exists(path):
+            return True
+        link = os.path.join(path, CONAN_LINK)
+        if os.path.exists(link):
+            short_path = load(link)
+            if os.path.exists(short_path) and not self._move(os.path.dirname(short_path)):
+                return False
+        return self._move(path)
+
+    def _move(self, path):
+        try:
+            mkdir(self._folder)
+            entry = tempfile.mkdtemp(dir=self._folder)
+            os.rename(path, os.path.join(entry, os.path.basename(path)))
+            return True
+        except OSError as e:  # Different file systems, busy folder...
+            logger.debug("Folder %s not moved to trash: %s" % (path, str(e)))
+            return False
+
+    def entries(self):
+        if not os.path.isdir(self._folder):
+            return []
+        return [os.path.join(self._folder, name) for name in os.listdir(self._folder)]
+
+    def purge(self):
+        """ Deletes all the trashed folders in parallel. Returns the number of deleted ones.
+        Other processes can be purging the same trash at the same time
+        """
+        entries = self.entries()
+        if not entries:
+            return 0
+        pool = ThreadPool(min(PURGE_THREADS, len(entries)))
+        try:
+            return sum(pool.map(_delete, entries))
+        finally:
+            pool.close()
+            pool.join()
+
+    def purge_background(self, callback=None):
+        """ purge() in a thread, the process will not exit until it finishes.
+        The 'callback' is called after it
+        """
+        def purge():
+            try:
+                self.purge()
+                if callback:
+                    callback()
+            except Exception as e:  # Whatever is left will be deleted by the next purge
+                logger.error("Error emptying the trash %s: %s" % (self._folder, str(e)))
+            finally:
+                with _background_lock:
+                    _background_purges.remove(thread)
+
+        thread = threading.Thread(target=purge, name="conan-trash-purge")
+        with _background_lock:
+            _background_purges.append(thread)
+        thread.start()
+        return thread
+
+
+def wait_background_purges():
+    """ Waits for the background purges of this process to finish
+    """
+    with _background_lock:
+        threads = list(_background_purges)
+    for thread in threads:
+        thread.join()
+
+
+def _delete(path):
+    try:
+        rmdir(path)
+        return True
+    except OSError as e:  # Concurrently purged, busy file...
+        logger.debug("Not deleted %s: %s" % (path, str(e)))
+        return not os.path.exists(path)
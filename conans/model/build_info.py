@@ -1,6 +1,8 @@
 import os
 from collections import OrderedDict
 
+from conans.util.merged_list import MergedList
+
 
 DEFAULT_INCLUDE = "include"
 DEFAULT_LIB = "lib"
@@ -105,28 +107,48 @@ class CppInfo(_CppInfo):
         return self.configs.setdefault(config, _get_cpp_info())
 
 
+def _merged_property(name):
+    def getter(self):
+        return self._merged_lists[name].values()
+
+    def setter(self, values):
+        self._merged_lists[name].set_values(values)
+    return property(getter, setter)
+
+
 class _BaseDepsCppInfo(_CppInfo):
+    # Dirs and libs of later dependencies go after, flags go before (in reverse order)
+    _appended_fields = ("includedirs", "libdirs", "bindirs", "resdirs", "builddirs", "libs")
+    _prepended_fields = ("defines", "cppflags", "cflags", "sharedlinkflags", "exelinkflags")
+
     def __init__(self):
+        merged = {name: MergedList() for name in self._appended_fields}
+        merged.update({name: MergedList(prepend=True) for name in self._prepended_fields})
+        self._merged_lists = merged
         super(_BaseDepsCppInfo, self).__init__()
 
-    def update(self, dep_cpp_info):
+    includedirs = _merged_property("includedirs")
+    libdirs = _merged_property("libdirs")
+    bindirs = _merged_property("bindirs")
+    resdirs = _merged_property("resdirs")
+    builddirs = _merged_property("builddirs")
+    libs = _merged_property("libs")
+    defines = _merged_property("defines")
+    cppflags = _merged_property("cppflags")
+    cflags = _merged_property("cflags")
+    sharedlinkflags = _merged_property("sharedlinkflags")
+    exelinkflags = _merged_property("exelinkflags")
 
-        def merge_lists(seq1, seq2):
-            return [s for s in seq1 if s not in seq2] + seq2
-
-        self.includedirs = merge_lists(self.includedirs, dep_cpp_info.include_paths)
-        self.libdirs = merge_lists(self.libdirs, dep_cpp_info.lib_paths)
-        self.bindirs = merge_lists(self.bindirs, dep_cpp_info.bin_paths)
-        self.resdirs = merge_lists(self.resdirs, dep_cpp_info.res_paths)
-        self.builddirs = merge_lists(self.builddirs, dep_cpp_info.build_paths)
-        self.libs = merge_lists(self.libs, dep_cpp_info.libs)
-
-        # Note these are in reverse order
-        self.defines = merge_lists(dep_cpp_info.defines, self.defines)
-        self.cppflags = merge_lists(dep_cpp_info.cppflags, self.cppflags)
-        self.cflags = merge_lists(dep_cpp_info.cflags, self.cflags)
-        self.sharedlinkflags = merge_lists(dep_cpp_info.sharedlinkflags, self.sharedlinkflags)
-        self.exelinkflags = merge_lists(dep_cpp_info.exelinkflags, self.exelinkflags)
+    def update(self, dep_cpp_info):
+        merged = self._merged_lists
+        merged["includedirs"].merge(dep_cpp_info.include_paths)
+        merged["libdirs"].merge(dep_cpp_info.lib_paths)
+        merged["bindirs"].merge(dep_cpp_info.bin_paths)
+        merged["resdirs"].merge(dep_cpp_info.res_paths)
+        merged["builddirs"].merge(dep_cpp_info.build_paths)
+        merged["libs"].merge(dep_cpp_info.libs)
+        for name in self._prepended_fields:
+            merged[name].merge(getattr(dep_cpp_info, name))
 
         if not self.sysroot:
             self.sysroot = dep_cpp_info.sysroot
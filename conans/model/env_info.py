@@ -4,6 +4,7 @@ from collections import OrderedDict, defaultdict
 
 from conans.errors import ConanException
 from conans.util.log import logger
+from conans.util.merged_list import MergedList
 
 
 def unquote(text):
@@ -208,6 +209,30 @@ class DepsEnvInfo(EnvInfo):
     def __init__(self):
         super(DepsEnvInfo, self).__init__()
         self._dependencies_ = OrderedDict()
+        # {name: MergedList} of the list variables, updated into _values_ when read
+        self._merged_ = {}
+        self._outdated_ = set()
+
+    def _sync_merged_(self):
+        for name in self._outdated_:
+            self._values_[name] = self._merged_[name].values()
+        self._outdated_.clear()
+
+    def __getattr__(self, name):
+        if not (name.startswith("_") and name.endswith("_")):
+            self._sync_merged_()
+        return super(DepsEnvInfo, self).__getattr__(name)
+
+    def __setattr__(self, name, value):
+        if not (name.startswith("_") and name.endswith("_")):
+            self._sync_merged_()
+            self._merged_.pop(name, None)
+        return super(DepsEnvInfo, self).__setattr__(name, value)
+
+    @property
+    def vars(self):
+        self._sync_merged_()
+        return self._values_
 
     @property
     def dependencies(self):
@@ -223,18 +248,18 @@ class DepsEnvInfo(EnvInfo):
     def update(self, dep_env_info, pkg_name):
         self._dependencies_[pkg_name] = dep_env_info
 
-        def merge_lists(seq1, seq2):
-            return [s for s in seq1 if s not in seq2] + seq2
-
         # With vars if its set the keep the set value
         for varname, value in dep_env_info.vars.items():
-            if varname not in self.vars:
-                self.vars[varname] = value
-            elif isinstance(self.vars[varname], list):
-                if isinstance(value, list):
-                    self.vars[varname] = merge_lists(self.vars[varname], value)
-                else:
-                    self.vars[varname] = merge_lists(self.vars[varname], [value])
+            current = self._values_.get(varname)
+            if varname not in self._values_:
+                self._values_[varname] = value
+            elif isinstance(current, list):
+                merged = self._merged_.get(varname)
+                if merged is None:
+                    merged = self._merged_[varname] = MergedList()
+                    merged.set_values(current)
+                merged.merge(value if isinstance(value, list) else [value])
+                self._outdated_.add(varname)
             else:
                 logger.warn("DISCARDED variable %s=%s from %s" % (varname, value, pkg_name))
 
@@ -1,4 +1,9 @@
+import os
+import threading
+import time
+
 from conans.errors import ConanException
+from conans.model import revision
 from conans.model.env_info import EnvValues
 from conans.model.options import OptionsValues
 from conans.model.ref import PackageReference
@@ -8,12 +13,26 @@ from conans.util.config_parser import ConfigParser
 from conans.util.files import load
 from conans.util.sha import sha1
 
+# {conaninfo path: ((mtime, size, inode), ConanInfo)} of ConanInfo.load_file_cached()
+_parsed_files = {}
+_parsed_files_lock = threading.Lock()
+MAX_PARSED_FILES = 10000
+# Files modified so recently could be modified again without changing its stat, not cached
+RACY_SECONDS = 1
+
 
 class RequirementInfo(object):
+    __slots__ = ("package", "full_name", "full_version", "full_user", "full_channel",
+                 "full_package_id", "name", "version", "user", "channel", "package_id")
+
     def __init__(self, value_str, indirect=False):
         """ parse the input into fields name, version...
+        value_str can be also the PackageReference, not parsed again
         """
-        ref = PackageReference.loads(value_str)
+        if isinstance(value_str, PackageReference):
+            ref = value_str
+        else:
+            ref = PackageReference.loads(value_str)
         self.package = ref
         self.full_name = ref.conan.name
         self.full_version = ref.conan.version
@@ -27,6 +46,10 @@ class RequirementInfo(object):
         else:
             self.semver()
 
+    def __setattr__(self, attr, value):
+        super(RequirementInfo, self).__setattr__(attr, value)
+        revision.changed()
+
     def dumps(self):
         if not self.name:
             return ""
@@ -103,24 +126,27 @@ class RequirementInfo(object):
 class RequirementsInfo(object):
     def __init__(self, requires):
         # {PackageReference: RequirementInfo}
-        self._data = {r: RequirementInfo(str(r)) for r in requires}
+        self._data = {r: RequirementInfo(r) for r in requires}
 
     def copy(self):
         return RequirementsInfo(self._data.keys())
 
     def clear(self):
         self._data = {}
+        revision.changed()
 
     def remove(self, *args):
         for name in args:
             del self._data[self._get_key(name)]
+        revision.changed()
 
     def add(self, indirect_reqs):
         """ necessary to propagate from upstream the real
         package requirements
         """
         for r in indirect_reqs:
-            self._data[r] = RequirementInfo(str(r), indirect=True)
+            self._data[r] = RequirementInfo(r, indirect=True)
+        revision.changed()
 
     def refs(self):
         """ used for updating downstream requirements with this
@@ -225,6 +251,13 @@ class RequirementsList(list):
 
 
 class ConanInfo(object):
+    # The values the package_id is computed from, any change in them invalidates it
+    _package_id_fields = ("settings", "options", "requires")
+
+    def __setattr__(self, attr, value):
+        super(ConanInfo, self).__setattr__(attr, value)
+        if attr in ConanInfo._package_id_fields:
+            revision.changed()
 
     def copy(self):
         """ Useful for build_id implementation
@@ -320,21 +353,44 @@ class ConanInfo(object):
         else:
             return ConanInfo.loads(config_text)
 
+    @staticmethod
+    def load_file_cached(conan_info_path):
+        """ load_file(), but parsing the file again only if its stat changed. The returned
+        ConanInfo is shared, it must not be modified
+        """
+        try:
+            st = os.stat(conan_info_path)
+        except OSError:
+            raise ConanException("Does not exist %s" % conan_info_path)
+        stat = getattr(st, "st_mtime_ns", st.st_mtime), st.st_size, st.st_ino
+        with _parsed_files_lock:
+            cached = _parsed_files.get(conan_info_path)
+        if cached is not None and cached[0] == stat:
+            return cached[1]
+        info = ConanInfo.load_file(conan_info_path)
+        if time.time() - st.st_mtime > RACY_SECONDS:
+            with _parsed_files_lock:
+                if len(_parsed_files) >= MAX_PARSED_FILES:
+                    _parsed_files.clear()
+                _parsed_files[conan_info_path] = stat, info
+        return info
+
     def package_id(self):
         """ The package_id of a conans is the sha1 of its specific requirements,
         options and settings
         """
         computed_id = getattr(self, "_package_id", None)
-        if computed_id:
+        if computed_id and self._package_id_revision == revision.current():
             return computed_id
-        result = []
-        result.append(self.settings.sha)
         # Only are valid requires for OPtions those Non-Dev who are still in requires
-
         self.options.filter_used(self.requires.pkg_names)
+        computed_revision = revision.current()  # After filter_used(), it can change it
+        result = []
+        result.append(self.settings.sha)
         result.append(self.options.sha)
         result.append(self.requires.sha)
         self._package_id = sha1('\n'.join(result).encode())
+        self._package_id_revision = computed_revision
         return self._package_id
 
     def serialize(self):
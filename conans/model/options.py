@@ -1,11 +1,15 @@
 from conans.util.sha import sha1
 from conans.errors import ConanException
+from conans.model import revision
 import yaml
 import six
 import fnmatch
 
 
 _falsey_options = ["false", "none", "0", "off", ""]
+# {value: PackageOptionValue}, immutable, shared by all the packages options with that value
+_option_values = {}
+MAX_OPTION_VALUES = 10000
 
 
 def option_wrong_value_msg(name, value, value_range):
@@ -33,6 +37,8 @@ class PackageOptionValue(str):
     """ thin wrapper around a string value that allows to check for several false string
     and also promote other types to string for homegeneous comparison
     """
+    __slots__ = ()
+
     def __bool__(self):
         return self.lower() not in _falsey_options
 
@@ -46,6 +52,16 @@ class PackageOptionValue(str):
         return not self.__eq__(other)
 
 
+def _option_value(value):
+    value = str(value)
+    result = _option_values.get(value)
+    if result is None:
+        if len(_option_values) >= MAX_OPTION_VALUES:
+            _option_values.clear()
+        result = _option_values[value] = PackageOptionValue(value)
+    return result
+
+
 class PackageOptionValues(object):
     """ set of key(string)-value(PackageOptionValue) for options of a package.
     Not prefixed by package name:
@@ -54,9 +70,11 @@ class PackageOptionValues(object):
     These are non-validating, not constrained.
     Used for UserOptions, which is a dict{package_name: PackageOptionValues}
     """
+    __slots__ = ("_dict", "_modified")
+
     def __init__(self):
         self._dict = {}  # {option_name: PackageOptionValue}
-        self._modified = {}
+        self._modified = None  # {option_name: (value, down_ref)}, created when needed
 
     def __getattr__(self, attr):
         if attr not in self._dict:
@@ -65,16 +83,17 @@ class PackageOptionValues(object):
 
     def clear(self):
         self._dict.clear()
+        revision.changed()
 
     def __setattr__(self, attr, value):
         if attr[0] == "_":
             return super(PackageOptionValues, self).__setattr__(attr, value)
-        self._dict[attr] = PackageOptionValue(value)
+        self._dict[attr] = _option_value(value)
+        revision.changed()
 
     def copy(self):
         result = PackageOptionValues()
-        for k, v in self._dict.items():
-            result._dict[k] = v
+        result._dict = dict(self._dict)
         return result
 
     @property
@@ -87,17 +106,21 @@ class PackageOptionValues(object):
     def add(self, option_text):
         assert isinstance(option_text, six.string_types)
         name, value = option_text.split("=")
-        self._dict[name.strip()] = PackageOptionValue(value.strip())
+        self._dict[name.strip()] = _option_value(value.strip())
+        revision.changed()
 
     def add_option(self, option_name, option_value):
-        self._dict[option_name] = PackageOptionValue(option_value)
+        self._dict[option_name] = _option_value(option_value)
+        revision.changed()
 
     def update(self, other):
         assert isinstance(other, PackageOptionValues)
         self._dict.update(other._dict)
+        revision.changed()
 
     def remove(self, option_name):
         del self._dict[option_name]
+        revision.changed()
 
     def propagate_upstream(self, down_package_values, down_ref, own_ref, output, package_name):
         if not down_package_values:
@@ -109,7 +132,7 @@ class PackageOptionValues(object):
             if value == current_value:
                 continue
 
-            modified = self._modified.get(name)
+            modified = self._modified.get(name) if self._modified else None
             if modified is not None:
                 modified_value, modified_ref = modified
                 output.werror("%s tried to change %s option %s:%s to %s\n"
@@ -117,8 +140,11 @@ class PackageOptionValues(object):
                               % (down_ref, own_ref, package_name, name, value,
                                  modified_value, modified_ref))
             else:
+                if self._modified is None:
+                    self._modified = {}
                 self._modified[name] = (value, down_ref)
                 self._dict[name] = value
+                revision.changed()
 
     def serialize(self):
         return self.items()
@@ -188,9 +214,13 @@ class OptionsValues(object):
 
     def __setitem__(self, item, value):
         self._reqs_options[item] = value
+        revision.changed()
 
     def pop(self, item):
-        return self._reqs_options.pop(item, None)
+        result = self._reqs_options.pop(item, None)
+        if result is not None:
+            revision.changed()
+        return result
 
     def remove(self, name, package=None):
         if package:
@@ -221,7 +251,10 @@ class OptionsValues(object):
             v.clear()
 
     def filter_used(self, used_pkg_names):
-        self._reqs_options = {k: v for k, v in self._reqs_options.items() if k in used_pkg_names}
+        if any(k not in used_pkg_names for k in self._reqs_options):
+            self._reqs_options = {k: v for k, v in self._reqs_options.items()
+                                  if k in used_pkg_names}
+            revision.changed()
 
     def as_list(self):
         result = []
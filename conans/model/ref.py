@@ -3,6 +3,20 @@ import re
 from conans.errors import ConanException, InvalidNameException
 from conans.model.version import Version
 
+# The references are immutable, the validated ones are shared instead of created and
+# validated again: {(name, version, user, channel): ConanFileReference}
+_interned_refs = {}
+# {text: ConanFileReference} of ConanFileReference.loads()
+_loaded_refs = {}
+MAX_INTERNED_REFS = 10000
+
+
+def _intern(cache, key, value):
+    if len(cache) >= MAX_INTERNED_REFS:
+        cache.clear()
+    cache[key] = value
+    return value
+
 
 class ConanName(object):
     _max_chars = 50
@@ -45,6 +59,7 @@ class ConanFileReference(namedtuple("ConanFileReference", "name version user cha
     """ Full reference of a package recipes, e.g.:
     opencv/2.4.10@lasote/testing
     """
+    __slots__ = ()
     whitespace_pattern = re.compile(r"\s+")
     sep_pattern = re.compile("@|/")
 
@@ -53,25 +68,36 @@ class ConanFileReference(namedtuple("ConanFileReference", "name version user cha
         @param name:        string containing the desired name
         @param validate:    checks for valid complex name. default True
         """
+        key = (name, version, user, channel)
+        if cls is ConanFileReference:
+            ref = _interned_refs.get(key)
+            if ref is not None:
+                return ref
         ConanName.validate_name(name)
         ConanName.validate_name(version, True)
         ConanName.validate_name(user)
         ConanName.validate_name(channel)
         version = Version(version)
-        return super(cls, ConanFileReference).__new__(cls, name, version, user, channel)
+        ref = super(cls, ConanFileReference).__new__(cls, name, version, user, channel)
+        if cls is ConanFileReference:
+            _intern(_interned_refs, key, ref)
+        return ref
 
     @staticmethod
     def loads(text):
         """ Parses a text string to generate a ConanFileReference object
         """
-        text = ConanFileReference.whitespace_pattern.sub("", text)
-        tokens = ConanFileReference.sep_pattern.split(text)
+        ref = _loaded_refs.get(text)
+        if ref is not None:
+            return ref
+        stripped = ConanFileReference.whitespace_pattern.sub("", text)
+        tokens = ConanFileReference.sep_pattern.split(stripped)
         try:
             name, version, user, channel = tokens
         except ValueError:
             raise ConanException("Wrong package recipe reference %s\nWrite something like "
-                                 "OpenCV/1.0.6@user/stable" % text)
-        return ConanFileReference(name, version, user, channel)
+                                 "OpenCV/1.0.6@user/stable" % stripped)
+        return _intern(_loaded_refs, text, ConanFileReference(name, version, user, channel))
 
     def __repr__(self):
         return "%s/%s@%s/%s" % (self.name, self.version, self.user, self.channel)
@@ -81,6 +107,7 @@ class PackageReference(namedtuple("PackageReference", "conan package_id")):
     """ Full package reference, e.g.:
     opencv/2.4.10@lasote/testing, fe566a677f77734ae
     """
+    __slots__ = ()
 
     @staticmethod
     def loads(text):
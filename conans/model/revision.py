@@ -0,0 +1,17 @@
+""" Revision of the values the package IDs are computed from: settings and options values and
+requirements info. Every mutation of any of them changes it, so a package ID computed at some
+revision is still valid while the revision is the same
+"""
+import itertools
+
+_counter = itertools.count(1)
+_revision = [0]
+
+
+def changed():
+    """ To be called after any mutation of a package_id input """
+    _revision[0] = next(_counter)  # Unique values, so concurrent changes never repeat one
+
+
+def current():
+    return _revision[0]
@@ -1,5 +1,7 @@
 from conans.errors import ConanException
 import yaml
+from six.moves import intern
+
 from conans.model.values import Values
 
 
@@ -25,6 +27,8 @@ def undefined_value(name):
 
 
 class SettingsItem(object):
+    __slots__ = ("_name", "_value", "_definition")
+
     def __init__(self, definition, name):
         self._name = name
         self._value = None
@@ -37,8 +41,8 @@ class SettingsItem(object):
         elif definition == "ANY":
             self._definition = "ANY"
         else:
-            # list or tuple of possible values
-            self._definition = sorted(str(v) for v in definition)
+            # list or tuple of possible values, never modified, shared by the copies
+            self._definition = sorted(intern(str(v)) for v in definition)
 
     def __contains__(self, value):
         return value in (self._value or "")
@@ -49,7 +53,7 @@ class SettingsItem(object):
         result = SettingsItem({}, name=self._name)
         result._value = self._value
         if self.is_final:
-            result._definition = self._definition[:]
+            result._definition = self._definition
         else:
             result._definition = {k: v.copy() for k, v in self._definition.items()}
         return result
@@ -61,7 +65,7 @@ class SettingsItem(object):
         result = SettingsItem({}, name=self._name)
         result._value = self._value
         if self.is_final:
-            result._definition = self._definition[:]
+            result._definition = self._definition
         else:
             result._definition = {k: v.copy_values() for k, v in self._definition.items()}
         return result
@@ -110,7 +114,7 @@ class SettingsItem(object):
                 self._definition.pop(v, None)
             elif self._definition != "ANY":
                 if v in self._definition:
-                    self._definition.remove(v)
+                    self._definition = [d for d in self._definition if d != v]
         if self._value is not None and self._value not in self._definition:
             raise ConanException(bad_value_msg(self._name, self._value, self.values_range))
 
@@ -150,7 +154,7 @@ class SettingsItem(object):
         v = str(v)
         if self._definition != "ANY" and v not in self._definition:
             raise ConanException(bad_value_msg(self._name, v, self.values_range))
-        self._value = v
+        self._value = intern(v)
 
     @property
     def values_range(self):
@@ -180,6 +184,8 @@ class SettingsItem(object):
 
 
 class Settings(object):
+    __slots__ = ("_name", "_parent_value", "_data")
+
     def __init__(self, definition=None, name="settings", parent_value=None):
         definition = definition or {}
         self._name = name  # settings, settings.compiler
@@ -198,12 +204,13 @@ class Settings(object):
             return str(tmp)
         return None
 
-    def copy(self):
-        """ deepcopy, recursive
+    def copy(self, fields=None):
+        """ deepcopy, recursive. Only of the given first level 'fields', if not None
         """
         result = Settings({}, name=self._name, parent_value=self._parent_value)
         for k, v in self._data.items():
-            result._data[k] = v.copy()
+            if fields is None or k in fields:
+                result._data[k] = v.copy()
         return result
 
     def copy_values(self):
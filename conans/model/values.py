@@ -1,12 +1,16 @@
+from six.moves import intern
+
 from conans.util.sha import sha1
 from conans.errors import ConanException
+from conans.model import revision
 
 
 class Values(object):
+    __slots__ = ("_value", "_dict")
+
     def __init__(self, value="values"):
-        self._value = str(value)
+        self._value = intern(str(value))  # The same values repeat in every node of a graph
         self._dict = {}  # {key: Values()}
-        self._modified = {}  # {"compiler.version.arch": (old_value, old_reference)}
 
     def __getattr__(self, attr):
         if attr not in self._dict:
@@ -17,11 +21,13 @@ class Values(object):
         # TODO: Test. DO not delete, might be used by package_id() to clear settings values
         self._dict.clear()
         self._value = ""
+        revision.changed()
 
     def __setattr__(self, attr, value):
         if attr[0] == "_":
             return super(Values, self).__setattr__(attr, value)
         self._dict[attr] = Values(value)
+        revision.changed()
 
     def copy(self):
         """ deepcopy, recursive
@@ -32,6 +32,11 @@ class SearchAdapterABC(object):
     def join_paths(self, *args):
         pass
 
+    def load_conan_info(self, filepath):
+        """ The ConanInfo of the 'filepath' conaninfo.txt, not to be modified
+        """
+        return ConanInfo.loads(self.load(filepath))
+
 
 class DiskSearchAdapter(SearchAdapterABC):
 
@@ -49,6 +54,9 @@ class DiskSearchAdapter(SearchAdapterABC):
     def join_paths(self, *args):
         return os.path.join(*args)
 
+    def load_conan_info(self, filepath):
+        return ConanInfo.load_file_cached(filepath)
+
 
 class SearchManagerABC(object):
     """Methods that allows access to disk or s3 or whatever to make a search"""
@@ -177,8 +185,7 @@ class DiskSearchManager(SearchManagerABC):
                                                      CONANINFO)
                 if not self._adapter.path_exists(info_path):
                     raise NotFoundException("")
-                conan_info_content = self._adapter.load(info_path)
-                conan_vars_info = ConanInfo.loads(conan_info_content).serialize_min()
+                conan_vars_info = self._adapter.load_conan_info(info_path).serialize_min()
                 result[package_id] = conan_vars_info
 
             except Exception as exc:
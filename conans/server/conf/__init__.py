@@ -6,6 +6,7 @@ import six
 from conans import tools
 from conans.util.env_reader import get_env
 from datetime import timedelta
+import multiprocessing
 import os
 import random
 import string
@@ -45,6 +46,12 @@ class ConanServerConfigParser(ConfigParser):
                            "public_port": get_env("CONAN_SERVER_PUBLIC_PORT", None, environment),
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
+                           "server_backend": get_env("CONAN_SERVER_BACKEND", None, environment),
+                           "server_workers": get_env("CONAN_SERVER_WORKERS", None, environment),
+                           "upstream": get_env("CONAN_SERVER_UPSTREAM", None, environment),
+                           "upstream_user": get_env("CONAN_SERVER_UPSTREAM_USER", None, environment),
+                           "upstream_password": get_env("CONAN_SERVER_UPSTREAM_PASSWORD", None,
+                                                        environment),
                            # "user:pass,user2:pass2"
                            "users": get_env("CONAN_SERVER_USERS", None, environment)}
 
@@ -150,6 +157,56 @@ class ConanServerConfigParser(ConfigParser):
         except ConanException:
             return None
 
+    @property
+    def server_backend(self):
+        """WSGI server: "threaded", "prefork", "wsgiref" (single threaded) or any other
+        server name supported by bottle, like "waitress" or "gunicorn" (if installed)"""
+        try:
+            return self._get_conf_server_string("server_backend") or "threaded"
+        except ConanException:
+            return "threaded"
+
+    @property
+    def server_workers(self):
+        """Number of worker processes for the "prefork" backend"""
+        try:
+            workers = self._get_conf_server_string("server_workers")
+        except ConanException:
+            workers = None
+        if not workers:
+            return multiprocessing.cpu_count()
+        try:
+            workers = int(workers)
+        except ValueError:
+            workers = 0
+        if workers < 1:
+            raise ConanException("'server_workers' has to be a positive integer")
+        return workers
+
+    @property
+    def upstream(self):
+        """URL of the remote to fetch the recipes and packages not in the store, None if
+        the server is not a pull-through cache"""
+        try:
+            return self._get_conf_server_string("upstream") or None
+        except ConanException:
+            return None
+
+    @property
+    def upstream_credentials(self):
+        """(user, password) to authenticate in the upstream remote, None for anonymous"""
+        try:
+            user = self._get_conf_server_string("upstream_user")
+        except ConanException:
+            return None
+        if not user:
+            return None
+        try:
+            password = self._get_conf_server_string("upstream_password")
+        except ConanException:
+            password = ""
+        return user, password
+
     @property
     def users(self):
         def validate_pass_encoding(password):
@@ -11,6 +11,19 @@ port: 9300
 public_port:
 host_name: localhost
 
+# WSGI server: "threaded" (default), "prefork" (worker processes, not available in Windows),
+# "wsgiref" (single threaded), or other bottle server like "waitress" or "gunicorn" if installed
+server_backend: threaded
+# Number of processes for the "prefork" backend. If empty, the number of CPUs
+server_workers:
+
+# Pull-through cache of other remote: the recipes and packages not found in this server
+# are fetched from the "upstream" remote URL, stored and served. Anonymous access if the
+# upstream user is not specified
+# upstream: https://myremote.com
+# upstream_user: user
+# upstream_password: password
+
 # Choose file adapter, "disk" for disk storage
 # Authorize timeout are seconds the client has to upload/download files until authorization expires
 store_adapter: disk
@@ -7,6 +7,7 @@ from conans.server.rest.controllers.conan_controller import ConanController
 from conans.server.rest.controllers.users_controller import UsersController
 from conans.server.rest.controllers.file_upload_download_controller import FileUploadDownloadController
 from conans.server.rest.bottle_plugins.version_checker import VersionCheckerPlugin
+from conans.server.rest.bottle_plugins.gzip_json import GzipJSONPlugin
 
 
 class ApiV1(Bottle):
@@ -38,6 +39,9 @@ class ApiV1(Bottle):
                                           self.min_client_compatible_version,
                                           self.server_capabilities))
 
+        # Compress the big JSON responses
+        self.install(GzipJSONPlugin())
+
         # Second, check Http Basic Auth
         self.install(HttpBasicAuthentication())
 
@@ -0,0 +1,46 @@
+import gzip
+import io
+import json
+
+from bottle import request, response
+
+
+class GzipJSONPlugin(object):
+    ''' The GzipJSONPlugin plugin compresses the JSON responses, as the search results, if they
+        are big enough and the client accepts gzip encoding'''
+
+    name = 'GzipJSONPlugin'
+    api = 2
+
+    def __init__(self, min_size=512, compress_level=6):
+        self.min_size = min_size
+        self.compress_level = compress_level
+
+    def setup(self, app):
+        ''' Make sure that other installed plugins don't affect the same
+            keyword argument.'''
+        for other in app.plugins:
+            if not isinstance(other, GzipJSONPlugin):
+                continue
+
+    def apply(self, callback, _):
+        '''Apply plugin'''
+        def wrapper(*args, **kwargs):
+            ret = callback(*args, **kwargs)
+            if not isinstance(ret, dict):
+                return ret
+            accepted = request.headers.get("Accept-Encoding", "")
+            if "gzip" not in [encoding.split(";")[0].strip()
+                              for encoding in accepted.split(",")]:
+                return ret
+            body = json.dumps(ret).encode("utf-8")
+            response.content_type = "application/json"
+            response.set_header("Vary", "Accept-Encoding")
+            if len(body) < self.min_size:
+                return body
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=self.compress_level) as f:
+                f.write(body)
+            response.set_header("Content-Encoding", "gzip")
+            return buf.getvalue()
+        return wrapper
@@ -1,5 +1,8 @@
+import time
+
 from bottle import HTTPResponse
 from conans.server.rest.bottle_plugins.authorization_header import AuthorizationHeader
+from conans.util.lru_cache import LRUCache
 
 
 class JWTAuthentication(AuthorizationHeader):
@@ -8,16 +11,31 @@ class JWTAuthentication(AuthorizationHeader):
     name = 'jwtauthenticationbottleplugin'
     api = 2
 
-    def __init__(self, manager, keyword='auth_user'):
+    def __init__(self, manager, keyword='auth_user', cache_size=1000):
         '''Manager should be a JWTCredentialsManager'''
         self.manager = manager
         self.keyword = keyword
+        # Decoded tokens {token: (username, expiration timestamp)}, valid for their lifetime
+        self._tokens = LRUCache(cache_size)
         super(JWTAuthentication, self).__init__(keyword)
 
     def get_authorization_type(self):
         """String in Authorization header for type"""
         return "Bearer"
 
+    def _get_user(self, token):
+        cached = self._tokens.get(token)
+        if cached is not None:
+            username, expiration = cached
+            if expiration is None or time.time() < expiration:
+                return username
+            self._tokens.pop(token)
+        # Raises if the token is invalid or expired
+        profile = self.manager.get_profile(token)
+        username = profile.get("user", None)
+        self._tokens.put(token, (username, profile.get("exp", None)))
+        return username
+
     def parse_authorization_value(self, header_value):
         """Parse header_value and return kwargs to apply bottle
         method parameters"""
@@ -26,7 +44,7 @@ class JWTAuthentication(AuthorizationHeader):
                 username = None
             else:
                 # Check if its valid obtaining the password_timestamp
-                username = self.manager.get_user(token=header_value)
+                username = self._get_user(header_value)
         except Exception:
             # Check if
             resp = HTTPResponse("Wrong JWT token!", "401 Unauthorized")
@@ -1,12 +1,15 @@
-from conans.server.rest.controllers.controller import Controller
+from conans.server.rest.controllers.controller import Controller, check_etag
 from bottle import request
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.service.service import ConanService, SearchService
-from conans.errors import NotFoundException
+from conans.errors import NotFoundException, RequestErrorException, ConanException
 import json
 from conans.paths import CONAN_MANIFEST
 import os
 import codecs
+from conans.util.files import md5
+
+MAX_SEARCH_PAGE_SIZE = 10000
 
 
 class ConanController(Controller):
@@ -29,7 +32,8 @@ class ConanController(Controller):
             """
             Get a dict with all files and the download url
             """
-            conan_service = ConanService(app.authorizer, app.file_manager, auth_user)
+            conan_service = ConanService(app.authorizer, app.file_manager, auth_user,
+                                         app.upstream)
             reference = ConanFileReference(conanname, version, username, channel)
             urls = conan_service.get_conanfile_download_urls(reference, [CONAN_MANIFEST])
             if not urls:
@@ -41,7 +45,8 @@ class ConanController(Controller):
             """
             Get a dict with all files and the download url
             """
-            conan_service = ConanService(app.authorizer, app.file_manager, auth_user)
+            conan_service = ConanService(app.authorizer, app.file_manager, auth_user,
+                                         app.upstream)
             reference = ConanFileReference(conanname, version, username, channel)
             package_reference = PackageReference(reference, package_id)
 
@@ -61,6 +66,7 @@ class ConanController(Controller):
             snapshot = conan_service.get_conanfile_snapshot(reference)
             snapshot_norm = {filename.replace("\\", "/"): the_md5
                              for filename, the_md5 in snapshot.items()}
+            check_etag(_snapshot_md5(snapshot_norm))
             return snapshot_norm
 
         @app.route('%s/packages/:package_id' % conan_route, method=["GET"])
@@ -74,14 +80,27 @@ class ConanController(Controller):
             snapshot = conan_service.get_package_snapshot(package_reference)
             snapshot_norm = {filename.replace("\\", "/"): the_md5
                              for filename, the_md5 in snapshot.items()}
+            check_etag(_snapshot_md5(snapshot_norm))
             return snapshot_norm
 
+        @app.route('%s/packages/digests' % conan_route, method=["POST"])
+        def get_packages_digests(conanname, version, username, channel, auth_user):
+            """
+            Get a dictionary with the md5 of the manifest of the requested packages
+            """
+            conan_service = ConanService(app.authorizer, app.file_manager, auth_user)
+            reference = ConanFileReference(conanname, version, username, channel)
+            reader = codecs.getreader("utf-8")
+            payload = json.load(reader(request.body))
+            return conan_service.get_packages_digests(reference, payload["package_ids"])
+
         @app.route("%s/download_urls" % conan_route, method=["GET"])
         def get_conanfile_download_urls(conanname, version, username, channel, auth_user):
             """
             Get a dict with all files and the download url
             """
-            conan_service = ConanService(app.authorizer, app.file_manager, auth_user)
+            conan_service = ConanService(app.authorizer, app.file_manager, auth_user,
+                                         app.upstream)
             reference = ConanFileReference(conanname, version, username, channel)
             urls = conan_service.get_conanfile_download_urls(reference)
             urls_norm = {filename.replace("\\", "/"): url for filename, url in urls.items()}
@@ -93,13 +112,29 @@ class ConanController(Controller):
             """
             Get a dict with all packages files and the download url for each one
             """
-            conan_service = ConanService(app.authorizer, app.file_manager, auth_user)
+            conan_service = ConanService(app.authorizer, app.file_manager, auth_user,
+                                         app.upstream)
             reference = ConanFileReference(conanname, version, username, channel)
             package_reference = PackageReference(reference, package_id)
             urls = conan_service.get_package_download_urls(package_reference)
             urls_norm = {filename.replace("\\", "/"): url for filename, url in urls.items()}
             return urls_norm
 
+        @app.route('%s/packages/:package_id/file_urls' % conan_route, method=["POST"])
+        def get_package_file_urls(conanname, version, username, channel, package_id,
+                                  auth_user):
+            """
+            Get a dict with the requested packages files and the download url for each one
+            """
+            conan_service = ConanService(app.authorizer, app.file_manager, auth_user)
+            reference = ConanFileReference(conanname, version, username, channel)
+            package_reference = PackageReference(reference, package_id)
+            reader = codecs.getreader("utf-8")
+            payload = json.load(reader(request.body))
+            urls = conan_service.get_package_file_urls(package_reference, payload["files"])
+            urls_norm = {filename.replace("\\", "/"): url for filename, url in urls.items()}
+            return urls_norm
+
         @app.route("%s/upload_urls" % conan_route, method=["POST"])
         def get_conanfile_upload_urls(conanname, version, username, channel, auth_user):
             """
@@ -133,17 +168,34 @@ class ConanController(Controller):
             ignorecase = request.params.get("ignorecase", True)
             if isinstance(ignorecase, str):
                 ignorecase = False if 'false' == ignorecase.lower() else True
-            search_service = SearchService(app.authorizer, app.search_manager, auth_user)
-            references = [str(ref) for ref in search_service.search(pattern, ignorecase)]
-            return {"results": references}
+            search_service = SearchService(app.authorizer, app.search_manager, auth_user,
+                                           app.search_pages_cache)
+            limit = _search_limit()
+            if limit is None:
+                references = search_service.search(pattern, ignorecase)
+                return {"results": [str(ref) for ref in references]}
+            after = request.params.get("after", None)
+            try:
+                references, next_page = search_service.search_page(pattern, ignorecase,
+                                                                   after, limit)
+            except ConanException as e:
+                raise RequestErrorException(str(e))
+            return _page({"results": [str(ref) for ref in references]}, next_page)
 
         @app.route('%s/search' % conan_route, method=["GET"])
         def search_packages(conanname, version, username, channel, auth_user):
             query = request.params.get("q", None)
-            search_service = SearchService(app.authorizer, app.search_manager, auth_user)
+            search_service = SearchService(app.authorizer, app.search_manager, auth_user,
+                                           app.search_pages_cache)
             conan_reference = ConanFileReference(conanname, version, username, channel)
-            info = search_service.search_packages(conan_reference, query)
-            return info
+            limit = _search_limit()
+            if limit is None:
+                info = search_service.search_packages(conan_reference, query)
+                return info
+            after = request.params.get("after", None)
+            info, next_page = search_service.search_packages_page(conan_reference, query,
+                                                                  after, limit)
+            return _page({"results": info}, next_page)
 
         @app.route(conan_route, method="DELETE")
         def remove_conanfile(conanname, version, username, channel, auth_user):
@@ -181,3 +233,27 @@ class ConanController(Controller):
             payload = json.load(reader(request.body))
             files = [os.path.normpath(filename) for filename in payload["files"]]
             conan_service.remove_package_files(package_reference, files)
+
+
+def _snapshot_md5(snapshot):
+    return md5(json.dumps(snapshot, sort_keys=True))
+
+
+def _search_limit():
+    """The page size of a paginated search, None for all the results at once"""
+    value = request.params.get("limit", None)
+    if value is None:
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise RequestErrorException("Invalid search limit '%s'" % value)
+    return min(limit, MAX_SEARCH_PAGE_SIZE)
+
+
+def _page(result, next_page):
+    if next_page is not None:
+        result["next"] = next_page
+    return result
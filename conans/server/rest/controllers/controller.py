@@ -4,6 +4,8 @@ Abstact class dor define attach_to method
 '''
 from abc import ABCMeta, abstractmethod
 
+from bottle import request, response, HTTPResponse
+
 
 class Controller(object):
     __metaclass__ = ABCMeta
@@ -14,3 +16,16 @@ class Controller(object):
     @abstractmethod
     def attach_to(self, app):
         raise NotImplemented()
+
+
+def check_etag(the_md5):
+    """Sets the strong ETag of the response from the md5 of its content, and returns a
+    304 Not Modified response if it matches the If-None-Match header of the request"""
+    etag = '"%s"' % the_md5
+    response.set_header("ETag", etag)
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if etag in tags or "*" in tags:
+            raise HTTPResponse(status=304, ETag=etag)
+    return etag
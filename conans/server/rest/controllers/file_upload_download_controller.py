@@ -1,9 +1,19 @@
-from conans.server.rest.controllers.controller import Controller
-from bottle import request, static_file, FileUpload, cached_property
+from conans.server.rest.controllers.controller import Controller, check_etag
+from bottle import request, static_file
 from conans.server.service.service import FileUploadDownloadService
+from conans.server.store.disk_adapter import file_md5, saved_md5
+from conans.paths import CONAN_MANIFEST, CONANINFO
 import os
-from unicodedata import normalize
-import six
+
+
+def _etag_md5(file_path):
+    """md5 of the ETag of the file, from its saved checksum. Without it, only computed for
+    the small metadata files the clients download again, never hashing every package tgz"""
+    the_md5 = saved_md5(file_path)
+    if the_md5 is None and os.path.basename(file_path) in (CONAN_MANIFEST, CONANINFO):
+        # The downloads never write to the store, that can be read-only
+        the_md5 = file_md5(file_path, save_checksum=False)
+    return the_md5
 
 
 class FileUploadDownloadController(Controller):
@@ -21,40 +31,22 @@ class FileUploadDownloadController(Controller):
             file_path = service.get_file_path(filepath, token)
             # https://github.com/kennethreitz/requests/issues/1586
             mimetype = "x-gzip" if filepath.endswith(".tgz") else "auto"
-            return static_file(os.path.basename(file_path),
-                               root=os.path.dirname(file_path),
-                               mimetype=mimetype)
+            the_md5 = _etag_md5(file_path) if os.path.isfile(file_path) else None
+            etag = check_etag(the_md5) if the_md5 else None
+            # static_file returns the opened file, sent by the server with the
+            # wsgi.file_wrapper (os.sendfile for conan_server backends)
+            ret = static_file(os.path.basename(file_path),
+                              root=os.path.dirname(file_path),
+                              mimetype=mimetype)
+            if etag and ret.status_code == 200:
+                ret.set_header("ETag", etag)
+            return ret
 
         @app.route(self.route + '/<filepath:path>', method=["PUT"])
         def put(filepath):
             token = request.query.get("signature", None)
-            file_saver = ConanFileUpload(request.body, None,
-                                         filename=os.path.basename(filepath),
-                                         headers=request.headers)
             abs_path = os.path.abspath(os.path.join(storage_path, os.path.normpath(filepath)))
-            # Body is a stringIO (generator)
-            service.put_file(file_saver, abs_path, token, request.content_length)
-
-
-class ConanFileUpload(FileUpload):
-    """Code copied from bottle but removing filename normalizing
-    FIXME: Review bottle.FileUpload and analyze possible security or general issues    """
-    @cached_property
-    def filename(self):
-        ''' Name of the file on the client file system, but normalized to ensure
-            file system compatibility. An empty filename is returned as 'empty'.
-
-            Only ASCII letters, digits, dashes, underscores and dots are
-            allowed in the final filename. Accents are removed, if possible.
-            Whitespace is replaced by a single dash. Leading or tailing dots
-            or dashes are removed. The filename is limited to 255 characters.
-        '''
-        fname = self.raw_filename
-        if six.PY2:
-            if not isinstance(fname, unicode):
-                fname = fname.decode('utf8', 'ignore')
-        fname = normalize('NFKD', fname).encode('ASCII', 'ignore').decode('ASCII')
-        fname = os.path.basename(fname.replace('\\', os.path.sep))
-#         fname = re.sub(r'[^a-zA-Z0-9-_.\s]', '', fname).strip()
-#         fname = re.sub(r'[-\s]+', '-', fname).strip('.-')
-        return fname[:255] or 'empty'
+            # Read the body straight from the input stream, request.body would buffer it
+            # first in memory or in a temporary file
+            stream = request.environ["wsgi.input"]
+            service.put_file(stream, abs_path, token, request.content_length)
@@ -1,6 +1,8 @@
 import bottle
 from conans.server.rest.api_v1 import ApiV1
+from conans.server.rest.server_backends import get_server_backend
 from conans.model.version import Version
+from conans.server.service.service import SearchPagesCache
 
 
 class ConanServer(object):
@@ -15,7 +17,7 @@ class ConanServer(object):
     def __init__(self, run_port, credentials_manager,
                  updown_auth_manager, authorizer, authenticator,
                  file_manager, search_manager, server_version, min_client_compatible_version,
-                 server_capabilities):
+                 server_capabilities, upstream=None):
 
         assert(isinstance(server_version, Version))
         assert(isinstance(min_client_compatible_version, Version))
@@ -30,9 +32,11 @@ class ConanServer(object):
         self.root_app.mount("/v1/", self.api_v1)
         self.run_port = run_port
         self.api_v1.search_manager = search_manager
+        self.api_v1.search_pages_cache = SearchPagesCache()
         self.api_v1.authorizer = authorizer
         self.api_v1.authenticator = authenticator
         self.api_v1.file_manager = file_manager
+        self.api_v1.upstream = upstream
 
         self.api_v1.setup()
 
@@ -40,5 +44,7 @@ class ConanServer(object):
         port = kwargs.pop("port", self.run_port)
         debug_set = kwargs.pop("debug", False)
         host = kwargs.pop("host", "localhost")
-        bottle.Bottle.run(self.root_app, host=host,
-                          port=port, debug=debug_set, reloader=False)
+        # "wsgiref" is bottle's single-threaded default
+        server = get_server_backend(kwargs.pop("server", "wsgiref"))
+        bottle.Bottle.run(self.root_app, server=server, host=host,
+                          port=port, debug=debug_set, reloader=False, **kwargs)
@@ -0,0 +1,168 @@
+"""
+WSGI server backends for conan_server. bottle's default WSGIRef server handles one request
+at a time, so a single long upload blocks every other client. These adapters keep the
+standard library as the only requirement:
+
+    - "threaded": one thread per request
+    - "prefork": N worker processes accepting from the same listening socket, each one
+                 of them threaded
+
+Both send file responses (static files served through wsgi.file_wrapper) with os.sendfile
+when available, so downloads are not read through Python.
+
+Any other bottle server name (e.g. "waitress", "gunicorn", "paste") is passed through to
+bottle, so those can be used if installed.
+"""
+import os
+import signal
+import socket
+
+from bottle import ServerAdapter, WSGIRefServer
+from six.moves import socketserver
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, ServerHandler, make_server
+
+from conans.errors import ConanException
+from conans.util.log import logger
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    # Pending connections while all threads are busy or forking workers
+    request_queue_size = 128
+
+
+class SendfileServerHandler(ServerHandler):
+    """ Sends the file responses with os.sendfile, from the file to the socket, without
+    copying them to user space
+    """
+    def sendfile(self):
+        sendfile = getattr(os, "sendfile", None)
+        connection = self.request_handler.connection
+        if sendfile is None or connection.gettimeout() is not None:
+            return False
+        try:
+            in_fd = self.result.filelike.fileno()
+            out_fd = connection.fileno()
+        except (AttributeError, IOError, OSError, ValueError):
+            return False
+
+        offset = os.lseek(in_fd, 0, os.SEEK_CUR)
+        remaining = os.fstat(in_fd).st_size - offset
+        if not self.headers_sent:
+            self.bytes_sent = remaining
+            self.send_headers()
+        self._flush()
+        while remaining > 0:
+            sent = sendfile(out_fd, in_fd, offset, remaining)
+            if not sent:
+                break
+            offset += sent
+            remaining -= sent
+        return True
+
+
+def _handler_class(quiet):
+
+    class QuietHandler(WSGIRequestHandler):
+        def address_string(self):  # Prevent reverse DNS lookups please.
+            return self.client_address[0]
+
+        def handle(self):
+            self.raw_requestline = self.rfile.readline(65537)
+            if len(self.raw_requestline) > 65536:
+                self.requestline = ''
+                self.request_version = ''
+                self.command = ''
+                self.send_error(414)
+                return
+
+            if not self.parse_request():  # An error code has been sent, just exit
+                return
+
+            handler = SendfileServerHandler(self.rfile, self.wfile, self.get_stderr(),
+                                            self.get_environ(), multithread=False)
+            handler.request_handler = self
+            handler.run(self.server.get_app())
+
+        def log_request(self, *args, **kwargs):
+            if not quiet:
+                return WSGIRequestHandler.log_request(self, *args, **kwargs)
+
+    return QuietHandler
+
+
+def _server_class(host):
+    if ':' in host:  # Fix wsgiref for IPv6 addresses.
+        class ThreadingWSGIServerV6(ThreadingWSGIServer):
+            address_family = socket.AF_INET6
+        return ThreadingWSGIServerV6
+    return ThreadingWSGIServer
+
+
+class ThreadedWSGIRefServer(WSGIRefServer):
+    """ WSGIRef server handling each request in its own thread
+    """
+    def run(self, app):
+        self.options.setdefault("server_class", _server_class(self.host))
+        self.options.setdefault("handler_class", _handler_class(self.quiet))
+        WSGIRefServer.run(self, app)
+
+
+class PreforkWSGIRefServer(ServerAdapter):
+    """ Binds the listening socket once and forks 'workers' processes that accept
+    connections from it. The parent process only supervises the workers, respawning
+    them if they die.
+    """
+    def run(self, app):
+        workers = int(self.options.get("workers") or 1)
+        if not hasattr(os, "fork"):
+            raise ConanException("The 'prefork' server backend is not available in this "
+                                 "platform, use 'threaded' instead")
+
+        srv = make_server(self.host, self.port, app, _server_class(self.host),
+                          _handler_class(self.quiet))
+        children = set()
+
+        def spawn():
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                try:
+                    srv.serve_forever()
+                finally:
+                    os._exit(0)
+            children.add(pid)
+
+        def terminate(*args):  # @UnusedVariable
+            raise KeyboardInterrupt()
+
+        for _ in range(workers):
+            spawn()
+        signal.signal(signal.SIGTERM, terminate)
+        try:
+            while True:
+                pid, _ = os.wait()
+                if pid in children:
+                    children.discard(pid)
+                    logger.warn("conan_server worker %s died, restarting it" % pid)
+                    spawn()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+            srv.server_close()
+
+
+SERVER_BACKENDS = {"threaded": ThreadedWSGIRefServer,
+                   "prefork": PreforkWSGIRefServer}
+
+
+def get_server_backend(name):
+    """ Returns the bottle server (adapter class or bottle server name) for a backend name
+    """
+    return SERVER_BACKENDS.get(name, name)
@@ -3,6 +3,7 @@ import os
 from conans.server.service.authorize import BasicAuthorizer, BasicAuthenticator
 from conans.server.conf import get_file_manager
 from conans.server.rest.server import ConanServer
+from conans.server.service.upstream import UpstreamRemote
 from conans.server.crypto.jwt.jwt_credentials_manager import JWTCredentialsManager
 from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
 from conans.server.conf import MIN_CLIENT_COMPATIBLE_VERSION
@@ -57,14 +58,24 @@ class ServerLauncher(object):
         search_manager = DiskSearchManager(SimplePaths(server_config.disk_storage_path),
                                            search_adapter)
 
+        upstream = None
+        if server_config.upstream:
+            user, password = server_config.upstream_credentials or (None, None)
+            upstream = UpstreamRemote(server_config.upstream, file_manager.paths, user, password)
+
         server_capabilities = SERVER_CAPABILITIES
         self.ra = ConanServer(server_config.port, credentials_manager, updown_auth_manager,
                               authorizer, authenticator, file_manager, search_manager,
                               Version(SERVER_VERSION), Version(MIN_CLIENT_COMPATIBLE_VERSION),
-                              server_capabilities)
+                              server_capabilities, upstream)
+        self.server_backend = server_config.server_backend
+        self.server_workers = server_config.server_workers
 
     def launch(self):
-        self.ra.run(host="0.0.0.0")
+        options = {}
+        if self.server_backend in ("prefork", "gunicorn"):
+            options["workers"] = self.server_workers
+        self.ra.run(host="0.0.0.0", server=self.server_backend, **options)
 
 
 launcher = ServerLauncher()
@@ -10,10 +10,14 @@ Replace this module with other that keeps the interface or super class.
 '''
 
 
+import heapq
 from abc import ABCMeta, abstractmethod
+from collections import defaultdict
+
 from conans.errors import ForbiddenException, InternalErrorException,\
     AuthenticationException
 from conans.model.ref import ConanFileReference
+from conans.util.lru_cache import LRUCache
 
 #  ############################################
 #  ############ ABSTRACT CLASSES ##############
@@ -101,7 +105,7 @@ class BasicAuthorizer(Authorizer):
     Reads permissions from the config file (server.cfg)
     """
 
-    def __init__(self, read_permissions, write_permissions):
+    def __init__(self, read_permissions, write_permissions, decisions_cache_size=10000):
         """List of tuples with conanrefernce and users:
 
         [(conan_reference, "user, user, user"),
@@ -109,6 +113,10 @@ class BasicAuthorizer(Authorizer):
 
         self.read_permissions = read_permissions
         self.write_permissions = write_permissions
+        # Rules are parsed once, the (user, reference) decisions are cached
+        self._read_rules = _RulesMatcher(read_permissions)
+        self._write_rules = _RulesMatcher(write_permissions)
+        self._decisions = LRUCache(decisions_cache_size)
 
     def check_read_conan(self, username, conan_reference):
         """
@@ -118,7 +126,7 @@ class BasicAuthorizer(Authorizer):
         if conan_reference.user == username:
             return
 
-        self._check_any_rule_ok(username, self.read_permissions, conan_reference)
+        self._check_any_rule_ok(username, self._read_rules, conan_reference)
 
     def check_write_conan(self, username, conan_reference):
         """
@@ -128,7 +136,7 @@ class BasicAuthorizer(Authorizer):
         if conan_reference.user == username:
             return True
 
-        self._check_any_rule_ok(username, self.write_permissions, conan_reference)
+        self._check_any_rule_ok(username, self._write_rules, conan_reference)
 
     def check_delete_conan(self, username, conan_reference):
         """
@@ -158,51 +166,77 @@ class BasicAuthorizer(Authorizer):
         """
         self.check_write_package(username, package_reference)
 
-    def _check_any_rule_ok(self, username, rules, *args, **kwargs):
-        for rule in rules:
-            # raises if don't
-            ret = self._check_rule_ok(username, rule, *args, **kwargs)
-            if ret:  # A rule is applied ok, if not apply keep looking
-                return True
-        if username:
-            raise ForbiddenException("Permission denied")
-        else:
-            raise AuthenticationException()
+    def _check_any_rule_ok(self, username, rules, conan_reference):
+        key = (rules is self._write_rules, username, conan_reference)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = rules.decide(username, conan_reference)
+            self._decisions.put(key, decision)
+        if decision is not True:
+            exception_class, message = decision
+            raise exception_class(message)
+        return True
+
+
+class _Rule(object):
+    """A [read_permissions] or [write_permissions] line, already parsed"""
 
-    def _check_rule_ok(self, username, rule, conan_reference):
-        """Checks if a rule specified in config file applies to current conans
-        reference and current user"""
+    def __init__(self, rule):
         try:
-            rule_ref = ConanFileReference.loads(rule[0])
+            self.reference = ConanFileReference.loads(rule[0])
+            self.users = [_.strip() for _ in rule[1].split(",")]
         except Exception:
             # TODO: Log error
-            raise InternalErrorException("Invalid server configuration. "
-                                         "Contact the administrator.")
-        authorized_users = [_.strip() for _ in rule[1].split(",")]
-        if len(authorized_users) < 1:
-            raise InternalErrorException("Invalid server configuration. "
-                                         "Contact the administrator.")
+            self.reference = None  # Invalid rules raise when they are evaluated
+
+    @property
+    def key(self):
+        """Index key of the rule, name and user, can be wildcards"""
+        if self.reference is None:
+            return "*", "*"
+        return self.reference.name, self.reference.user
 
-        # Check if rule apply conan_reference
-        if self._check_ref_apply_for_rule(rule_ref, conan_reference):
-            if authorized_users[0] == "*" or username in authorized_users:
-                return True  # Ok, applies and match username
-            else:
-                if username:
-                    if authorized_users[0] == "?":
-                        return True #Ok, applies and match any authenticated username
-                    else:
-                        raise ForbiddenException("Permission denied")
-                else:
-                    raise AuthenticationException()
-
-        return False
-
-    def _check_ref_apply_for_rule(self, rule_ref, conan_reference):
+    def applies(self, conan_reference):
         """Checks if a conans reference specified in config file applies to current conans
-        reference"""
-        name, version, user, channel = rule_ref
-        return not((name != "*" and name != conan_reference.name) or
-                   (version != "*" and version != conan_reference.version) or
-                   (user != "*" and user != conan_reference.user) or
-                   (channel != "*" and channel != conan_reference.channel))
+        reference. The name and user are already matched by the index"""
+        if self.reference is None:
+            raise InternalErrorException("Invalid server configuration. "
+                                         "Contact the administrator.")
+        version, channel = self.reference.version, self.reference.channel
+        return ((version == "*" or version == conan_reference.version) and
+                (channel == "*" or channel == conan_reference.channel))
+
+    def decide(self, username):
+        """Returns True if the user is authorized or the (exception, message) to raise"""
+        if self.users[0] == "*" or username in self.users:
+            return True  # Ok, applies and match username
+        if username:
+            if self.users[0] == "?":
+                return True  # Ok, applies and match any authenticated username
+            return ForbiddenException, "Permission denied"
+        return AuthenticationException, ""
+
+
+class _RulesMatcher(object):
+    """Rules indexed by (name, user), wildcards included, keeping their order. The first
+    rule applying to a reference decides"""
+
+    def __init__(self, rules):
+        self._index = defaultdict(list)
+        for position, rule in enumerate(rules):
+            rule = _Rule(rule)
+            self._index[rule.key].append((position, rule))
+
+    def _candidates(self, conan_reference):
+        name, user = conan_reference.name, conan_reference.user
+        keys = set([(name, user), (name, "*"), ("*", user), ("*", "*")])
+        buckets = [self._index[key] for key in keys if key in self._index]
+        return heapq.merge(*buckets)
+
+    def decide(self, username, conan_reference):
+        for _, rule in self._candidates(conan_reference):
+            if rule.applies(conan_reference):
+                return rule.decide(username)
+        if username:
+            return ForbiddenException, "Permission denied"
+        return AuthenticationException, ""
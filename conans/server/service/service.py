@@ -1,9 +1,14 @@
 from conans.errors import RequestErrorException, NotFoundException, ForbiddenException
+from conans.server.store.disk_adapter import save_upload, is_inside
 from conans.server.store.file_manager import FileManager
+import bisect
+import itertools
 import os
+import threading
+import time
 import jwt
 from conans.util.files import mkdir
-from conans.model.ref import PackageReference
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.util.log import logger
 
 
@@ -22,13 +27,16 @@ class FileUploadDownloadService(object):
                 raise NotFoundException("File not found")
             logger.debug("Get file: user=%s path=%s" % (user, filepath))
             file_path = os.path.normpath(os.path.join(self.base_store_folder, encoded_path))
+            if not is_inside(file_path, os.path.realpath(self.base_store_folder)):
+                logger.info("Linked file outside the storage!! %s: %s" % (user, filepath))
+                raise NotFoundException("File not found")
             return file_path
         except (jwt.ExpiredSignature, jwt.DecodeError, AttributeError):
             raise NotFoundException("File not found")
 
-    def put_file(self, file_saver, abs_filepath, token, upload_size):
+    def put_file(self, stream, abs_filepath, token, upload_size):
         """
-        file_saver is an object with the save() method without parameters
+        stream is a file-like object with the read(size) method, it is saved in chunks
         """
         try:
             encoded_path, filesize, user = self.updown_auth_manager.get_resource_info(token)
@@ -42,9 +50,7 @@ class FileUploadDownloadService(object):
                 raise NotFoundException("File not found")
             logger.debug("Put file: %s: %s" % (user, abs_filepath))
             mkdir(os.path.dirname(abs_filepath))
-            if os.path.exists(abs_filepath):
-                os.remove(abs_filepath)
-            file_saver.save(os.path.dirname(abs_filepath))
+            save_upload(stream, abs_filepath, upload_size)
 
         except (jwt.ExpiredSignature, jwt.DecodeError, AttributeError):
             raise NotFoundException("File not found")
@@ -61,12 +67,45 @@ class FileUploadDownloadService(object):
             return False
 
 
+class SearchPagesCache(object):
+    """ The sorted results of the paginated searches, with the position of their next page,
+    so it is served without searching again: {(search, cursor): (time, results, position)}.
+    Only for some seconds, as the results miss the later uploads and removals
+    """
+    def __init__(self, seconds=60, max_size=100):
+        self._seconds = seconds
+        self._max_size = max_size
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def get(self, search, cursor):
+        """ The (results, position) of the page after 'cursor', None if not cached
+        """
+        with self._lock:
+            cached = self._pages.get((search, cursor))
+        if cached is None or time.time() - cached[0] > self._seconds:
+            return None
+        return cached[1], cached[2]
+
+    def put(self, search, cursor, results, position):
+        with self._lock:
+            if len(self._pages) >= self._max_size:
+                now = time.time()
+                self._pages = {key: value for key, value in self._pages.items()
+                               if now - value[0] <= self._seconds}
+                if len(self._pages) >= self._max_size:
+                    self._pages.clear()
+            self._pages[(search, cursor)] = (time.time(), results, position)
+
+
 class SearchService(object):
 
-    def __init__(self, authorizer, search_manager, auth_user):
+    def __init__(self, authorizer, search_manager, auth_user, pages_cache=None):
+        """pages_cache: SearchPagesCache of the next pages of the paginated searches"""
         self._authorizer = authorizer
         self._search_manager = search_manager
         self._auth_user = auth_user
+        self._pages_cache = pages_cache
 
     def search_packages(self, reference, query):
         self._authorizer.check_read_conan(self._auth_user, reference)
@@ -79,26 +118,93 @@ class SearchService(object):
                 pattern = wildcards like opencv/*
         """
         references = self._search_manager.search(pattern, ignorecase)
-        filtered = []
+        return list(self._readable(references))
+
+    def _readable(self, references):
         # Filter out restricted items
-        for conan_ref in references:
-            try:
-                self._authorizer.check_read_conan(self._auth_user, conan_ref)
-                filtered.append(conan_ref)
-            except ForbiddenException:
-                pass
-        return filtered
+        return (conan_ref for conan_ref in references if self._is_readable(conan_ref))
+
+    def _is_readable(self, conan_ref):
+        try:
+            self._authorizer.check_read_conan(self._auth_user, conan_ref)
+            return True
+        except ForbiddenException:
+            return False
+
+    def _cached_page(self, key, after):
+        if after and self._pages_cache is not None:
+            return self._pages_cache.get(key, after)
+        return None
+
+    def search_page(self, pattern=None, ignorecase=True, after=None, limit=None):
+        """ A page of search(): the first 'limit' references after the 'after' one, and the
+        cursor of the next page, None if it is the last one
+        """
+        key = ("search", pattern, ignorecase)
+        cached = self._cached_page(key, after)
+        if cached is not None:
+            references, start = cached
+        else:
+            references = self._search_manager.search(pattern, ignorecase)
+            start = 0
+            if after:
+                start = bisect.bisect_right(references, ConanFileReference.loads(after))
+        indexes = (index for index in range(start, len(references))
+                   if self._is_readable(references[index]))
+        page = list(itertools.islice(indexes, limit + 1))
+        if len(page) > limit:
+            next_page = str(references[page[limit - 1]])
+            if self._pages_cache is not None:
+                self._pages_cache.put(key, next_page, references, page[limit - 1] + 1)
+            return [references[index] for index in page[:limit]], next_page
+        return [references[index] for index in page], None
+
+    def search_packages_page(self, reference, query, after=None, limit=None):
+        """ A page of search_packages(): the first 'limit' packages with an id greater than
+        'after', and the cursor of the next page, None if it is the last one
+        """
+        key = ("packages", str(reference), query)
+        cached = self._cached_page(key, after)
+        if cached is not None:
+            self._authorizer.check_read_conan(self._auth_user, reference)
+            (info, package_ids), start = cached
+        else:
+            info = self.search_packages(reference, query)
+            package_ids = sorted(info)
+            start = bisect.bisect_right(package_ids, after) if after else 0
+        end = start + limit
+        result = {package_id: info[package_id] for package_id in package_ids[start:end]}
+        if len(package_ids) > end:
+            next_page = package_ids[end - 1]
+            if self._pages_cache is not None:
+                self._pages_cache.put(key, next_page, (info, package_ids), end)
+            return result, next_page
+        return result, None
 
 
 class ConanService(object):
     """Handles authorization and expose methods for REST API"""
 
-    def __init__(self, authorizer, file_manager, auth_user):
+    def __init__(self, authorizer, file_manager, auth_user, upstream=None):
+        """upstream: UpstreamRemote to fetch the recipes and packages not in the store"""
         assert(isinstance(file_manager, FileManager))
 
         self._authorizer = authorizer
         self._file_manager = file_manager
         self._auth_user = auth_user
+        self._upstream = upstream
+
+    def _pull_through(self, get_urls, fetch):
+        """The urls of get_urls(), fetching the files from the upstream remote if missing"""
+        try:
+            urls = get_urls()
+        except NotFoundException:
+            if not self._upstream or not fetch():
+                raise
+            return get_urls()
+        if not urls and self._upstream and fetch():
+            urls = get_urls()
+        return urls
 
     def get_conanfile_snapshot(self, reference):
         """Gets a dict with filepaths and the md5:
@@ -115,9 +221,13 @@ class ConanService(object):
             {filename: url}
         """
         self._authorizer.check_read_conan(self._auth_user, reference)
-        urls = self._file_manager.get_download_conanfile_urls(reference,
-                                                              files_subset,
-                                                              self._auth_user)
+
+        def get_urls():
+            return self._file_manager.get_download_conanfile_urls(reference,
+                                                                  files_subset,
+                                                                  self._auth_user)
+        urls = self._pull_through(get_urls,
+                                  lambda: self._upstream.fetch_recipe(reference))
         if not urls:
             raise NotFoundException("conanfile not found")
         return urls
@@ -160,14 +270,34 @@ class ConanService(object):
         snap = self._file_manager.get_package_snapshot(package_reference)
         return snap
 
+    def get_packages_digests(self, reference, package_ids):
+        """Gets a dict with the md5 of the manifests of the existing packages:
+            {package_id: md5}
+        """
+        for package_id in package_ids:
+            self._authorizer.check_read_package(self._auth_user,
+                                                PackageReference(reference, package_id))
+        return self._file_manager.get_packages_digests(reference, package_ids)
+
     def get_package_download_urls(self, package_reference, files_subset=None):
         """Gets a list with filepaths and the urls and md5:
             [filename: {'url': url, 'md5': md5}]
         """
         self._authorizer.check_read_package(self._auth_user, package_reference)
-        urls = self._file_manager.get_download_package_urls(package_reference,
-                                                            files_subset=files_subset)
-        return urls
+
+        def get_urls():
+            return self._file_manager.get_download_package_urls(package_reference,
+                                                                files_subset=files_subset)
+        return self._pull_through(get_urls,
+                                  lambda: self._upstream.fetch_package(package_reference))
+
+    def get_package_file_urls(self, package_reference, files):
+        """Gets a dict with the existing files of the given ones and the download url of each
+        one, to download only the changed files of a package:
+            {filepath: url}
+        """
+        self._authorizer.check_read_package(self._auth_user, package_reference)
+        return self._file_manager.get_download_package_file_urls(package_reference, files)
 
     def get_package_upload_urls(self, package_reference, filesizes):
         """
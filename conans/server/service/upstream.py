@@ -0,0 +1,102 @@
+""" Pull-through caching of an upstream remote, configured with the "upstream" server setting
+(CONAN_SERVER_UPSTREAM env var).
+
+The recipes and packages not found in the server store are downloaded from the upstream
+remote with the client RestApiClient, stored and served as if they had been uploaded. The
+concurrent requests of the same missing reference wait for a single download. The files are
+downloaded to a temporary folder that is renamed when complete, so other threads or worker
+processes never serve incomplete recipes or packages.
+"""
+import os
+import tempfile
+import threading
+
+import requests
+
+from conans.client.rest.rest_client import RestApiClient
+from conans.errors import NotFoundException
+from conans.util.files import rmdir, mkdir
+from conans.util.log import logger
+
+
+class UpstreamRemote(object):
+
+    def __init__(self, url, paths, user=None, password=None, requester=None):
+        """ paths: SimplePaths of the server store
+        """
+        self.url = url
+        self._paths = paths
+        self._user = user
+        self._password = password
+        self._requester = requester or requests.Session()
+        self._locks = {}  # {key: [lock, number of waiting requests]}
+        self._locks_lock = threading.Lock()
+
+    def _rest_client(self):
+        rest_client = RestApiClient(None, self._requester)
+        rest_client.remote_url = self.url
+        if self._user:
+            rest_client.token = rest_client.authenticate(self._user, self._password)
+        return rest_client
+
+    def _locked(self, key, fetch):
+        """ Runs 'fetch' holding the lock of 'key', so it runs once for concurrent requests
+        """
+        with self._locks_lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                return fetch()
+        finally:
+            with self._locks_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+    def _store(self, conan_reference, dest_folder, download):
+        """ Calls download(rest_client, tmp_folder) and moves the downloaded files to
+        'dest_folder'. Returns False if not found upstream
+        """
+        if os.path.exists(dest_folder):  # Fetched by a previous request
+            return True
+        parent = self._paths.conan(conan_reference)
+        mkdir(parent)
+        tmp_folder = tempfile.mkdtemp(dir=parent, prefix=".upstream")
+        try:
+            tmp = os.path.join(tmp_folder, "files")
+            try:
+                download(self._rest_client(), tmp)
+            except NotFoundException:
+                return False
+            if not os.path.exists(tmp):
+                return False
+            mkdir(os.path.dirname(dest_folder))
+            try:
+                os.rename(tmp, dest_folder)
+            except OSError:
+                if not os.path.exists(dest_folder):
+                    raise
+            return True
+        finally:
+            rmdir(tmp_folder)
+
+    def fetch_recipe(self, conan_reference):
+        """ Stores the recipe from the upstream remote. Returns False if it is not there
+        """
+        def fetch():
+            logger.info("Fetching %s from upstream %s" % (str(conan_reference), self.url))
+            return self._store(conan_reference, self._paths.export(conan_reference),
+                               lambda client, folder: client.get_recipe(conan_reference, folder,
+                                                                        lambda urls: urls))
+        return self._locked(str(conan_reference), fetch)
+
+    def fetch_package(self, package_reference):
+        """ Stores the package from the upstream remote. Returns False if it is not there
+        """
+        def fetch():
+            logger.info("Fetching %s from upstream %s" % (str(package_reference), self.url))
+            return self._store(package_reference.conan, self._paths.package(package_reference),
+                               lambda client, folder: client.get_package(package_reference,
+                                                                         folder))
+        return self._locked(str(package_reference), fetch)
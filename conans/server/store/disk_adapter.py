@@ -1,10 +1,113 @@
 '''Adapter for access to S3 filesystem.'''
+import hashlib
 import os
+import tempfile
+import uuid
 from abc import ABCMeta, abstractmethod
-from conans.errors import NotFoundException
-from conans.util.files import relative_dirs, rmdir, md5sum, decode_text
-from conans.util.files import path_exists
+from errno import ENOENT
+from conans.errors import NotFoundException, RequestErrorException
+from conans.util.files import relative_dirs, rmdir, md5sum, decode_text, load, save,\
+    replace_file
+from conans.util.files import path_exists, mkdir
+from conans.util.extract import extract_tar
 from conans.paths import SimplePaths
+from conans.util.log import logger
+
+
+# Uploads are written to a temporary file next to the destination and then renamed, so
+# concurrent requests (threads or worker processes) never see incomplete files
+_UPLOAD_TMP_EXTENSION = ".conan_tmp_upload"
+# md5 of the stored files, computed while uploading, so snapshots don't need to rehash them
+_CHECKSUM_EXTENSION = ".conan_md5"
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def temp_upload_path(path):
+    return "%s.%s%s" % (path, uuid.uuid4().hex, _UPLOAD_TMP_EXTENSION)
+
+
+def _is_internal_file(path):
+    return path.endswith(_UPLOAD_TMP_EXTENSION) or path.endswith(_CHECKSUM_EXTENSION)
+
+
+def _stat_key(filepath):
+    stat = os.stat(filepath)
+    return "%d %r" % (stat.st_size, stat.st_mtime)
+
+
+def _save_checksum(filepath, the_md5, stat_key):
+    """Stores the md5 of filepath with its size and mtime, to detect modifications"""
+    checksum_path = filepath + _CHECKSUM_EXTENSION
+    tmp_path = temp_upload_path(checksum_path)
+    try:
+        save(tmp_path, "%s %s" % (the_md5, stat_key))
+        replace_file(tmp_path, checksum_path)
+    except (IOError, OSError) as e:  # Only a cache, as in a read-only store
+        logger.debug("Cannot store the checksum of %s: %s" % (filepath, str(e)))
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def is_inside(path, real_folder):
+    """True if the path, resolving its links, is inside the already resolved real_folder"""
+    return os.path.realpath(path).startswith(os.path.join(real_folder, ""))
+
+
+def _saved_md5(filepath, stat_key):
+    try:
+        the_md5, saved_stat_key = load(filepath + _CHECKSUM_EXTENSION).split(" ", 1)
+        if saved_stat_key == stat_key:
+            return the_md5
+    except (IOError, OSError, ValueError):
+        pass
+    return None
+
+
+def saved_md5(filepath):
+    """md5 of a stored file from the checksum saved when it was uploaded, None if there is
+    no checksum or the file is modified since then"""
+    return _saved_md5(filepath, _stat_key(filepath))
+
+
+def file_md5(filepath, save_checksum=True):
+    """md5 of a stored file, from the checksum saved when it was uploaded if the file
+    is not modified since then. Otherwise it is computed, and saved if save_checksum"""
+    stat_key = _stat_key(filepath)
+    the_md5 = _saved_md5(filepath, stat_key)
+    if the_md5 is not None:
+        return the_md5
+    the_md5 = md5sum(filepath)
+    if save_checksum:
+        _save_checksum(filepath, the_md5, stat_key)
+    return the_md5
+
+
+def save_upload(stream, filepath, size):
+    """Reads 'size' bytes from the stream with a fixed size buffer, writing them to a
+    temporary file in the destination folder that is renamed to filepath when complete.
+    The md5 is computed on the fly and stored for the snapshots"""
+    tmp_path = temp_upload_path(filepath)
+    md5alg = hashlib.md5()
+    remaining = size
+    try:
+        with open(tmp_path, "wb") as handle:
+            while remaining > 0:
+                chunk = stream.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise RequestErrorException("Incomplete upload, missing %d bytes"
+                                                % remaining)
+                md5alg.update(chunk)
+                handle.write(chunk)
+                remaining -= len(chunk)
+        replace_file(tmp_path, filepath)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    the_md5 = md5alg.hexdigest()
+    _save_checksum(filepath, the_md5, _stat_key(filepath))
+    return the_md5
 
 
 class ServerStorageAdapter(object):
@@ -22,6 +125,10 @@ class ServerStorageAdapter(object):
     def get_snapshot(self, absolute_path="", files_subset=None):
         raise NotImplementedError()
 
+    @abstractmethod
+    def extract_tgz(self, tgz_path, dest_folder):
+        raise NotImplementedError()
+
     @abstractmethod
     def delete_folder(self, path):
         raise NotImplementedError()
@@ -82,11 +189,50 @@ class ServerDiskAdapter(ServerStorageAdapter):
         """returns a dict with the filepaths and md5"""
         if not path_exists(absolute_path, self._store_folder):
             raise NotFoundException("")
-        paths = relative_dirs(absolute_path)
+        paths = [path for path in relative_dirs(absolute_path) if not _is_internal_file(path)]
         if files_subset is not None:
             paths = set(paths).intersection(set(files_subset))
-        abs_paths = [os.path.join(absolute_path, relpath) for relpath in paths]
-        return {filepath: md5sum(filepath) for filepath in abs_paths}
+        real_folder = os.path.realpath(absolute_path)
+        ret = {}
+        for relpath in paths:
+            filepath = os.path.join(absolute_path, relpath)
+            if not is_inside(filepath, real_folder):  # Never sign urls of linked files
+                continue
+            try:
+                ret[filepath] = file_md5(filepath)
+            except (IOError, OSError) as e:
+                if e.errno != ENOENT:
+                    raise
+                # Removed by a concurrent request meanwhile
+        return ret
+
+    def extract_tgz(self, tgz_path, dest_folder):
+        """Extracts the tgz_path contents once, to a dest_folder subfolder named by its md5,
+        removing the previous ones. Returns that subfolder"""
+        if not path_exists(tgz_path, self._store_folder):
+            raise NotFoundException("")
+        the_md5 = file_md5(tgz_path)
+        folder = os.path.join(dest_folder, the_md5)
+        if os.path.isdir(folder):
+            return folder
+        mkdir(dest_folder)
+        # Extracted in a temporary folder and renamed, never served incomplete
+        tmp_folder = tempfile.mkdtemp(dir=dest_folder, prefix=".extract")
+        try:
+            tmp = os.path.join(tmp_folder, the_md5)
+            # Without links, that would serve any file of the server to the uploaders
+            extract_tar(tgz_path, tmp, links=False)
+            try:
+                os.rename(tmp, folder)
+            except OSError:
+                if not os.path.isdir(folder):
+                    raise
+        finally:
+            rmdir(tmp_folder)
+        for name in os.listdir(dest_folder):
+            if name != the_md5 and not name.startswith("."):
+                rmdir(os.path.join(dest_folder, name))
+        return folder
 
     def delete_folder(self, path):
         '''Delete folder from disk. Path already contains base dir'''
@@ -99,6 +245,10 @@ class ServerDiskAdapter(ServerStorageAdapter):
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
         os.remove(path)
+        try:
+            os.remove(path + _CHECKSUM_EXTENSION)
+        except OSError:
+            pass
 
     def delete_empty_dirs(self, deleted_refs):
         paths = SimplePaths(self._store_folder)
@@ -1,8 +1,12 @@
 import os
-from conans.paths import SimplePaths
+from conans.errors import NotFoundException
+from conans.paths import SimplePaths, CONAN_MANIFEST, CONANINFO, PACKAGE_TGZ_NAME
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.store.disk_adapter import ServerStorageAdapter
 
+# Extracted package tgz files, to serve them one by one, in <conan>/package_files/<package_id>
+PACKAGE_FILES_FOLDER = "package_files"
+
 
 class FileManager(object):
     '''Coordinate the paths and the storage_adapter to get
@@ -32,6 +36,22 @@ class FileManager(object):
         path = self.paths.package(package_reference)
         return self._get_snapshot_of_files(path)
 
+    def get_packages_digests(self, reference, package_ids):
+        """Returns a {package_id: md5 of its manifest} of the existing packages. The packages
+        missing any file, as after a failed upload, are not complete and have no digest"""
+        assert isinstance(reference, ConanFileReference)
+        ret = {}
+        package_files = [CONAN_MANIFEST, CONANINFO, PACKAGE_TGZ_NAME]
+        for package_id in package_ids:
+            path = self.paths.package(PackageReference(reference, package_id))
+            try:
+                snapshot = self._storage_adapter.get_snapshot(path, package_files)
+            except NotFoundException:
+                continue
+            if len(snapshot) == len(package_files):
+                ret[package_id] = snapshot[os.path.join(path, CONAN_MANIFEST)]
+        return ret
+
     # ############ DOWNLOAD URLS
     def get_download_conanfile_urls(self, reference, files_subset=None, user=None):
         """Returns a {filepath: url} """
@@ -43,6 +63,22 @@ class FileManager(object):
         assert isinstance(package_reference, PackageReference)
         return self._get_download_urls(self.paths.package(package_reference), files_subset, user)
 
+    def get_download_package_file_urls(self, package_reference, files, user=None):
+        """Returns a {filepath: url} of the existing 'files' of the package, the ones in
+        the package tgz served from its extracted contents"""
+        assert isinstance(package_reference, PackageReference)
+        package_folder = self.paths.package(package_reference)
+        files = [os.path.normpath(f) for f in files]
+        metadata = [f for f in files if f in (CONANINFO, CONAN_MANIFEST)]
+        contents = [f for f in files if f not in metadata]
+        urls = self._get_download_urls(package_folder, metadata, user) if metadata else {}
+        if contents:
+            tgz_path = os.path.join(package_folder, PACKAGE_TGZ_NAME)
+            folder = self._storage_adapter.extract_tgz(tgz_path,
+                                                       self._package_files(package_reference))
+            urls.update(self._get_download_urls(folder, contents, user))
+        return urls
+
     # ############ UPLOAD URLS
     def get_upload_conanfile_urls(self, reference, filesizes, user):
         """
@@ -76,11 +112,14 @@ class FileManager(object):
         if not package_ids_filter:  # Remove all packages
             packages_folder = self.paths.packages(reference)
             self._storage_adapter.delete_folder(packages_folder)
+            self._delete_package_files(os.path.join(self.paths.conan(reference),
+                                                    PACKAGE_FILES_FOLDER))
         else:
             for package_id in package_ids_filter:
                 package_ref = PackageReference(reference, package_id)
                 package_folder = self.paths.package(package_ref)
                 self._storage_adapter.delete_folder(package_folder)
+                self._delete_package_files(self._package_files(package_ref))
         self._storage_adapter.delete_empty_dirs([reference])
         return
 
@@ -97,6 +136,16 @@ class FileManager(object):
             self._storage_adapter.delete_file(path)
 
     # ############ INTERNAL METHODS
+    def _package_files(self, package_reference):
+        return os.path.join(self.paths.conan(package_reference.conan), PACKAGE_FILES_FOLDER,
+                            package_reference.package_id)
+
+    def _delete_package_files(self, path):
+        try:
+            self._storage_adapter.delete_folder(path)
+        except NotFoundException:  # Never extracted
+            pass
+
     def _get_snapshot_of_files(self, relative_path):
         snapshot = self._storage_adapter.get_snapshot(relative_path)
         snapshot = self._relativize_keys(snapshot, relative_path)
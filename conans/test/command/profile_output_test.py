@@ -0,0 +1,55 @@
+import os
+import pstats
+import unittest
+
+from conans import tools
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient
+from conans.util.files import load
+
+
+class ProfileOutputTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient()
+        self.client.save({"conanfile.py": str(TestConanFile("Hello", "0.1"))})
+        self.client.run("export lasote/stable")
+
+    def _check_profile(self, profile_file):
+        stats = pstats.Stats(profile_file)
+        self.assertTrue(stats.total_calls > 0)
+        collapsed = load(profile_file + ".collapsed").splitlines()
+        self.assertTrue(collapsed)
+        for line in collapsed:
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack)
+            self.assertGreater(int(count), 0)
+
+        self.assertIn("Command time:", self.client.out)
+        self.assertIn("graph_load", self.client.out)
+        self.assertIn("package_built_from_sources", self.client.out)
+        self.assertIn("Node retrieval/build", self.client.out)
+        self.assertIn("Profile written to %s" % profile_file, self.client.out)
+
+    def profile_output_argument_test(self):
+        profile_file = os.path.join(temp_folder(), "install.prof")
+        self.client.run('install Hello/0.1@lasote/stable --build --profile-output "%s"'
+                        % profile_file)
+        self.assertIn("Hello/0.1@lasote/stable: Package '", self.client.out)
+        self._check_profile(profile_file)
+
+    def profile_output_env_test(self):
+        profile_file = os.path.join(temp_folder(), "install.prof")
+        with tools.environment_append({"CONAN_PROFILE_OUTPUT": profile_file}):
+            self.client.run("install Hello/0.1@lasote/stable --build")
+        self._check_profile(profile_file)
+
+    def no_profile_output_test(self):
+        self.client.run("install Hello/0.1@lasote/stable --build")
+        self.assertNotIn("Command time:", self.client.out)
+
+        error = self.client.run("install Hello/0.1@lasote/stable --profile-output",
+                                ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("argument --profile-output: expected one argument", self.client.out)
@@ -4,6 +4,7 @@ import unittest
 import six
 from mock import Mock
 
+from conans.client.trash import wait_background_purges
 from conans.client.userio import UserIO
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference, ConanFileReference
@@ -12,6 +13,7 @@ from conans.paths import PACKAGES_FOLDER, EXPORT_FOLDER, BUILD_FOLDER, SRC_FOLDE
 from conans.test.utils.tools import TestClient, TestBufferConanOutput, TestServer
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
 from conans.test.utils.test_files import temp_folder
+from conans.util.files import load
 
 
 class RemoveOutdatedTest(unittest.TestCase):
@@ -164,6 +166,29 @@ class RemoveTest(unittest.TestCase):
         folders = os.listdir(self.client.storage_folder)
         six.assertCountEqual(self, ["Other", "Bye"], folders)
 
+    def several_patterns_test(self):
+        registry = self.client.client_cache.registry
+        self.assertIn("Bye/0.14@fenix/testing", load(registry))
+        self.client.run("remove hello/1.4.10* Bye/0.14@fenix/testing -f")
+        self.assert_folders(local_folders={"H1": None, "H2": [1, 2], "B": None, "O": [1, 2]},
+                            remote_folders={"H1": [1, 2], "H2": [1, 2], "B": [1, 2], "O": [1, 2]},
+                            build_folders={"H1": None, "H2": [1, 2], "B": None, "O": [1, 2]},
+                            src_folders={"H1": False, "H2": True, "B": False, "O": True})
+        self.assertNotIn("Bye/0.14@fenix/testing", load(registry))
+        self.assertNotIn("Hello/1.4.10@fenix/testing", load(registry))
+        self.assertIn("Hello/2.4.11@fenix/testing", load(registry))
+
+        # The removed folders are deleted in the background, or by "cache gc"
+        wait_background_purges()
+        trash = self.client.client_cache.trash
+        self.assertEqual(trash.entries(), [])
+        self.assertTrue(trash.put(self.client.client_cache.conan(
+            ConanFileReference.loads("Other/1.2@fenix/testing"))))
+        self.assertEqual(len(trash.entries()), 1)
+        self.client.run("cache gc")
+        self.assertIn("Deleted 1 removed folders from the trash", self.client.out)
+        self.assertEqual(trash.entries(), [])
+
     def basic_mocked_test(self):
         mocked_user_io = UserIO(out=TestBufferConanOutput())
         mocked_user_io.request_boolean = Mock(return_value=True)
@@ -1,11 +1,20 @@
+import gzip
+import io
+import json
 import unittest
+
+from mock import patch
+from webob import Request
+
+from conans.client.rest import rest_client
+from conans.client.rest.auth_manager import ConanApiAuthManager
 from conans.test.utils.tools import TestClient, TestServer
 from conans.paths import PACKAGES_FOLDER, CONANINFO, EXPORT_FOLDER, CONAN_MANIFEST
 import os
 from conans.model.manifest import FileTreeManifest
 import shutil
 from conans import COMPLEX_SEARCH_CAPABILITY
-from conans.util.files import load
+from conans.util.files import load, decode_text
 
 
 conan_vars1 = '''
@@ -320,6 +329,57 @@ class SearchTest(unittest.TestCase):
         # test in remote with search capabilities
         test_cases(remote="search_able")
 
+    def paginated_search_test(self):
+        server = TestServer()
+        os.rmdir(server.paths.store)
+        shutil.copytree(self.client.paths.store, server.paths.store)
+        client = TestClient(servers={"paged": server})
+        with patch.object(rest_client, "SEARCH_PAGE_SIZE", 2):
+            client.run("search *fenix* --case-sensitive -r paged")
+            self.assertEquals("Existing package recipes:\n\n"
+                              "Bye/0.14@fenix/testing\n"
+                              "Hello/1.4.10@fenix/testing\n"
+                              "Hello/1.4.11@fenix/testing\n"
+                              "Hello/1.4.12@fenix/testing\n"
+                              "MissFile/1.0.2@fenix/stable\n"
+                              "NodeInfo/1.0.2@fenix/stable\n"
+                              "helloTest/1.4.10@fenix/stable\n", client.user_io.out)
+            # Every page through the auth manager, to log in again if needed
+            with patch.object(ConanApiAuthManager, "search_page", autospec=True,
+                              side_effect=ConanApiAuthManager.search_page) as search_page:
+                client.run("search *fenix* --case-sensitive -r paged")
+            self.assertEquals(search_page.call_count, 4)
+
+            client.run('search Hello/1.4.10@fenix/testing -r paged -q "compiler=gcc"')
+            self.assertIn("LinuxPackageSHA", client.user_io.out)
+            self.assertIn("PlatformIndependantSHA", client.user_io.out)
+            self.assertNotIn("WindowsPackageSHA", client.user_io.out)
+
+        # Pages with cursors
+        response = server.app.get("/v1/conans/search?q=*fenix*&limit=3&ignorecase=False")
+        self.assertEqual(response.json, {"results": ["Bye/0.14@fenix/testing",
+                                                     "Hello/1.4.10@fenix/testing",
+                                                     "Hello/1.4.11@fenix/testing"],
+                                         "next": "Hello/1.4.11@fenix/testing"})
+        response = server.app.get("/v1/conans/search?q=*fenix*&limit=3&ignorecase=False"
+                                  "&after=NodeInfo/1.0.2@fenix/stable")
+        self.assertEqual(response.json, {"results": ["helloTest/1.4.10@fenix/stable"]})
+        response = server.app.get("/v1/conans/Hello/1.4.10/fenix/testing/search?limit=2")
+        self.assertEqual(sorted(response.json["results"]), ["LinuxPackageSHA",
+                                                           "PlatformIndependantSHA"])
+        self.assertEqual(response.json["next"], "PlatformIndependantSHA")
+
+        # Compressed if accepted, TestApp would decompress it
+        def get_raw(url):
+            request = Request.blank(url, headers={"Accept-Encoding": "gzip"})
+            return request.get_response(server.app.app)
+        response = get_raw("/v1/conans/search?q=Bye*")
+        self.assertEqual(response.headers.get("Content-Encoding"), None)  # Too small
+        response = get_raw("/v1/conans/Hello/1.4.10/fenix/testing/search")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        content = json.loads(decode_text(gzip.GzipFile(fileobj=io.BytesIO(response.body)).read()))
+        self.assertEqual(len(content), 3)
+
     def package_search_with_invalid_query_test(self):
         self.client.run("search Hello/1.4.10/fenix/testing -q 'invalid'", ignore_error=True)
         self.assertIn("Invalid package query: invalid", self.client.user_io.out)
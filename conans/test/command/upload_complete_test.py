@@ -142,7 +142,7 @@ class UploadTest(unittest.TestCase):
         """Cause an error in the transfer and see some message"""
 
         # This will fail in the first put file, so, as we need to
-        # upload 3 files (conanmanifest, conanfile and tgz) will do it with 2 retries
+        # upload 3 files (conanfile, tgz and conanmanifest) will do it with 2 retries
         client = self._get_client(BadConnectionUploader)
         files = cpp_hello_conan_files("Hello0", "1.2.1", build=False)
         client.save(files)
@@ -158,8 +158,9 @@ class UploadTest(unittest.TestCase):
         client.run("export frodo/stable")
         client.run("upload Hello* --confirm --retry 1 --retry_wait=1", ignore_error=True)
         self.assertNotIn("Waiting 1 seconds to retry...", client.user_io.out)
+        # The manifest is never uploaded after a failure
         self.assertIn("ERROR: Execute upload again to retry upload the failed files: "
-                      "conanmanifest.txt. [Remote: default]", client.user_io.out)
+                      "conanfile.py, conanmanifest.txt. [Remote: default]", client.user_io.out)
 
         # Try with broken connection even with 10 retries
         client = self._get_client(TerribleConnectionUploader)
@@ -306,13 +307,13 @@ class TestConan(ConanFile):
         lines = [line.strip() for line in str(self.client.user_io.out).splitlines()
                  if line.startswith("Uploading")]
         self.assertEqual(lines, ["Uploading Hello/1.2.1@frodo/stable",
-                                 "Uploading conanmanifest.txt",
                                  "Uploading conanfile.py",
                                  "Uploading conan_export.tgz",
-                                 "Uploading package 1/1: myfakeid",
                                  "Uploading conanmanifest.txt",
+                                 "Uploading package 1/1: myfakeid",
                                  "Uploading conaninfo.txt",
                                  "Uploading conan_package.tgz",
+                                 "Uploading conanmanifest.txt",
                                  ])
         self.assertTrue(os.path.exists(self.server_reg_folder))
         self.assertTrue(os.path.exists(self.server_pack_folder))
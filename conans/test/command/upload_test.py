@@ -1,9 +1,14 @@
 import unittest
+from collections import OrderedDict
 from conans.test.utils.tools import TestClient, TestServer
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
-from conans.model.ref import ConanFileReference
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.util.files import save
 import os
+from mock import patch
+from conans.client.rest.rest_client import RestApiClient
+from conans.client.rest.uploader_downloader import Uploader
+from conans.paths import CONAN_MANIFEST, PACKAGE_TGZ_NAME
 
 
 conanfile = """from conans import ConanFile
@@ -186,6 +191,137 @@ class UploadTest(unittest.TestCase):
         self.assertNotIn("Uploading conan_package.tgz", client2.out)
         self.assertIn("Package is up to date, upload skipped", client2.out)
 
+    def upload_skips_unchanged_test(self):
+        client = self._client()
+        client.save({"conanfile.py": conanfile.replace("exports_sources",
+                                                       "options = {'opt': [1, 2]}\n"
+                                                       "    default_options = 'opt=1'\n"
+                                                       "    exports_sources"),
+                     "hello.cpp": ""})
+        client.run("create frodo/stable")
+        client.run("create frodo/stable -o Hello0:opt=2")
+        client.run("upload Hello0/1.2.1@frodo/stable --all")
+        self.assertIn("Upload summary: 3 uploaded", client.out)
+
+        client.run("upload Hello0/1.2.1@frodo/stable --all")
+        self.assertIn("Recipe is up to date, upload skipped", client.out)
+        self.assertEqual(str(client.out).count("Package is up to date, upload skipped"), 2)
+        self.assertNotIn("Compressing", client.out)
+        self.assertIn("Upload summary: 0 uploaded (0B), 3 already in the remote, skipped",
+                      client.out)
+
+        # Only the rebuilt package is compressed and uploaded
+        client.save({"hello.cpp": "modified"})
+        client.run("create frodo/stable -o Hello0:opt=2")
+        client.run("upload Hello0/1.2.1@frodo/stable --all")
+        self.assertEqual(str(client.out).count("Compressing package..."), 1)
+        self.assertIn("Upload summary: 2 uploaded", client.out)
+
+        # Servers without digests are asked once, not for every package
+        with patch.object(RestApiClient, "get_packages_digests",
+                          return_value=None) as get_packages_digests:
+            client.run("upload Hello0/1.2.1@frodo/stable --all")
+        self.assertEqual(get_packages_digests.call_count, 1)
+        self.assertIn("Upload summary: 0 uploaded (0B), 3 already in the remote", client.out)
+
+    def upload_failed_files_not_skipped_test(self):
+        client = self._client()
+        client.save({"conanfile.py": conanfile,
+                     "hello.cpp": ""})
+        client.run("create frodo/stable")
+        ref = ConanFileReference.loads("Hello0/1.2.1@frodo/stable")
+        package_id = os.listdir(client.client_cache.packages(ref))[0]
+        server_package = self._servers["default"].paths.package(PackageReference(ref, package_id))
+
+        # The manifests are only uploaded after the rest of the files
+        upload = Uploader.upload
+
+        def failing_upload(uploader, url, abs_path, *args, **kwargs):
+            if abs_path.endswith(".tgz"):
+                raise Exception("Connection lost")
+            return upload(uploader, url, abs_path, *args, **kwargs)
+        with patch.object(Uploader, "upload", failing_upload):
+            error = client.run("upload Hello0/1.2.1@frodo/stable --all", ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("failed files: conan_sources.tgz, conanmanifest.txt",
+                      client.out)
+        self.assertFalse(os.path.exists(os.path.join(self._servers["default"].paths.export(ref),
+                                                     CONAN_MANIFEST)))
+        client.run("upload Hello0/1.2.1@frodo/stable --all")
+        self.assertNotIn("upload skipped", client.out)
+        self.assertTrue(os.path.exists(os.path.join(server_package, PACKAGE_TGZ_NAME)))
+
+        # A package missing files in the server has no digest, it is uploaded again
+        os.remove(os.path.join(server_package, PACKAGE_TGZ_NAME))
+        client.run("upload Hello0/1.2.1@frodo/stable --all")
+        self.assertIn("Recipe is up to date, upload skipped", client.out)
+        self.assertNotIn("Package is up to date, upload skipped", client.out)
+        self.assertIn("Uploading conan_package.tgz", client.out)
+        self.assertTrue(os.path.exists(os.path.join(server_package, PACKAGE_TGZ_NAME)))
+
+    def upload_parallel_test(self):
+        client = self._client()
+        client.save({"conanfile.py": conanfile.replace("exports_sources",
+                                                       "options = {'opt': [1, 2, 3]}\n"
+                                                       "    default_options = 'opt=1'\n"
+                                                       "    exports_sources"),
+                     "hello.cpp": ""})
+        for opt in (1, 2, 3):
+            client.run("create frodo/stable -o Hello0:opt=%d" % opt)
+        client.run("upload Hello0/1.2.1@frodo/stable --all --parallel 2")
+        self.assertIn("Uploading 3 packages, 2 in parallel", client.out)
+        for index in (1, 2, 3):
+            self.assertIn("[%d/3] Package " % index, client.out)
+        self.assertEqual(str(client.out).count(": uploaded"), 3)
+        # The per package output is not printed
+        self.assertNotIn("Compressing package", client.out)
+        self.assertIn("Upload summary: 4 uploaded", client.out)
+
+        ref = ConanFileReference.loads("Hello0/1.2.1@frodo/stable")
+        server_packages = self._servers["default"].paths.packages(ref)
+        self.assertEqual(len(os.listdir(server_packages)), 3)
+
+        client.run("upload Hello0/1.2.1@frodo/stable --all --parallel 2")
+        self.assertEqual(str(client.out).count(": up to date"), 3)
+
+    def upload_several_remotes_compress_once_test(self):
+        servers = OrderedDict((name, TestServer([("*/*@*/*", "*")], [("*/*@*/*", "*")],
+                                                users={"lasote": "mypass"}))
+                              for name in ("staging", "prod"))
+        client = TestClient(servers=servers, users={"staging": [("lasote", "mypass")],
+                                                    "prod": [("lasote", "mypass")]})
+        client.save({"conanfile.py": conanfile,
+                     "hello.cpp": ""})
+        client.run("create frodo/stable")
+        client.run("upload Hello0/1.2.1@frodo/stable --all -r staging")
+        self.assertIn("Compressing package...", client.out)
+        client.run("upload Hello0/1.2.1@frodo/stable --all -r prod")
+        self.assertNotIn("Compressing package...", client.out)
+        self.assertIn("Uploading conan_package.tgz", client.out)
+
+        ref = ConanFileReference.loads("Hello0/1.2.1@frodo/stable")
+        package_id = client.client_cache.conan_packages(ref)[0]
+        package_ref = PackageReference(ref, package_id)
+        package_folder = client.client_cache.package(package_ref)
+        self.assertNotIn("conan_package.tgz", os.listdir(package_folder))
+        tgz_folder = client.client_cache.package_tgz(package_ref)
+        tgz_files = os.listdir(tgz_folder)
+        self.assertEqual(len(tgz_files), 1)
+
+        # A new package content is compressed again, removing the previous one
+        client.save({"hello.cpp": "modified"})
+        client.run("create frodo/stable")
+        client.run("upload Hello0/1.2.1@frodo/stable --all -r prod --force")
+        self.assertIn("Compressing package...", client.out)
+        self.assertNotEqual(os.listdir(tgz_folder), tgz_files)
+        self.assertEqual(len(os.listdir(tgz_folder)), 1)
+
+        client.run("remove Hello0/1.2.1@frodo/stable -p %s -f" % package_id)
+        self.assertFalse(os.path.exists(tgz_folder))
+        # No empty folders are left for the reference
+        name_folder = os.path.join(client.client_cache.packages_tgz(ref), "..", "..", "..")
+        self.assertFalse(os.path.exists(os.path.normpath(name_folder)))
+
     def skip_upload_test(self):
         """ Check that the option --dry does not upload anything
         """
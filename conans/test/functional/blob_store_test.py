@@ -0,0 +1,157 @@
+import os
+import stat
+import unittest
+
+from conans import tools
+from conans.client.blob_store import BlobStore
+from conans.model.manifest import FileTreeManifest
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import CONAN_MANIFEST
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import save, load
+
+
+def _save_folder(folder, files):
+    for name, contents in files.items():
+        save(os.path.join(folder, name), contents)
+    save(os.path.join(folder, CONAN_MANIFEST), str(FileTreeManifest.create(folder)))
+
+
+class BlobStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = BlobStore(os.path.join(temp_folder(), "blobs"))
+
+    def store_and_gc_test(self):
+        folder1, folder2 = temp_folder(), temp_folder()
+        _save_folder(folder1, {"include/header.h": "header", "lib/lib1.a": "lib1"})
+        _save_folder(folder2, {"include/header.h": "header", "lib/lib2.a": "lib2"})
+        self.assertEqual(self.store.store_folder(folder1), 0)
+        self.assertEqual(self.store.store_folder(folder2), 1)
+        self.assertEqual(self.store.store_folder(folder2), 0)  # Already linked
+
+        header1 = os.path.join(folder1, "include/header.h")
+        header2 = os.path.join(folder2, "include/header.h")
+        self.assertEqual(os.stat(header1).st_ino, os.stat(header2).st_ino)
+        self.assertEqual(load(header2), "header")
+        self.assertEqual(self.store.stats(), (3, len("header") + 8, len("header")))
+
+        digests = self.store.folder_digests(folder1)
+        tools.rmdir(folder1)
+        self.assertEqual(self.store.release(digests), 1)  # lib1.a, header.h is still used
+        self.assertEqual(self.store.stats(), (2, len("header") + 4, 0))
+
+        tools.rmdir(folder2)
+        self.assertEqual(self.store.gc(), (2, len("header") + 4))
+        self.assertEqual(self.store.stats(), (0, 0, 0))
+
+    def wrong_manifest_test(self):
+        folder = temp_folder()
+        _save_folder(folder, {"header.h": "header"})
+        save(os.path.join(folder, "header.h"), "modified")
+        self.store.store_folder(folder)
+        self.assertEqual(self.store.stats().blobs, 0)
+        self.assertEqual(load(os.path.join(folder, "header.h")), "modified")
+
+        # Stored blob with the same size, but different contents
+        folder1, folder2 = temp_folder(), temp_folder()
+        _save_folder(folder1, {"header.h": "header"})
+        _save_folder(folder2, {"header.h": "header"})
+        save(os.path.join(folder2, "header.h"), "HEADER")
+        self.store.store_folder(folder1)
+        self.assertEqual(self.store.store_folder(folder2), 0)
+        self.assertEqual(load(os.path.join(folder2, "header.h")), "HEADER")
+
+
+class CacheBlobsTest(unittest.TestCase):
+    conanfile = """from conans import ConanFile
+class Pkg(ConanFile):
+    options = {"shared": [True, False]}
+    default_options = "shared=False"
+    exports_sources = "*.h"
+    def package(self):
+        self.copy("*.h", dst="include")
+"""
+
+    def setUp(self):
+        self.server = TestServer()
+        self.client = TestClient(servers={"default": self.server},
+                                 users={"default": [("lasote", "mypass")]})
+        self.client.save({"conanfile.py": self.conanfile,
+                          "header.h": "my header"})
+        self.ref = ConanFileReference.loads("Pkg/0.1@lasote/testing")
+
+    def _headers(self):
+        packages = self.client.client_cache.packages(self.ref)
+        return [os.path.join(packages, package_id, "include", "header.h")
+                for package_id in sorted(os.listdir(packages))]
+
+    def packages_test(self):
+        with tools.environment_append({"CONAN_CACHE_BLOBS": "1"}):
+            self.client.run("create Pkg/0.1@lasote/testing")
+            self.client.run("create Pkg/0.1@lasote/testing -o Pkg:shared=True")
+            header1, header2 = self._headers()
+            self.assertEqual(os.stat(header1).st_ino, os.stat(header2).st_ino)
+            export_header = os.path.join(self.client.client_cache.export_sources(self.ref),
+                                         "header.h")
+            self.assertEqual(os.stat(export_header).st_ino, os.stat(header1).st_ino)
+
+            self.client.run("cache gc")
+            self.assertIn("Removed 0 unused blobs", self.client.out)
+            self.assertIn("blobs, ", self.client.out)
+
+            package_id = os.path.basename(os.path.dirname(os.path.dirname(header1)))
+            self.client.run("remove Pkg/0.1@lasote/testing -p %s -f" % package_id)
+            self.assertEqual(load(header2), "my header")
+            self.client.run("remove Pkg/0.1@lasote/testing -f")
+            self.client.run("cache gc")
+            self.assertIn("Removed 0 unused blobs", self.client.out)
+            self.assertIn("Blob store: 0 blobs", self.client.out)
+
+    def download_test(self):
+        self.client.run("create Pkg/0.1@lasote/testing")
+        self.client.run("upload Pkg* --all --confirm")
+        self.client.run("remove Pkg* -f")
+        with tools.environment_append({"CONAN_CACHE_BLOBS": "1"}):
+            self.client.run("install Pkg/0.1@lasote/testing")
+            header, = self._headers()
+            package_ref = PackageReference(self.ref, os.path.basename(
+                os.path.dirname(os.path.dirname(header))))
+            # Keeping a link to the blob, a new install links it instead of extracting it
+            backup = os.path.join(temp_folder(), "header.h")
+            os.link(header, backup)
+            self.client.run("remove Pkg* -p -f")
+            self.client.run("install Pkg/0.1@lasote/testing")
+            header = os.path.join(self.client.client_cache.package(package_ref),
+                                  "include", "header.h")
+            self.assertEqual(os.stat(header).st_ino, os.stat(backup).st_ino)
+            self.assertEqual(load(header), "my header")
+
+    def modify_sources_test(self):
+        conanfile = """from conans import ConanFile, tools
+class Pkg(ConanFile):
+    exports_sources = "*.h"
+    def source(self):
+        tools.save("header.h", tools.load("header.h") + " source")
+    def build(self):
+        tools.save("header.h", tools.load("header.h") + " build")
+    def package(self):
+        self.copy("*.h", dst="include")
+"""
+        self.client.save({"conanfile.py": conanfile})
+        with tools.environment_append({"CONAN_CACHE_BLOBS": "1"}):
+            self.client.run("create Pkg/0.1@lasote/testing")
+            header, = self._headers()
+            self.assertEqual(load(header), "my header source build")
+            export_header = os.path.join(self.client.client_cache.export_sources(self.ref),
+                                         "header.h")
+            self.assertEqual(load(export_header), "my header")
+            # Checking the mode, as root can write any file
+            self.assertFalse(os.stat(export_header).st_mode & stat.S_IWUSR)
+            package_id = os.path.basename(os.path.dirname(os.path.dirname(header)))
+            build_header = os.path.join(self.client.client_cache.build(
+                PackageReference(self.ref, package_id)), "header.h")
+            source_header = os.path.join(self.client.client_cache.source(self.ref), "header.h")
+            for path in (build_header, source_header):
+                self.assertTrue(os.stat(path).st_mode & stat.S_IWUSR)
@@ -5,7 +5,7 @@ import os
 from conans.model.ref import ConanFileReference
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
 from conans.test.utils.tools import TestServer, TestClient
-from conans.util.files import load
+from conans.util.files import load, md5sum, sha1sum
 import json
 from conans.paths import CONANFILE, RUN_LOG_NAME
 from conans.client.runner import ConanRunner
@@ -92,11 +92,23 @@ class HelloConan(ConanFile):
         self.assertIn('"Authorization": "**********"', traces)
         self.assertIn('"X-Client-Anonymous-Id": "**********"', traces)
         actions = traces.splitlines()
-        self.assertEquals(len(actions), 19)
         for trace in actions:
             doc = json.loads(trace)
             self.assertIn("_action", doc)  # Valid jsons
 
+        spans = [json.loads(a) for a in actions if json.loads(a)["_action"] == "SPAN"]
+        span_names = set(span["name"] for span in spans)
+        for name in ("graph_load", "graph_propagate_info", "package_available",
+                     "propagate_info", "build", "package", "generators"):
+            self.assertIn(name, span_names)
+        for span in spans:
+            self.assertGreaterEqual(span["duration"], 0)
+        build_span = [span for span in spans if span["name"] == "build"][0]
+        self.assertTrue(build_span["_id"].startswith("Hello0/0.1@lasote/stable:"))
+
+        actions = [a for a in actions if json.loads(a)["_action"] != "SPAN"]
+        self.assertEquals(len(actions), 19)
+
         self.assertEquals(json.loads(actions[0])["_action"], "COMMAND")
         self.assertEquals(json.loads(actions[0])["name"], "user")
 
@@ -110,3 +122,7 @@ class HelloConan(ConanFile):
         self.assertEquals(json.loads(actions[4])["_id"], "Hello0/0.1@lasote/stable")
 
         self.assertEquals(json.loads(actions[-1])["_action"], "UPLOADED_PACKAGE")
+        # The checksums computed while uploading are the ones of the files
+        for doc in json.loads(actions[-1])["files"]:
+            self.assertEqual(doc["md5"], md5sum(doc["path"]))
+            self.assertEqual(doc["sha1"], sha1sum(doc["path"]))
@@ -0,0 +1,127 @@
+import os
+import tarfile
+import unittest
+
+from conans import tools
+from conans.client.download_cache import DownloadCache
+from conans.client.tools import net
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, load, md5
+
+
+class _Response(object):
+    ok = True
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+        self.headers = {"content-length": str(len(content))}
+
+    def iter_content(self, chunk_size):
+        yield self.content
+
+
+class _Requester(object):
+    def __init__(self, content):
+        self.content = content
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return _Response(self.content)
+
+
+class DownloadCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = os.path.join(temp_folder(), "download_cache")
+        self.downloads = []
+
+    def _download(self, contents):
+        def download(path):
+            self.downloads.append(path)
+            save(path, contents)
+        return download
+
+    def _get(self, cache, url, contents, checksums=None):
+        filename = os.path.join(temp_folder(), "file.tgz")
+        cached = cache.get(url, filename, checksums or {}, self._download(contents))
+        self.assertEqual(load(filename), contents)
+        return cached
+
+    def cache_test(self):
+        cache = DownloadCache(self.folder)
+        self.assertFalse(self._get(cache, "http://myurl/file.tgz", "contents"))
+        self.assertTrue(self._get(cache, "http://myurl/file.tgz", "contents"))
+        self.assertEqual(len(self.downloads), 1)
+
+        # The checksums are part of the key
+        checksums = {"md5": md5("contents"), "sha1": "", "sha256": ""}
+        self.assertFalse(self._get(cache, "http://myurl/file.tgz", "contents", checksums))
+        self.assertTrue(self._get(cache, "http://myurl/file.tgz", "contents", checksums))
+        self.assertEqual(len(self.downloads), 2)
+
+        # A wrong checksum is never cached
+        checksums = {"md5": md5("other")}
+        self.assertFalse(self._get(cache, "http://myurl/file.tgz", "contents", checksums))
+        self.assertFalse(self._get(cache, "http://myurl/file.tgz", "contents", checksums))
+        self.assertEqual(len(self.downloads), 4)
+
+    def corrupted_test(self):
+        cache = DownloadCache(self.folder)
+        self._get(cache, "http://myurl/file.tgz", "contents")
+        entry, = [os.path.join(self.folder, name) for name in os.listdir(self.folder)
+                  if not name.endswith(".md5")]
+        save(entry, "corrupted")
+        self.assertFalse(self._get(cache, "http://myurl/file.tgz", "contents"))
+        self.assertTrue(self._get(cache, "http://myurl/file.tgz", "contents"))
+
+    def lru_test(self):
+        cache = DownloadCache(self.folder, max_size=25)
+        self._get(cache, "http://myurl/file1.tgz", "1" * 10)
+        self._get(cache, "http://myurl/file2.tgz", "2" * 10)
+        entries = sorted(os.path.join(self.folder, name) for name in os.listdir(self.folder)
+                         if not name.endswith(".md5"))
+        for i, entry in enumerate(entries):  # Deterministic LRU order
+            os.utime(entry, (1000 + i, 1000 + i))
+        # Using file1 makes file2 the least recently used
+        self.assertTrue(self._get(cache, "http://myurl/file1.tgz", "1" * 10))
+        self._get(cache, "http://myurl/file3.tgz", "3" * 10)
+        self.assertTrue(self._get(cache, "http://myurl/file1.tgz", "1" * 10))
+        self.assertTrue(self._get(cache, "http://myurl/file3.tgz", "3" * 10))
+        self.assertFalse(self._get(cache, "http://myurl/file2.tgz", "2" * 10))
+
+    def tools_get_test(self):
+        tmp = temp_folder()
+        with tools.chdir(tmp):
+            save("folder/file.txt", "hello")
+            with tarfile.open("pkg.tgz", "w:gz") as tgz:
+                tgz.add("folder")
+            contents = load("pkg.tgz", binary=True)
+        old_requester = net._global_requester
+        net._global_requester = _Requester(contents)
+        try:
+            with tools.environment_append({"CONAN_DOWNLOAD_CACHE": self.folder}):
+                for _ in range(2):
+                    with tools.chdir(temp_folder()):
+                        tools.get("http://myurl/pkg.tgz", md5=md5(contents))
+                        self.assertEqual(load("folder/file.txt"), "hello")
+                        self.assertFalse(os.path.exists("pkg.tgz"))
+            self.assertEqual(net._global_requester.urls, ["http://myurl/pkg.tgz"])
+        finally:
+            net._global_requester = old_requester
+
+    def authenticated_not_cached_test(self):
+        old_requester = net._global_requester
+        net._global_requester = _Requester(b"contents")
+        try:
+            with tools.environment_append({"CONAN_DOWNLOAD_CACHE": self.folder}):
+                with tools.chdir(temp_folder()):
+                    tools.download("http://myurl/file.txt", "file1.txt", auth=("user", "pass"))
+                    tools.download("http://myurl/file.txt", "file2.txt",
+                                   headers={"Authorization": "Bearer mytoken"})
+                    self.assertEqual(load("file2.txt"), "contents")
+            self.assertEqual(net._global_requester.urls, ["http://myurl/file.txt"] * 2)
+            self.assertFalse(os.path.exists(self.folder) and os.listdir(self.folder))
+        finally:
+            net._global_requester = old_requester
@@ -2,6 +2,9 @@ import os
 import platform
 import unittest
 
+from mock import patch
+
+from conans import tools
 from conans.client.file_copier import FileCopier
 from conans.test.utils.test_files import temp_folder
 from conans.util.files import save, load
@@ -130,3 +133,60 @@ class FileCopierTest(unittest.TestCase):
         copier = FileCopier(folder1, folder2)
         copier("*.txt", excludes=("*Test*.txt", "*Impl*"))
         self.assertEqual(['MyLib.txt'], os.listdir(folder2))
+
+    def folder_walked_once_test(self):
+        folder1 = temp_folder()
+        save(os.path.join(folder1, "include/hello.h"), "header")
+        save(os.path.join(folder1, "lib/hello.lib"), "lib")
+        save(os.path.join(folder1, "lib/Debug/hellod.lib"), "libd")
+
+        folder2 = temp_folder()
+        copier = FileCopier(folder1, folder2)
+        with patch("os.walk", wraps=os.walk) as walk:
+            copier("*.h", "include", "include")
+            copier("*.lib", "lib", keep_path=False)
+            copier("*.lib", "lib_src", src="lib")
+            # A new FileCopier over the same folder, as imports() does per dependency
+            FileCopier(folder1, temp_folder())("*.h")
+        self.assertEqual(walk.call_count, 1)
+        self.assertEqual("header", load(os.path.join(folder2, "include/hello.h")))
+        self.assertEqual(sorted(os.listdir(os.path.join(folder2, "lib"))),
+                         ["hello.lib", "hellod.lib"])
+        self.assertEqual("libd", load(os.path.join(folder2, "lib_src/Debug/hellod.lib")))
+
+    def folder_index_updated_test(self):
+        folder1 = temp_folder()
+        save(os.path.join(folder1, "include/hello.h"), "header")
+        folder2 = temp_folder()
+        copier = FileCopier(folder1, folder2)
+        copier("*.h")
+        # Files added or removed after the first copy are taken into account
+        save(os.path.join(folder1, "include/bye.h"), "bye")
+        save(os.path.join(folder1, "include/sub/other.h"), "other")
+        os.remove(os.path.join(folder1, "include/hello.h"))
+        copied = copier("*.h", "new")
+        self.assertEqual(sorted(os.path.relpath(f, folder2) for f in copied),
+                         [os.path.join("new", "include", "bye.h"),
+                          os.path.join("new", "include", "sub", "other.h")])
+
+    def parallel_copy_test(self):
+        folder1 = temp_folder()
+        for i in range(50):
+            save(os.path.join(folder1, "sub%d" % (i % 5), "file%d.txt" % i), "content %d" % i)
+        save(os.path.join(folder1, "sub0", "same.txt"), "first")
+        save(os.path.join(folder1, "sub1", "same.txt"), "second")
+
+        sequential_folder = temp_folder()
+        sequential_copied = FileCopier(folder1, sequential_folder)("*.txt", keep_path=False)
+        folder2 = temp_folder()
+        copier = FileCopier(folder1, folder2)
+        with tools.environment_append({"CONAN_COPY_THREADS": "4"}):
+            copied = copier("*.txt", keep_path=False)
+        self.assertEqual(len(copied), 52)
+        self.assertEqual([os.path.basename(f) for f in copied],
+                         [os.path.basename(f) for f in sequential_copied])
+        for i in range(50):
+            self.assertEqual(load(os.path.join(folder2, "file%d.txt" % i)), "content %d" % i)
+        # Same destination file, the last one wins as in a sequential copy
+        self.assertEqual(load(os.path.join(folder2, "same.txt")),
+                         load(os.path.join(sequential_folder, "same.txt")))
@@ -1,6 +1,7 @@
 import unittest
+from conans import tools
 from conans.test.utils.tools import TestClient, TestServer
-from conans.util.files import save
+from conans.util.files import save, load
 import os
 from conans.model.ref import ConanFileReference, PackageReference
 
@@ -57,3 +58,36 @@ class MyPkg(ConanFile):
             save(path, "Bye World")
         os.chmod(path, 0o777)
         save(path, "Bye World")
+
+    def materialize_mode_test(self):
+        conanfile = """from conans import ConanFile
+from conans.util.files import load, save
+class MyPkg(ConanFile):
+    requires = "Pkg/0.1@lasote/channel"
+    exports_sources = "*.cpp"
+    def imports(self):
+        self.copy("*.h")
+    def build(self):
+        assert load("myheader.h") == "my header"
+        save("main.cpp", "modified")
+    def package(self):
+        self.copy("*.cpp")
+"""
+        self.client.save({"conanfile.py": conanfile,
+                          "main.cpp": "main"}, clean_first=True)
+        with tools.environment_append({"CONAN_MATERIALIZE_MODE": "symlink"}):
+            self.client.run("create Consumer/0.1@lasote/channel")
+            self.client.save({"conanfile.txt": "[requires]\nPkg/0.1@lasote/channel\n"
+                                               "[imports]\n., *.h -> ."}, clean_first=True)
+            self.client.run("install .")
+
+        # The imported read-only file links to the cache, the build modified its own copy
+        imported = os.path.join(self.client.current_folder, "myheader.h")
+        self.assertTrue(os.path.islink(imported))
+        self.assertEqual(load(imported), "my header")
+        ref = ConanFileReference.loads("Consumer/0.1@lasote/channel")
+        self.assertEqual(load(os.path.join(self.client.client_cache.source(ref), "main.cpp")),
+                         "main")
+        package_folder = self.client.client_cache.packages(ref)
+        package_id = os.listdir(package_folder)[0]
+        self.assertEqual(load(os.path.join(package_folder, package_id, "main.cpp")), "modified")
@@ -1,11 +1,12 @@
 import unittest
 import os
+from multiprocessing.pool import ThreadPool
 from conans.test.utils.test_files import temp_folder
-from conans.client.remote_registry import RemoteRegistry
+from conans.client.remote_registry import RemoteRegistry, registry_batch
 from conans.model.ref import ConanFileReference
 from conans.errors import ConanException
 from conans.test.utils.tools import TestBufferConanOutput
-from conans.util.files import save
+from conans.util.files import save, load
 
 
 class RegistryTest(unittest.TestCase):
@@ -87,3 +88,45 @@ class RegistryTest(unittest.TestCase):
                                             ("repo2", "url2", True),
                                             ("conan.io", "https://server.conan.io", True),
                                             ("repo3", "url3", True)])
+
+    def batch_test(self):
+        f = os.path.join(temp_folder(), "aux_file")
+        save(f, "conan.io https://server.conan.io True")
+        registry = RemoteRegistry(f, TestBufferConanOutput())
+        ref = ConanFileReference.loads("MyLib/0.1@lasote/stable")
+        with registry_batch():
+            registry.set_ref(ref, registry.remotes[0])
+            # Visible for every registry of the process, but not saved yet
+            self.assertEqual(RemoteRegistry(f, None).get_ref(ref).name, "conan.io")
+            self.assertNotIn("MyLib", load(f))
+        self.assertIn("MyLib/0.1@lasote/stable conan.io", load(f))
+
+        with registry_batch():
+            registry.remove_refs([ref])
+        self.assertNotIn("MyLib", load(f))
+
+    def threads_test(self):
+        f = os.path.join(temp_folder(), "aux_file")
+        save(f, "conan.io https://server.conan.io True")
+        registry = RemoteRegistry(f, TestBufferConanOutput())
+        remote = registry.remotes[0]
+        refs = [ConanFileReference.loads("MyLib%d/0.1@lasote/stable" % i) for i in range(20)]
+        pool = ThreadPool(8)
+        try:
+            pool.map(lambda ref: registry.set_ref(ref, remote), refs)
+        finally:
+            pool.close()
+            pool.join()
+        registry = RemoteRegistry(f, TestBufferConanOutput())
+        self.assertEqual(len(registry.refs), len(refs))
+        for ref in refs:
+            self.assertIn("%s conan.io" % str(ref), load(f))
+
+    def external_changes_test(self):
+        f = os.path.join(temp_folder(), "aux_file")
+        save(f, "conan.io https://server.conan.io True")
+        registry = RemoteRegistry(f, TestBufferConanOutput())
+        self.assertEqual(registry.remotes, [("conan.io", "https://server.conan.io", True)])
+        # Same size and modified right after being read
+        save(f, "conan.io https://server.conan.com True")
+        self.assertEqual(registry.remotes, [("conan.io", "https://server.conan.com", True)])
@@ -1,7 +1,7 @@
 import unittest
 from conans.test.utils.tools import TestClient
 import os
-from conans.util.files import load
+from conans.util.files import load, save
 
 
 class GeneratorsTest(unittest.TestCase):
@@ -31,6 +31,35 @@ ycm
                                  '.ycm_extra_conf.py']),
                          sorted(os.listdir(client.current_folder)))
 
+    def test_unchanged_files(self):
+        base = """
+[generators]
+cmake
+gcc
+txt
+visual_studio
+virtualenv
+ycm
+"""
+        client = TestClient()
+        client.save({"conanfile.txt": base})
+        client.run("install")
+        generated = [name for name in os.listdir(client.current_folder)
+                     if name != "conanfile.txt" and name != "conaninfo.txt"]
+        for name in generated:
+            os.utime(os.path.join(client.current_folder, name), (1000, 1000))
+        save(os.path.join(client.current_folder, "conanbuildinfo.txt"), "modified")
+
+        client.run("install")
+        self.assertIn("Generator cmake: conanbuildinfo.cmake is up to date", client.out)
+        self.assertIn("Generator txt created conanbuildinfo.txt", client.out)
+        for name in generated:
+            mtime = os.path.getmtime(os.path.join(client.current_folder, name))
+            if name == "conanbuildinfo.txt":
+                self.assertNotEqual(mtime, 1000)
+            else:
+                self.assertEqual(mtime, 1000, name)
+
     def test_qmake(self):
         client = TestClient()
         dep = """
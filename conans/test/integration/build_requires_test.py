@@ -95,6 +95,26 @@ class BuildRequiresTest(unittest.TestCase):
         self.assertIn("Tool/0.3@lasote/stable: Generating the package", client.user_io.out)
         self.assertIn("ToolPath: MyToolPath", client.user_io.out)
 
+    def installed_once_test(self):
+        client = TestClient()
+        client.save({CONANFILE: tool_conanfile}, clean_first=True)
+        client.run("export lasote/stable")
+        client.save({CONANFILE: requires}, clean_first=True)
+        client.run("export lasote/stable")
+        client.save({CONANFILE: requires.replace("MyLib", "MyLib2")}, clean_first=True)
+        client.run("export lasote/stable")
+        consumer = """[requires]
+MyLib/0.1@lasote/stable
+MyLib2/0.1@lasote/stable
+"""
+        client.save({"conanfile.txt": consumer}, clean_first=True)
+        client.run("install --build missing")
+        self.assertEqual(str(client.user_io.out).count("Tool/0.1@lasote/stable: Generating"), 1)
+        self.assertEqual(str(client.user_io.out).count("Build requirements already installed"),
+                         1)
+        self.assertIn("MyLib/0.1@lasote/stable: ToolPath: MyToolPath", client.user_io.out)
+        self.assertIn("MyLib2/0.1@lasote/stable: ToolPath: MyToolPath", client.user_io.out)
+
     def options_test(self):
         conanfile = """from conans import ConanFile
 class package(ConanFile):
@@ -1,4 +1,5 @@
 import unittest
+from conans import tools
 from conans.test.utils.tools import TestClient, TestServer
 from conans.model.ref import ConanFileReference, PackageReference
 import os
@@ -123,3 +124,51 @@ class ConanLib(ConanFile):
         pkg_ref = PackageReference(conan_ref, "5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9")
         header = os.path.join(client.client_cache.package(pkg_ref), "header.h")
         self.assertEqual(load(header), "mycontent2")
+
+    def delta_update_test(self):
+        conanfile = '''from conans import ConanFile, tools
+import os
+class Pkg(ConanFile):
+    name = "Pkg"
+    version = "0.1"
+
+    def package(self):
+        for i in range(10):
+            tools.save(os.path.join(self.package_folder, "lib", "lib%d.a" % i), "lib%d" % i)
+        tools.save(os.path.join(self.package_folder, "data.txt"), os.getenv("PKG_DATA"))
+        if os.getenv("PKG_EXTRA"):
+            tools.save(os.path.join(self.package_folder, "extra", "extra.txt"), "extra")
+'''
+        self.client.save({"conanfile.py": conanfile})
+        self.client.run("export lasote/stable")
+        self.client.run("install Pkg/0.1@lasote/stable --build -e PKG_DATA=data1 -e PKG_EXTRA=1")
+        self.client.run("upload Pkg/0.1@lasote/stable --all")
+
+        client2 = TestClient(servers=self.servers, users={"myremote": [("lasote", "mypass")]})
+        client2.run("install Pkg/0.1@lasote/stable")
+        time.sleep(1)
+        self.client.run("install Pkg/0.1@lasote/stable --build -e PKG_DATA=data2")
+        self.client.run("upload Pkg/0.1@lasote/stable --all")
+
+        client2.run("install Pkg/0.1@lasote/stable --update")
+        self.assertIn("updated, 2 changed files downloaded", client2.user_io.out)
+        self.assertNotIn("Downloading conan_package.tgz", client2.user_io.out)
+        ref = ConanFileReference.loads("Pkg/0.1@lasote/stable")
+        package_id = client2.paths.conan_packages(ref)[0]
+        package_folder = client2.paths.package(PackageReference(ref, package_id))
+        self.assertEqual(load(os.path.join(package_folder, "data.txt")), "data2")
+        self.assertEqual(load(os.path.join(package_folder, "lib", "lib3.a")), "lib3")
+        self.assertFalse(os.path.exists(os.path.join(package_folder, "extra")))
+        self.assertEqual(load(os.path.join(package_folder, "conanmanifest.txt")),
+                         load(self.client.paths.digestfile_package(PackageReference(ref,
+                                                                                    package_id))))
+        self.assertFalse([f for f in os.listdir(client2.paths.conan(ref)) if f.startswith(".")])
+
+        # Disabled, the whole package is downloaded again
+        time.sleep(1)
+        self.client.run("install Pkg/0.1@lasote/stable --build -e PKG_DATA=data3")
+        self.client.run("upload Pkg/0.1@lasote/stable --all")
+        with tools.environment_append({"CONAN_DELTA_UPDATES": "0"}):
+            client2.run("install Pkg/0.1@lasote/stable --update")
+        self.assertIn("Downloading conan_package.tgz", client2.user_io.out)
+        self.assertEqual(load(os.path.join(package_folder, "data.txt")), "data3")
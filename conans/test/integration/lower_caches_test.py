@@ -0,0 +1,98 @@
+import os
+import platform
+import unittest
+
+from conans import tools
+from conans.model.ref import ConanFileReference
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import load
+
+
+class LowerCachesTest(unittest.TestCase):
+    conanfile = """from conans import ConanFile
+class Pkg(ConanFile):
+    exports_sources = "*.h"
+    def package(self):
+        self.copy("*.h", dst="include")
+    def package_info(self):
+        self.output.info("PACKAGE FOLDER %s" % self.package_folder)
+"""
+
+    def setUp(self):
+        self.lower = TestClient()
+        self.lower.save({"conanfile.py": self.conanfile,
+                         "header.h": "my header"})
+        self.lower.run("create Pkg/0.1@lasote/testing")
+        self.ref = ConanFileReference.loads("Pkg/0.1@lasote/testing")
+        self.client = TestClient()
+        self.client.save({"conanfile.txt": "[requires]\nPkg/0.1@lasote/testing"})
+
+    def _lower_files(self):
+        result = {}
+        for root, _, files in os.walk(self.lower.client_cache.store):
+            for f in files:
+                path = os.path.join(root, f)
+                result[path] = load(path)
+        return result
+
+    def install_test(self):
+        lower_files = self._lower_files()
+        with tools.environment_append({"CONAN_LOWER_CACHES": self.lower.client_cache.store}):
+            self.client.run("install")
+            self.assertIn("Pkg/0.1@lasote/testing: Copied from lower cache", self.client.out)
+            self.assertIn("linked from lower cache", self.client.out)
+            packages = self.client.client_cache.packages(self.ref)
+            package_id, = os.listdir(packages)
+            header = os.path.join(packages, package_id, "include", "header.h")
+            self.assertEqual(load(header), "my header")
+            if platform.system() != "Windows":
+                self.assertTrue(os.path.islink(header))
+
+            self.client.run("install")
+            self.assertIn("Pkg/0.1@lasote/testing: Already installed!", self.client.out)
+            self.assertNotIn("lower cache", self.client.out)
+
+            # Building and removing only modify the local cache
+            self.client.run("install --build")
+            self.assertIn("Package '%s' created" % package_id, self.client.out)
+            self.assertFalse(os.path.islink(header))
+            self.client.run("remove Pkg* -f")
+            self.assertEqual(self._lower_files(), lower_files)
+
+    def outdated_test(self):
+        self.client.save({"conanfile.py": self.conanfile + "# Changed",
+                          "header.h": "other header"})
+        self.client.run("export Pkg/0.1@lasote/testing")
+        self.client.save({"conanfile.txt": "[requires]\nPkg/0.1@lasote/testing"},
+                         clean_first=True)
+        with tools.environment_append({"CONAN_LOWER_CACHES": self.lower.client_cache.store}):
+            # Packages of other recipe are never used
+            error = self.client.run("install", ignore_error=True)
+            self.assertTrue(error)
+            self.assertIn("Missing prebuilt package", self.client.out)
+            self.client.run("install --build missing")
+            package_id, = os.listdir(self.client.client_cache.packages(self.ref))
+            header = os.path.join(self.client.client_cache.packages(self.ref), package_id,
+                                  "include", "header.h")
+            self.assertEqual(load(header), "other header")
+
+    def upload_test(self):
+        server = TestServer()
+        servers = {"default": server}
+        users = {"default": [("lasote", "mypass")]}
+        client = TestClient(servers=servers, users=users)
+        with tools.environment_append({"CONAN_LOWER_CACHES": self.lower.client_cache.store}):
+            client.run("install Pkg/0.1@lasote/testing")
+            self.assertIn("linked from lower cache", client.out)
+            client.run("upload Pkg/0.1@lasote/testing --all")
+
+        # The uploaded files are the contents, not the links to the lower cache
+        other = TestClient(servers=servers, users=users)
+        other.run("install Pkg/0.1@lasote/testing")
+        package_id, = os.listdir(other.client_cache.packages(self.ref))
+        header = os.path.join(other.client_cache.packages(self.ref), package_id, "include",
+                              "header.h")
+        self.assertFalse(os.path.islink(header))
+        self.assertEqual(load(header), "my header")
+        other.run("install Pkg/0.1@lasote/testing --build")
+        self.assertEqual(load(header), "my header")
@@ -6,7 +6,7 @@ from conans.test.utils.cpp_test_files import cpp_hello_conan_files
 from nose.plugins.attrib import attr
 from conans.util.files import load, save
 from conans.test.utils.test_files import uncompress_packaged_files, temp_folder
-from conans.paths import EXPORT_TGZ_NAME, CONAN_MANIFEST, PACKAGE_TGZ_NAME
+from conans.paths import EXPORT_TGZ_NAME, CONAN_MANIFEST
 from conans.tools import untargz
 from conans.model.manifest import FileTreeManifest
 
@@ -85,7 +85,6 @@ class SynchronizeTest(unittest.TestCase):
         pack_path = self.client.paths.package(package_reference)
         new_file_source_path = os.path.join(pack_path, "newlib.lib")
         save(new_file_source_path, "newlib")
-        os.unlink(os.path.join(pack_path, PACKAGE_TGZ_NAME))  # Force new tgz
 
         self._create_manifest(package_reference)
         self.client.run("upload %s -p %s" % (str(conan_reference), str(package_ids[0])))
@@ -106,7 +105,6 @@ class SynchronizeTest(unittest.TestCase):
         # Now delete the file and check again
         os.remove(new_file_source_path)
         self._create_manifest(package_reference)
-        os.unlink(os.path.join(pack_path, PACKAGE_TGZ_NAME))  # Force new tgz
         self.client.run("upload %s -p %s" % (str(conan_reference), str(package_ids[0])))
         folder = uncompress_packaged_files(remote_paths, package_reference)
         remote_file_path = os.path.join(folder, "newlib.lib")
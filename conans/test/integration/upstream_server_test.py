@@ -0,0 +1,90 @@
+import os
+import threading
+import unittest
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.server.service.upstream import UpstreamRemote
+from conans.test.utils.tools import TestClient, TestServer, TestRequester
+from conans.util.files import load
+
+
+class _CountingRequester(TestRequester):
+    def __init__(self, test_servers):
+        TestRequester.__init__(self, test_servers)
+        self.downloads = []
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        if "download_urls" in url:
+            with self._lock:
+                self.downloads.append(url)
+        return TestRequester.get(self, url, **kwargs)
+
+
+class UpstreamServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.upstream = TestServer([("*/*@*/*", "*")], [("*/*@*/*", "*")],
+                                   users={"lasote": "mypass"})
+        client = TestClient(servers={"default": self.upstream},
+                            users={"default": [("lasote", "mypass")]})
+        client.save({"conanfile.py": """from conans import ConanFile
+class Pkg(ConanFile):
+    exports_sources = "*.h"
+    def package(self):
+        self.copy("*.h", dst="include")
+""",
+                     "header.h": "my header"})
+        client.run("create Pkg/0.1@lasote/testing")
+        client.run("upload Pkg/0.1@lasote/testing --all")
+        self.ref = ConanFileReference.loads("Pkg/0.1@lasote/testing")
+        package_id = os.listdir(client.paths.packages(self.ref))[0]
+        self.pref = PackageReference(self.ref, package_id)
+
+    def install_test(self):
+        mirror = TestServer(upstream=self.upstream)
+        client = TestClient(servers={"default": mirror})
+        client.save({"conanfile.txt": "[requires]\nPkg/0.1@lasote/testing"})
+        client.run("install .")
+        self.assertIn("Pkg/0.1@lasote/testing: Package installed %s" % self.pref.package_id,
+                      client.user_io.out)
+        package_folder = client.paths.package(self.pref)
+        self.assertEqual(load(os.path.join(package_folder, "include", "header.h")),
+                         "my header")
+        # Stored by the mirror, that serves them without the upstream now
+        self.assertTrue(os.path.exists(os.path.join(mirror.paths.export(self.ref),
+                                                    "conanfile.py")))
+        self.assertTrue(os.path.exists(os.path.join(mirror.paths.package(self.pref),
+                                                    "conaninfo.txt")))
+        mirror.test_server.ra.api_v1.upstream = None
+        client = TestClient(servers={"default": mirror})
+        client.save({"conanfile.txt": "[requires]\nPkg/0.1@lasote/testing"})
+        client.run("install .")
+        self.assertIn("Pkg/0.1@lasote/testing: Package installed %s" % self.pref.package_id,
+                      client.user_io.out)
+
+        # Not found upstream
+        client.save({"conanfile.txt": "[requires]\nOther/0.1@lasote/testing"})
+        error = client.run("install .", ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("Unable to find 'Other/0.1@lasote/testing'", client.user_io.out)
+
+    def concurrent_test(self):
+        mirror = TestServer()
+        requester = _CountingRequester({"upstream": self.upstream})
+        upstream = UpstreamRemote(self.upstream.fake_url, mirror.paths, requester=requester)
+        results = []
+
+        def fetch():
+            results.append(upstream.fetch_recipe(self.ref))
+            results.append(upstream.fetch_package(self.pref))
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [True] * 8)
+        self.assertEqual(len(requester.downloads), 2)
+        self.assertFalse(upstream.fetch_recipe(ConanFileReference.loads("Other/0.1@lasote/testing")))
+        self.assertEqual(sorted(os.listdir(mirror.paths.conan(self.ref))), ["export", "package"])
@@ -1,5 +1,11 @@
+import os
+import time
 import unittest
+
 from conans.model.info import ConanInfo
+from conans.model.values import Values
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
 
 info_text = '''[settings]
     arch=x86_64
@@ -136,3 +142,46 @@ class ConanInfoTest(unittest.TestCase):
         self.assertEqual(info.requires.dumps(), "bzip2/1.2.3-alpha1+build123@lasote/testing:sha1\n"
                                                 "poco/2.3.4+build123@lasote/stable:sha3\n"
                                                 "zlib/0.3@lasote/testing:sha2")
+
+    def test_package_id_invalidation(self):
+        mutations = [lambda i: setattr(i.settings.compiler, "version", "6.1"),
+                     lambda i: setattr(i.settings, "os", "Windows"),
+                     lambda i: setattr(i, "settings", Values.loads("os=Linux")),
+                     lambda i: setattr(i.options, "shared", "True"),
+                     lambda i: i.options.remove("fPIC"),
+                     lambda i: i.options.clear(),
+                     lambda i: i.requires.full_version_mode(),
+                     lambda i: setattr(i.requires["zlib"], "version", "1.2.8"),
+                     lambda i: i.requires.remove("bzip2"),
+                     lambda i: i.requires.clear(),
+                     lambda i: i.header_only()]
+        for mutation in mutations:
+            info = ConanInfo.loads(info_text)
+            first_id = info.package_id()
+            self.assertEqual(info.package_id(), first_id)
+            mutation(info)
+            # As computed without any cached value
+            expected = ConanInfo.loads(info_text)
+            mutation(expected)
+            self.assertEqual(info.package_id(), expected.package_id())
+            self.assertNotEqual(info.package_id(), first_id)
+
+    def test_load_file_cached(self):
+        path = os.path.join(temp_folder(), "conaninfo.txt")
+        save(path, info_text)
+        old = time.time() - 10
+        os.utime(path, (old, old))
+        info = ConanInfo.load_file_cached(path)
+        self.assertEqual(info.recipe_hash, "asdasdasd")
+        self.assertIs(ConanInfo.load_file_cached(path), info)
+
+        save(path, info_text.replace("asdasdasd", "changed"))
+        os.utime(path, (old + 1, old + 1))
+        changed = ConanInfo.load_file_cached(path)
+        self.assertEqual(changed.recipe_hash, "changed")
+        self.assertIs(ConanInfo.load_file_cached(path), changed)
+
+        # Recently modified files are parsed every time
+        save(path, info_text)
+        self.assertEqual(ConanInfo.load_file_cached(path).recipe_hash, "asdasdasd")
+        self.assertIsNot(ConanInfo.load_file_cached(path), ConanInfo.load_file_cached(path))
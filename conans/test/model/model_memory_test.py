@@ -0,0 +1,61 @@
+import unittest
+
+from conans.client.conf import default_settings_yml
+from conans.errors import ConanException
+from conans.model.info import RequirementInfo
+from conans.model.options import PackageOptionValues
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.model.settings import Settings
+from conans.model.values import Values
+
+try:
+    from conans.test.performance.model_memory import run
+except ImportError:  # No tracemalloc in Python 2
+    run = None
+
+
+class ModelMemoryTest(unittest.TestCase):
+
+    def slots_test(self):
+        settings = Settings.loads(default_settings_yml)
+        settings.os = "Linux"
+        options = PackageOptionValues()
+        options.shared = True
+        ref = ConanFileReference.loads("Hello/1.0@user/testing")
+        objects = [Values.loads("os=Linux"), settings, settings.os, options, options.shared,
+                   RequirementInfo("Hello/1.0@user/testing:1234"), ref,
+                   PackageReference(ref, "1234")]
+        for obj in objects:
+            # Not hasattr(), as some of them have a __getattr__()
+            with self.assertRaises(AttributeError):
+                object.__getattribute__(obj, "__dict__")
+
+    def interned_test(self):
+        ref = ConanFileReference.loads("Hello/1.0@user/testing")
+        self.assertIs(ref, ConanFileReference.loads("Hello/1.0@user/testing"))
+        self.assertIs(ref, ConanFileReference("Hello", "1.0", "user", "testing"))
+        self.assertIs(ref, ConanFileReference.loads(" Hello/1.0@user/testing "))
+        with self.assertRaisesRegexp(ConanException, "is an invalid name"):
+            ConanFileReference.loads("Hello/1.0@user/tes%ting")
+
+        options1, options2 = PackageOptionValues(), PackageOptionValues()
+        options1.shared = True
+        options2.add("shared=True")
+        self.assertIs(options1.shared, options2.shared)
+
+        settings = Settings.loads(default_settings_yml)
+        settings.os = "Linux"
+        copy = settings.copy()
+        self.assertIs(settings.build_type.values_range, copy.build_type.values_range)
+        copy.build_type.remove("Debug")
+        self.assertNotIn("Debug", copy.build_type.values_range)
+        self.assertIn("Debug", settings.build_type.values_range)
+        self.assertEqual(settings.copy(["os"]).fields, ["os"])
+
+    def graph_memory_test(self):
+        if run is None:
+            return
+        result = run(nodes=100, width=20, deps=3)
+        self.assertEqual(result["requires"], 1000)
+        # 66 before the model objects had __slots__ and shared values
+        self.assertLess(result["model_blocks"], 50 * result["requires"])
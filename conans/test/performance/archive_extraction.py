@@ -0,0 +1,81 @@
+""" NOT really a test, but a benchmark of the extraction of tools.unzip() and tools.untargz()
+FILE name is not "test" so it will not run under unit testing
+
+Creates a zip and a tgz with many small files, as the sources of boost or LLVM, and compares
+the extraction one member after the other with ZipFile.extract(), as tools.unzip() did before,
+with the parallel extraction:
+
+    python -m conans.test.performance.archive_extraction --files 100000 --threads 8
+"""
+import argparse
+import os
+import tarfile
+import time
+import zipfile
+
+from conans.test.utils.test_files import temp_folder
+from conans.util.extract import extract_zip, extract_tar
+
+EXTENSIONS = [".h", ".hpp", ".cpp", ".txt", ".cmake"]
+
+
+def _archives(files, file_size, files_per_folder=50):
+    folder = temp_folder()
+    zip_path = os.path.join(folder, "sources.zip")
+    tgz_path = os.path.join(folder, "sources.tgz")
+    content = ("x" * 63 + "\n") * (file_size // 64)
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as the_zip:
+        for i in range(files):
+            name = "src/module%d/sub%d/file%d%s" % (i // (files_per_folder * 10),
+                                                    i // files_per_folder, i,
+                                                    EXTENSIONS[i % len(EXTENSIONS)])
+            the_zip.writestr(name, "%d\n%s" % (i, content))
+    source_folder = temp_folder()
+    extract_zip(zip_path, source_folder)
+    with tarfile.open(tgz_path, "w:gz") as the_tar:
+        the_tar.add(os.path.join(source_folder, "src"), "src")
+    return zip_path, tgz_path
+
+
+def run(files, file_size, threads):
+    zip_path, tgz_path = _archives(files, file_size)
+    print("Archives with %d files of %d bytes" % (files, file_size))
+
+    t1 = time.time()
+    destination = temp_folder()
+    with zipfile.ZipFile(zip_path, "r") as the_zip:
+        for member in the_zip.infolist():
+            the_zip.extract(member, destination)
+    print("zip, ZipFile.extract() per member: %.3f s" % (time.time() - t1))
+
+    for extract_threads in (1, threads):
+        t1 = time.time()
+        extract_zip(zip_path, temp_folder(), threads=extract_threads)
+        print("zip, extract_zip() %d threads: %.3f s" % (extract_threads, time.time() - t1))
+
+    t1 = time.time()
+    with tarfile.open(tgz_path, "r:*") as the_tar:
+        the_tar.extractall(temp_folder())
+    print("tgz, TarFile.extractall(): %.3f s" % (time.time() - t1))
+
+    t1 = time.time()
+    extract_tar(tgz_path, temp_folder())
+    print("tgz, extract_tar(): %.3f s" % (time.time() - t1))
+
+    t1 = time.time()
+    with open(tgz_path, "rb") as stream:
+        extract_tar(destination=temp_folder(), fileobj=stream)
+    print("tgz, extract_tar() streamed: %.3f s" % (time.time() - t1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive extraction benchmark")
+    parser.add_argument("--files", type=int, default=100000, help="files in the archives")
+    parser.add_argument("--size", type=int, default=2048, help="bytes of every file")
+    parser.add_argument("--threads", type=int, default=8, help="zip extraction threads")
+    args = parser.parse_args()
+    run(args.files, args.size, args.threads)
+
+
+if __name__ == "__main__":
+    main()
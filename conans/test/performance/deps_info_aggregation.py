@@ -0,0 +1,111 @@
+""" NOT really a test, but a benchmark of the deps_cpp_info and deps_env_info aggregation
+FILE name is not "test" so it will not run under unit testing
+
+Aggregates synthetic graphs as ConanInstaller._propagate_info does, every node updating its
+deps infos with its whole closure, and compares the result and the time with the previous
+merge_lists() implementation:
+
+    python -m conans.test.performance.deps_info_aggregation --nodes 300 --items 30
+"""
+import argparse
+import time
+
+from conans.model.build_info import CppInfo, DepsCppInfo
+from conans.model.env_info import EnvInfo, DepsEnvInfo
+
+
+def merge_lists(seq1, seq2):
+    return [s for s in seq1 if s not in seq2] + seq2
+
+
+class _ListsDepsCppInfo(object):
+    """ The previous DepsCppInfo aggregation, scanning the lists
+    """
+    def __init__(self):
+        self.includedirs = []
+        self.libs = []
+        self.defines = []
+        self.path = []
+
+    def update(self, cpp_info, env_info):
+        self.includedirs = merge_lists(self.includedirs, cpp_info.includedirs)
+        self.libs = merge_lists(self.libs, cpp_info.libs)
+        self.defines = merge_lists(cpp_info.defines, self.defines)
+        self.path = merge_lists(self.path, env_info.PATH)
+
+
+def _package_infos(nodes, items):
+    infos = []
+    for node in range(nodes):
+        cpp_info = CppInfo("")
+        cpp_info.includedirs = ["/pkg%d/include%d" % (node, i) for i in range(items)]
+        cpp_info._include_paths = cpp_info.includedirs  # Do not check the disk
+        cpp_info.libs = ["lib%d_%d" % (node, i) for i in range(items)] + ["common"]
+        cpp_info.defines = ["DEF%d_%d" % (node, i) for i in range(items)] + ["COMMON"]
+        env_info = EnvInfo()
+        env_info.PATH = ["/pkg%d/bin" % node, "/usr/bin"]
+        infos.append((cpp_info, env_info))
+    return infos
+
+
+def _closures(nodes, shape):
+    """ closure of every node, in the upstream first order of ordered_closure()
+    deep: N -> N-1 -> ... -> 0, wide: N -> (N-1 ... 0), every one of them -> 0
+    """
+    if shape == "deep":
+        return [list(range(node)) for node in range(nodes + 1)]
+    return [[]] + [[0] for _ in range(1, nodes)] + [list(range(nodes))]
+
+
+def _aggregate_new(infos, closures):
+    results = []
+    for closure in closures:
+        deps_cpp_info = DepsCppInfo()
+        deps_env_info = DepsEnvInfo()
+        for node in closure:
+            cpp_info, env_info = infos[node]
+            deps_cpp_info.update(cpp_info, "pkg%d" % node)
+            deps_env_info.update(env_info, "pkg%d" % node)
+        results.append((deps_cpp_info.includedirs, deps_cpp_info.libs, deps_cpp_info.defines,
+                        deps_env_info.vars.get("PATH", [])))
+    return results
+
+
+def _aggregate_old(infos, closures):
+    results = []
+    for closure in closures:
+        deps = _ListsDepsCppInfo()
+        for node in closure:
+            cpp_info, env_info = infos[node]
+            deps.update(cpp_info, env_info)
+        results.append((deps.includedirs, deps.libs, deps.defines, deps.path))
+    return results
+
+
+def run(nodes, items, shape):
+    infos = _package_infos(nodes, items)
+    closures = _closures(nodes, shape)
+    t1 = time.time()
+    new = _aggregate_new(infos, closures)
+    new_time = time.time() - t1
+    t1 = time.time()
+    old = _aggregate_old(infos, closures)
+    old_time = time.time() - t1
+    if new != old:
+        raise Exception("Different aggregation results for %s graph" % shape)
+    print("%-5s graph, %d nodes, %d items: merge_lists %.3f s, MergedList %.3f s (x%.1f)"
+          % (shape, nodes, items, old_time, new_time, old_time / max(new_time, 1e-6)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="deps_cpp_info aggregation benchmark")
+    parser.add_argument("--nodes", type=int, default=300, help="packages in the graph")
+    parser.add_argument("--items", type=int, default=30,
+                        help="include dirs, libs and defines of every package")
+    args = parser.parse_args()
+    for shape in ("deep", "wide"):
+        run(args.nodes, args.items, shape)
+
+
+if __name__ == "__main__":
+    main()
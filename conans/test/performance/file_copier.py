@@ -0,0 +1,77 @@
+""" NOT really a test, but a benchmark of FileCopier over a large build folder
+FILE name is not "test" so it will not run under unit testing
+
+Creates a synthetic build folder and runs several copy() patterns over it, as a typical
+package() method, comparing the file search with one os.walk per copy() call as FileCopier
+did before, and the copy time with and without CONAN_COPY_THREADS:
+
+    python -m conans.test.performance.file_copier --files 100000 --patterns 10
+"""
+import argparse
+import fnmatch
+import os
+import time
+
+from conans.client.file_copier import FileCopier
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+EXTENSIONS = [".h", ".hpp", ".cpp", ".o", ".a", ".lib", ".so", ".dll", ".txt", ".cmake"]
+
+
+def _build_folder(files, files_per_folder=50):
+    folder = temp_folder()
+    for i in range(files):
+        subfolder = "src/module%d/sub%d" % (i // (files_per_folder * 10), i // files_per_folder)
+        extension = EXTENSIONS[i % len(EXTENSIONS)]
+        save(os.path.join(folder, subfolder, "file%d%s" % (i, extension)), "")
+    return folder
+
+
+def _walk_and_filter(folder, pattern):
+    """ The previous FileCopier file search, one os.walk per copy() call """
+    filenames = []
+    for root, _, files in os.walk(folder, followlinks=True):
+        relative_path = os.path.relpath(root, folder)
+        filenames.extend(os.path.normpath(os.path.join(relative_path, f)) for f in files)
+    return fnmatch.filter(filenames, pattern)
+
+
+def run(files, patterns, threads):
+    folder = _build_folder(files)
+    patterns = ["*%s" % ext for ext in EXTENSIONS][:patterns]
+    print("Build folder with %d files, %d copy() patterns" % (files, len(patterns)))
+
+    t1 = time.time()
+    walked = [_walk_and_filter(folder, pattern) for pattern in patterns]
+    print("Search, os.walk per pattern: %.3f s" % (time.time() - t1))
+
+    copier = FileCopier(folder, temp_folder())
+    t1 = time.time()
+    indexed = [copier._filter_files(folder, pattern, False, None, False)[0]
+               for pattern in patterns]
+    print("Search, folder index: %.3f s" % (time.time() - t1))
+    if [sorted(f) for f in walked] != [sorted(f) for f in indexed]:
+        raise Exception("Different files found")
+
+    for copy_threads in (1, threads):
+        os.environ["CONAN_COPY_THREADS"] = str(copy_threads)
+        copier = FileCopier(folder, temp_folder())
+        t1 = time.time()
+        for pattern in patterns:
+            copier(pattern, dst=pattern[2:], keep_path=False)
+        print("Copy, %d threads: %.3f s" % (copy_threads, time.time() - t1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FileCopier benchmark")
+    parser.add_argument("--files", type=int, default=100000, help="files in the build folder")
+    parser.add_argument("--patterns", type=int, default=len(EXTENSIONS),
+                        help="copy() calls in package()")
+    parser.add_argument("--threads", type=int, default=8, help="CONAN_COPY_THREADS to compare")
+    args = parser.parse_args()
+    run(args.files, args.patterns, args.threads)
+
+
+if __name__ == "__main__":
+    main()
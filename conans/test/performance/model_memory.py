@@ -0,0 +1,142 @@
+""" NOT really a test, but a benchmark of the memory and time of loading a dependency graph
+FILE name is not "test" so it will not run under unit testing
+
+Loads synthetic graphs with DepsGraphBuilder, as "conan install" does, from recipes with
+settings, options and requirements, in layers of --width packages, every one requiring --deps
+packages of the previous layer. Reports the time, the tracemalloc peak and the memory and
+blocks still allocated by the model objects (conans/model) when the graph is loaded:
+
+    python -m conans.test.performance.model_memory --nodes 1000 --width 50 --deps 3
+
+conans/test/model/model_memory_test.py runs it with a small graph.
+"""
+import argparse
+import fnmatch
+import os
+import time
+import tracemalloc
+
+from conans.client.conf import default_settings_yml
+from conans.client.deps_builder import DepsGraphBuilder
+from conans.client.loader import ConanFileLoader
+from conans.model.profile import Profile
+from conans.model.settings import Settings
+from conans.model.values import Values
+from conans.paths import CONANFILE
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+from conans.util.files import save
+
+_recipe = """from conans import ConanFile
+class Pkg(ConanFile):
+    name = "%s"
+    version = "1.0"
+    settings = "os", "compiler", "build_type", "arch"
+    options = {"shared": [True, False], "fPIC": [True, False]}
+    default_options = "shared=False", "fPIC=True"
+    requires = %s
+"""
+
+_settings = """os=Linux
+arch=x86_64
+compiler=gcc
+compiler.version=6.3
+compiler.libcxx=libstdc++11
+build_type=Release
+"""
+
+
+class _Retriever(object):
+    def __init__(self, folder):
+        self._folder = folder
+
+    def get_recipe(self, conan_reference):
+        return os.path.join(self._folder, "/".join(conan_reference), CONANFILE)
+
+
+class _Resolver(object):
+    def resolve(self, require, conan_reference):
+        return
+
+
+def _save_recipes(folder, nodes, width, deps):
+    """ Saves the recipes of the graph, returns the references of the last layer
+    """
+    layer = []
+    for node in range(nodes):
+        if node % width == 0:
+            previous, layer = layer, []
+        requires = ["Pkg%d/1.0@user/testing" % previous[(node + i) % len(previous)]
+                    for i in range(min(deps, len(previous)))]
+        save(os.path.join(folder, "Pkg%d" % node, "1.0", "user", "testing", CONANFILE),
+             _recipe % ("Pkg%d" % node, tuple(sorted(set(requires)))))
+        layer.append(node)
+    return ["Pkg%d/1.0@user/testing" % node for node in layer]
+
+
+def _model_memory(snapshot):
+    """ (bytes, blocks) allocated from conans/model files
+    """
+    size = blocks = 0
+    for stat in snapshot.statistics("filename"):
+        filename = stat.traceback[0].filename.replace("\\", "/")
+        if fnmatch.fnmatch(filename, "*/conans/model/*"):
+            size += stat.size
+            blocks += stat.count
+    return size, blocks
+
+
+def run(nodes, width, deps):
+    """ Loads the synthetic graph, returns a dict with the measures
+    """
+    folder = temp_folder()
+    last_layer = _save_recipes(folder, nodes, width, deps)
+    root_path = os.path.join(folder, "root", CONANFILE)
+    save(root_path, "[requires]\n%s" % "\n".join(last_layer))
+
+    output = TestBufferConanOutput()
+    settings = Settings.loads(default_settings_yml)
+    settings.values = Values.loads(_settings)
+    loader = ConanFileLoader(None, settings, Profile())
+    builder = DepsGraphBuilder(_Retriever(folder), output, loader, _Resolver())
+
+    tracemalloc.start()
+    try:
+        t1 = time.time()
+        root = loader.load_conan_txt(root_path, output)
+        graph = builder.load(root)
+        duration = time.time() - t1
+        _, peak = tracemalloc.get_traced_memory()
+        model_size, model_blocks = _model_memory(tracemalloc.take_snapshot())
+    finally:
+        tracemalloc.stop()
+    if len(graph.nodes) != nodes + 1:
+        raise Exception("Wrong graph: %d nodes" % len(graph.nodes))
+    requires = sum(len(node.conanfile.info.requires.refs()) for node in graph.nodes
+                   if node.conan_ref)
+    return {"nodes": nodes,
+            "requires": requires,
+            "time": duration,
+            "peak": peak,
+            "model_size": model_size,
+            "model_blocks": model_blocks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="graph loading memory benchmark")
+    parser.add_argument("--nodes", type=int, default=1000, help="packages in the graph")
+    parser.add_argument("--width", type=int, default=50, help="packages of every layer")
+    parser.add_argument("--deps", type=int, default=3,
+                        help="requirements of every package in the previous layer")
+    args = parser.parse_args()
+    result = run(args.nodes, args.width, args.deps)
+    print("%d nodes, %d requirements info: %.2f s, peak %.1f MB, model objects %.1f MB "
+          "in %d blocks (%d bytes, %.1f blocks per requirement info)"
+          % (result["nodes"], result["requires"], result["time"], result["peak"] / 1e6,
+             result["model_size"] / 1e6, result["model_blocks"],
+             result["model_size"] // max(result["requires"], 1),
+             result["model_blocks"] / float(max(result["requires"], 1))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+""" NOT really a test, but a load-test harness for conan_server
+FILE name is not "test" so it will not run under unit testing
+
+Launches a local conan_server with the given backend and drives N parallel clients against
+it, each one uploading a recipe file, getting its snapshot and download urls and downloading
+it back. Reports the requests/s and the latencies (p50, p90, p99, max) per operation:
+
+    python -m conans.test.performance.server_load --backend threaded --clients 16
+    python -m conans.test.performance.server_load --backend prefork --workers 4 --size 10240
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+from conans import __version__ as SERVER_VERSION
+from conans.model.version import Version
+from conans.server.conf import MIN_CLIENT_COMPATIBLE_VERSION
+from conans.test.server.utils.server_launcher import TestServerLauncher, free_port
+from conans.test.utils.test_files import temp_folder
+
+USER = "load"
+PASSWORD = "load"
+
+
+def _run_server(port, backend, workers):
+    TestServerLauncher.port = port
+    launcher = TestServerLauncher(base_path=temp_folder(),
+                                  read_permissions=[("*/*@*/*", "*")],
+                                  write_permissions=[("*/*@*/*", "*")],
+                                  users={USER: PASSWORD},
+                                  base_url="http://localhost:%d/v1" % port,
+                                  server_version=Version(SERVER_VERSION),
+                                  min_client_compatible_version=Version(
+                                      MIN_CLIENT_COMPATIBLE_VERSION))
+    options = {"workers": workers} if backend in ("prefork", "gunicorn") else {}
+    launcher.ra.run(host="localhost", server=backend, quiet=True, **options)
+
+
+class _Client(object):
+
+    def __init__(self, url, index, requests_number, payload, stats):
+        self._url = url
+        self._index = index
+        self._requests_number = requests_number
+        self._payload = payload
+        self._stats = stats
+        self._session = requests.Session()
+
+    def _timed(self, operation, method, url, **kwargs):
+        t1 = time.time()
+        response = self._session.request(method, url, **kwargs)
+        self._stats[operation].append(time.time() - t1)
+        if response.status_code != 200:
+            raise Exception("%s failed %s: %s" % (operation, response.status_code,
+                                                  response.content))
+        return response
+
+    def run(self):
+        token = self._timed("authenticate", "GET", self._url + "/users/authenticate",
+                            auth=(USER, PASSWORD)).text
+        self._session.headers["Authorization"] = "Bearer %s" % token
+        for i in range(self._requests_number):
+            ref_url = "%s/conans/Load%d/1.%d/%s/testing" % (self._url, self._index, i, USER)
+            urls = self._timed("upload_urls", "POST", ref_url + "/upload_urls",
+                               data=json.dumps({"conan_export.tgz": len(self._payload)})).json()
+            self._timed("upload", "PUT", urls["conan_export.tgz"], data=self._payload)
+            self._timed("snapshot", "GET", ref_url)
+            urls = self._timed("download_urls", "GET", ref_url + "/download_urls").json()
+            content = self._timed("download", "GET", urls["conan_export.tgz"]).content
+            if content != self._payload:
+                raise Exception("Downloaded file doesn't match the uploaded one")
+
+
+def _percentile(values, percent):
+    index = min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def run_load(backend, workers, clients, requests_number, size_kb):
+    port = free_port()
+    server = multiprocessing.Process(target=_run_server, args=(port, backend, workers))
+    server.daemon = True
+    server.start()
+    url = "http://localhost:%d/v1" % port
+    try:
+        for _ in range(100):
+            try:
+                requests.get(url + "/ping", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+
+        payload = os.urandom(size_kb * 1024)
+        stats = defaultdict(list)  # list.append is thread safe
+        errors = []
+
+        def client_run(index):
+            try:
+                _Client(url, index, requests_number, payload, stats).run()
+            except Exception as exc:
+                errors.append(str(exc))
+
+        threads = [threading.Thread(target=client_run, args=(i, )) for i in range(clients)]
+        t1 = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - t1
+    finally:
+        server.terminate()
+        server.join()
+
+    total = sum(len(values) for values in stats.values())
+    print("Backend: %s, clients: %d, requests per client: %d, file size: %d KB"
+          % (backend, clients, requests_number, size_kb))
+    print("%d requests in %.2f s: %.1f requests/s, %d errors"
+          % (total, elapsed, total / elapsed, len(errors)))
+    print("%-15s %8s %10s %10s %10s %10s" % ("operation", "count", "p50 ms", "p90 ms",
+                                              "p99 ms", "max ms"))
+    for operation, values in sorted(stats.items()):
+        values = sorted(values)
+        print("%-15s %8d %10.1f %10.1f %10.1f %10.1f"
+              % (operation, len(values), _percentile(values, 50) * 1000,
+                 _percentile(values, 90) * 1000, _percentile(values, 99) * 1000,
+                 values[-1] * 1000))
+    for error in errors[:10]:
+        print("ERROR: %s" % error)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="conan_server load test")
+    parser.add_argument("--backend", default="threaded",
+                        help="server backend: threaded, prefork, wsgiref, waitress...")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(),
+                        help="worker processes for prefork backend")
+    parser.add_argument("--clients", type=int, default=8, help="parallel clients")
+    parser.add_argument("--requests", type=int, default=20,
+                        help="upload/download cycles per client")
+    parser.add_argument("--size", type=int, default=1024, help="uploaded file size in KB")
+    args = parser.parse_args()
+    run_load(args.backend, args.workers, args.clients, args.requests, args.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,22 @@
 import unittest
+from conans.client.rest.metadata_store import MetadataStore
 from conans.client.rest.rest_client import RestApiClient
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.test.utils.test_files import hello_source_files
-from conans.paths import CONANFILE, CONAN_MANIFEST, CONANINFO
+from conans.paths import CONANFILE, CONAN_MANIFEST, CONANINFO, PACKAGE_TGZ_NAME
 from conans.model.info import ConanInfo
 from conans.test.server.utils.server_launcher import TestServerLauncher
 import requests
 from conans.test.utils.test_files import temp_folder
 from conans.model.version import Version
 from conans.server.rest.bottle_plugins.version_checker import VersionCheckerPlugin
+from conans.server.store import disk_adapter
 import platform
 import os
-from conans.util.files import md5, save
+import tarfile
+from mock import patch
+from io import BytesIO
+from conans.util.files import md5, save, load
 from conans.model.manifest import FileTreeManifest
 from nose.plugins.attrib import attr
 from conans.test.utils.tools import TestBufferConanOutput
@@ -116,6 +121,102 @@ class RestApiTest(unittest.TestCase):
         self.assertIsInstance(info, ConanInfo)
         self.assertEquals(info, ConanInfo.loads(conan_info))
 
+    def conditional_digest_test(self):
+        conan_reference = ConanFileReference.loads("conan5/1.0.0@private_user/testing")
+        self._upload_recipe(conan_reference)
+
+        statuses = []
+
+        class Requester(object):
+            def get(self, url, **kwargs):
+                ret = requests.get(url, **kwargs)
+                statuses.append(ret.status_code)
+                return ret
+
+        api = RestApiClient(TestBufferConanOutput(), requester=Requester(),
+                            metadata_store=MetadataStore(temp_folder()))
+        api.remote_url = self.api.remote_url
+        api.token = self.api.token
+        expected = self.api.get_conan_digest(conan_reference)
+        for _ in range(2):
+            digest = api.get_conan_digest(conan_reference)
+            self.assertEquals(digest.summary_hash, expected.summary_hash)
+        # The second manifest download is not modified
+        self.assertEquals(statuses, [200, 200, 200, 304])
+
+        # The snapshot has ETag too
+        url = "%s/v1/conans/%s" % (api.remote_url, "/".join(conan_reference))
+        response = requests.get(url, auth=api.auth)
+        self.assertEquals(response.status_code, 200)
+        response = requests.get(url, auth=api.auth,
+                                headers={"If-None-Match": response.headers["ETag"]})
+        self.assertEquals(response.status_code, 304)
+
+    def download_etag_no_checksum_test(self):
+        conan_reference = ConanFileReference.loads("conan6/1.0.0@private_user/testing")
+        self._upload_recipe(conan_reference)
+        url = "%s/v1/conans/%s/download_urls" % (self.api.remote_url, "/".join(conan_reference))
+        urls = requests.get(url, auth=self.api.auth).json()
+        export = self.server.file_manager.paths.export(conan_reference)
+        for name in os.listdir(export):
+            if name.endswith(".conan_md5"):
+                os.remove(os.path.join(export, name))
+        files = sorted(os.listdir(export))
+
+        response = requests.get(urls[CONAN_MANIFEST])
+        self.assertEquals(response.status_code, 200)
+        manifest_md5 = md5(load(os.path.join(export, CONAN_MANIFEST)))
+        self.assertEquals(response.headers["ETag"], '"%s"' % manifest_md5)
+        # The downloads never write in the store, that can be read-only
+        self.assertEquals(sorted(os.listdir(export)), files)
+
+        # Other files are never hashed only for the ETag, as big package tgz files
+        with patch.object(disk_adapter, "md5sum") as md5sum:
+            response = requests.get(urls[CONANFILE])
+        self.assertEquals(response.status_code, 200)
+        self.assertNotIn("ETag", response.headers)
+        self.assertFalse(md5sum.called)
+
+    def package_files_links_test(self):
+        if platform.system() == "Windows":
+            return
+        secret = os.path.join(temp_folder(), "secret.txt")
+        save(secret, "SECRET")
+        conan_reference = ConanFileReference.loads("conan7/1.0.0@private_user/testing")
+        self._upload_recipe(conan_reference)
+        package_reference = PackageReference(conan_reference, "1F23223EFDA")
+        tgz_path = os.path.join(temp_folder(), PACKAGE_TGZ_NAME)
+        with tarfile.open(tgz_path, "w:gz") as tgz:
+            info = tarfile.TarInfo("evil")
+            info.type, info.linkname = tarfile.SYMTYPE, secret
+            tgz.addfile(info)
+            info = tarfile.TarInfo("hard_evil")
+            info.type, info.linkname = tarfile.LNKTYPE, secret
+            tgz.addfile(info)
+            info = tarfile.TarInfo("include/hello.h")
+            info.size = 5
+            tgz.addfile(info, BytesIO(b"Hello"))
+        self._upload_package(package_reference, {PACKAGE_TGZ_NAME: load(tgz_path, binary=True)})
+
+        url = "%s/v1/conans/%s/packages/%s/file_urls" % (self.api.remote_url,
+                                                         "/".join(conan_reference),
+                                                         package_reference.package_id)
+        files = ["evil", "hard_evil", "include/hello.h"]
+        urls = requests.post(url, json={"files": files}, auth=self.api.auth).json()
+        self.assertEquals(list(urls), ["include/hello.h"])
+        self.assertEquals(requests.get(urls["include/hello.h"]).content, b"Hello")
+
+        # Never served, even with a signed url
+        package_files = self.server.file_manager._package_files(package_reference)
+        folder = os.path.join(package_files, os.listdir(package_files)[0])
+        self.assertEquals(sorted(os.listdir(folder)), ["include"])
+        link = os.path.join(folder, "link.h")
+        os.symlink(secret, link)
+        adapter = self.server.file_manager._storage_adapter
+        response = requests.get(adapter.get_download_urls([link])[link])
+        self.assertEquals(response.status_code, 404)
+        self.assertNotIn(b"SECRET", response.content)
+
     def upload_huge_conan_test(self):
         if platform.system() != "Windows":
             # Upload a conans
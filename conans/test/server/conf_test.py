@@ -100,3 +100,25 @@ text=value
         self.assertEquals(config.read_permissions, [("*/*@*/*", "*"),
                                                     ("openssl/2.0.1@lasote/testing", "pepe")])
         self.assertEquals(config.users, {"lasote": "lasotepass", "pepe2": "pepepass2"})
+
+    def test_server_backend(self):
+        # Not defined in the file, threaded by default
+        config = ConanServerConfigParser(self.file_path, environment=self.environ)
+        self.assertEquals(config.server_backend, "threaded")
+        self.assertGreaterEqual(config.server_workers, 1)
+
+        server_conf = os.path.join(self.file_path, '.conan_server/server.conf')
+        save(server_conf, fileconfig.replace("port: 9220",
+                                             "port: 9220\nserver_backend: prefork\n"
+                                             "server_workers: 3")
+             % self.storage_path)
+        config = ConanServerConfigParser(self.file_path, environment=self.environ)
+        self.assertEquals(config.server_backend, "prefork")
+        self.assertEquals(config.server_workers, 3)
+
+        self.environ["CONAN_SERVER_BACKEND"] = "wsgiref"
+        self.environ["CONAN_SERVER_WORKERS"] = "0"
+        config = ConanServerConfigParser(self.file_path, environment=self.environ)
+        self.assertEquals(config.server_backend, "wsgiref")
+        with self.assertRaisesRegexp(ConanException, "'server_workers' has to be a positive"):
+            config.server_workers
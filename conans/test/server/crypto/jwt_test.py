@@ -5,6 +5,9 @@ from datetime import timedelta
 import time
 import jwt
 from jwt import DecodeError
+from bottle import HTTPResponse
+from mock import patch
+from conans.server.rest.bottle_plugins.jwt_authentication import JWTAuthentication
 
 
 class JwtTest(unittest.TestCase):
@@ -36,3 +39,21 @@ class JwtTest(unittest.TestCase):
         token = manager.get_token_for("lasote")
         self.assertEquals(manager.get_user(token), "lasote")
         self.assertRaises(DecodeError, manager.get_user, "invalid_user")
+
+    def jwt_authentication_cache_test(self):
+        manager = JWTCredentialsManager(self.secret, self.expire_time)
+        plugin = JWTAuthentication(manager)
+        token = manager.get_token_for("lasote")
+        with patch.object(manager, "get_profile", wraps=manager.get_profile) as get_profile:
+            self.assertEquals(plugin.parse_authorization_value(token), {"auth_user": "lasote"})
+            self.assertEquals(plugin.parse_authorization_value(token), {"auth_user": "lasote"})
+            self.assertEquals(get_profile.call_count, 1)
+
+            # Expired tokens are decoded again, and fail
+            time.sleep(2)
+            with self.assertRaises(HTTPResponse):
+                plugin.parse_authorization_value(token)
+            self.assertEquals(get_profile.call_count, 2)
+
+        with self.assertRaises(HTTPResponse):
+            plugin.parse_authorization_value("invalid_token")
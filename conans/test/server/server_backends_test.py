@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+import unittest
+
+import bottle
+import requests
+from mock import patch
+
+from conans.test.server.utils.server_launcher import free_port
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+from conans.server.rest.server_backends import ThreadedWSGIRefServer, get_server_backend,\
+    PreforkWSGIRefServer
+
+
+def _start(app):
+    port = free_port()
+    server = threading.Thread(target=bottle.run,
+                              kwargs={"app": app, "server": ThreadedWSGIRefServer,
+                                      "host": "localhost", "port": port, "quiet": True})
+    server.daemon = True
+    server.start()
+    url = "http://localhost:%d" % port
+    for _ in range(50):
+        try:
+            requests.get(url + "/ping", timeout=1)
+            break
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    return url
+
+
+class ServerBackendsTest(unittest.TestCase):
+
+    def test_get_server_backend(self):
+        self.assertIs(get_server_backend("threaded"), ThreadedWSGIRefServer)
+        self.assertIs(get_server_backend("prefork"), PreforkWSGIRefServer)
+        # Bottle servers are passed through
+        self.assertEqual(get_server_backend("wsgiref"), "wsgiref")
+        self.assertEqual(get_server_backend("waitress"), "waitress")
+
+    def test_threaded_slow_request_does_not_block(self):
+        release = threading.Event()
+        app = bottle.Bottle()
+
+        @app.route("/slow")
+        def slow():
+            release.wait(10)
+            return "slow"
+
+        @app.route("/fast")
+        def fast():
+            return "fast"
+
+        url = _start(app)
+        slow_result = []
+        slow_client = threading.Thread(target=lambda: slow_result.append(
+            requests.get(url + "/slow", timeout=10).text))
+        slow_client.start()
+        try:
+            # The slow request is still being served, the fast one has to be answered
+            self.assertEqual(requests.get(url + "/fast", timeout=5).text, "fast")
+            self.assertEqual(slow_result, [])
+        finally:
+            release.set()
+            slow_client.join()
+        self.assertEqual(slow_result, ["slow"])
+
+    @unittest.skipUnless(hasattr(os, "sendfile"), "Requires os.sendfile")
+    def test_static_file_sendfile(self):
+        folder = temp_folder()
+        content = os.urandom(3 * 1024 * 1024 + 17)
+        save(os.path.join(folder, "file.bin"), content)
+        app = bottle.Bottle()
+
+        @app.route("/file")
+        def get_file():
+            return bottle.static_file("file.bin", root=folder)
+
+        url = _start(app)
+        with patch("os.sendfile", wraps=os.sendfile) as sendfile:
+            response = requests.get(url + "/file", timeout=10)
+        self.assertEqual(response.content, content)
+        self.assertEqual(response.headers["Content-Length"], str(len(content)))
+        self.assertTrue(sendfile.called)
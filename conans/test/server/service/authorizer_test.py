@@ -192,3 +192,39 @@ class AuthorizerTest(unittest.TestCase):
         for u in ['user1','user2','user3']:
             authorizer.check_read_conan(u, self.openssl_ref)
 
+
+    def rules_order_and_cache_test(self):
+        """The first rule that applies decides, whatever its wildcards, and
+        the decisions are cached"""
+        zlib_ref = ConanFileReference.loads("zlib/1.2.11@lasote/testing")
+        read_perms = [("*/*@lasote/testing", "pepe"),
+                      ("openssl/*@*/*", "juan"),
+                      ("openssl/2.0.2@lasote/*", "juan, pepe"),
+                      ("*/*@*/*", "?")]
+        authorizer = BasicAuthorizer(read_perms, [])
+        for _ in range(2):  # Second time from the cache
+            authorizer.check_read_conan("pepe", self.openssl_ref)
+            authorizer.check_read_conan("pepe", self.openssl_ref2)
+            authorizer.check_read_conan("pepe", zlib_ref)
+            self.assertRaises(ForbiddenException,
+                              authorizer.check_read_conan, "juan", self.openssl_ref)
+            self.assertRaises(ForbiddenException,
+                              authorizer.check_read_conan, "juan", zlib_ref)
+            self.assertRaises(AuthenticationException,
+                              authorizer.check_read_conan, None, zlib_ref)
+
+        other_ref = ConanFileReference.loads("openssl/2.0.2@other/stable")
+        authorizer.check_read_conan("juan", other_ref)
+        self.assertRaises(ForbiddenException,
+                          authorizer.check_read_conan, "pepe", other_ref)
+        other_ref = ConanFileReference.loads("zlib/1.2.11@other/stable")
+        authorizer.check_read_conan("pepe", other_ref)
+        self.assertRaises(AuthenticationException,
+                          authorizer.check_read_conan, None, other_ref)
+
+        # Invalid rules only raise when they are reached
+        read_perms = [("openssl/*@lasote/*", "pepe"), ("invalid", "pepe")]
+        authorizer = BasicAuthorizer(read_perms, [])
+        authorizer.check_read_conan("pepe", self.openssl_ref)
+        self.assertRaises(InternalErrorException,
+                          authorizer.check_read_conan, "pepe", zlib_ref)
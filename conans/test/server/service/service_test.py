@@ -1,12 +1,15 @@
 import unittest
+from io import BytesIO
+
+from mock import patch
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.service.service import ConanService, FileUploadDownloadService,\
-    SearchService
+    SearchService, SearchPagesCache
 from conans.paths import CONAN_MANIFEST, CONANINFO, SimplePaths
 from conans.util.files import save_files, save, mkdir, load, md5sum
 from conans.server.service.authorize import BasicAuthorizer
 import os
-from conans.errors import NotFoundException, RequestErrorException
+from conans.errors import NotFoundException, RequestErrorException, ForbiddenException
 from conans.test.utils.test_files import hello_source_files
 from conans.server.store.file_manager import FileManager
 from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
@@ -18,16 +21,6 @@ from conans.server.store.disk_adapter import ServerDiskAdapter
 from conans.search.search import DiskSearchManager, DiskSearchAdapter
 
 
-class MockFileSaver(object):
-
-    def __init__(self, filename, content):
-        self.filename = filename
-        self.content = content
-
-    def save(self, abspath):
-        save(os.path.join(abspath, self.filename), self.content)
-
-
 class FileUploadDownloadServiceTest(unittest.TestCase):
 
     def setUp(self):
@@ -62,15 +55,57 @@ class FileUploadDownloadServiceTest(unittest.TestCase):
         token = self.updown_auth_manager.get_token_for(self.relative_file_path,
                                                        "pepe", len(self.content))
 
-        file_saver = MockFileSaver("thefile.txt", self.content)
         self.assertFalse(os.path.exists(self.absolute_file_path))
-        self.service.put_file(file_saver, self.absolute_file_path, token, len(self.content))
+        self.service.put_file(BytesIO(self.content.encode()), self.absolute_file_path, token,
+                              len(self.content))
 
         self.assertTrue(os.path.exists(self.absolute_file_path))
+        self.assertEqual(load(self.absolute_file_path), self.content)
+        # No temporary upload file left behind, the snapshot uses the md5 computed uploading
+        self.assertEqual(sorted(os.listdir(self.disk_path)),
+                         ["thefile.txt", "thefile.txt.conan_md5"])
+        adapter = ServerDiskAdapter("url", self.storage_dir, self.updown_auth_manager)
+        self.assertEqual(adapter.get_snapshot(self.disk_path),
+                         {self.absolute_file_path: md5sum(self.absolute_file_path)})
 
         # Raises if wrong size
-        self.assertRaises(RequestErrorException, self.service.put_file, file_saver,
-                          self.absolute_file_path, token, len(self.content) + 1)
+        self.assertRaises(RequestErrorException, self.service.put_file,
+                          BytesIO(self.content.encode()), self.absolute_file_path, token,
+                          len(self.content) + 1)
+
+    def test_file_upload_incomplete(self):
+        token = self.updown_auth_manager.get_token_for(self.relative_file_path,
+                                                       "pepe", len(self.content))
+        save(self.absolute_file_path, "previous content")
+        # The connection is closed before sending all the declared bytes
+        self.assertRaises(RequestErrorException, self.service.put_file,
+                          BytesIO(self.content[:-2].encode()), self.absolute_file_path, token,
+                          len(self.content))
+        # The previous file is untouched and no temporary file left
+        self.assertEqual(load(self.absolute_file_path), "previous content")
+        self.assertEqual(os.listdir(self.disk_path), ["thefile.txt"])
+
+    def test_snapshot_checksum_modified_file(self):
+        adapter = ServerDiskAdapter("url", self.storage_dir, self.updown_auth_manager)
+        save(self.absolute_file_path, self.content)
+        snapshot = adapter.get_snapshot(self.disk_path)
+        self.assertEqual(snapshot, {self.absolute_file_path: md5sum(self.absolute_file_path)})
+
+        # Modified out of the server, the stored checksum is discarded
+        save(self.absolute_file_path, "other content, other size")
+        snapshot = adapter.get_snapshot(self.disk_path)
+        self.assertEqual(snapshot, {self.absolute_file_path: md5sum(self.absolute_file_path)})
+
+    def test_snapshot_checksum_read_only(self):
+        adapter = ServerDiskAdapter("url", self.storage_dir, self.updown_auth_manager)
+        save(self.absolute_file_path, self.content)
+        # The checksum cannot be stored, as in a read-only store
+        with patch("conans.server.store.disk_adapter.replace_file",
+                   side_effect=OSError("Read-only file system")):
+            snapshot = adapter.get_snapshot(self.disk_path)
+        self.assertEqual(snapshot, {self.absolute_file_path: md5sum(self.absolute_file_path)})
+        self.assertEqual(os.listdir(os.path.dirname(self.absolute_file_path)),
+                         [os.path.basename(self.absolute_file_path)])
 
 
 class ConanServiceTest(unittest.TestCase):
@@ -222,6 +257,50 @@ class ConanServiceTest(unittest.TestCase):
                                                 'settings': {},
                                                 'recipe_hash': None}})
 
+    def test_search_pages(self):
+        refs = [ConanFileReference("lib%d" % i, "1.0", "lasote", "stable") for i in range(5)]
+        for ref in refs:
+            save_files(self.paths.export(ref), {"dummy.txt": "//"})
+            for package_id in ("1", "2", "3"):
+                save_files(self.paths.package(PackageReference(ref, package_id)),
+                           {CONANINFO: "[options]\n    shared=True"})
+        read_perms = [("*/*@*/*", "*")]
+        search_service = SearchService(BasicAuthorizer(read_perms, []), self.search_manager,
+                                       "lasote", SearchPagesCache())
+
+        with patch.object(self.search_manager, "search",
+                          wraps=self.search_manager.search) as search:
+            references, after = search_service.search_page("lib*", limit=2)
+            self.assertEqual(references, refs[:2])
+            pages = [references]
+            while after:
+                references, after = search_service.search_page("lib*", after=after, limit=2)
+                pages.append(references)
+            self.assertEqual(pages, [refs[:2], refs[2:4], refs[4:]])
+            # The next pages do not search again
+            self.assertEqual(search.call_count, 1)
+            # An unknown cursor searches again
+            references, _ = search_service.search_page("lib*", after=str(refs[0]), limit=3)
+            self.assertEqual(references, refs[1:4])
+            self.assertEqual(search.call_count, 2)
+
+        with patch.object(self.search_manager, "search_packages",
+                          wraps=self.search_manager.search_packages) as search_packages:
+            info, after = search_service.search_packages_page(refs[0], None, limit=2)
+            self.assertEqual(sorted(info), ["1", "2"])
+            info, after = search_service.search_packages_page(refs[0], None, after=after,
+                                                              limit=2)
+            self.assertEqual(sorted(info), ["3"])
+            self.assertIsNone(after)
+            self.assertEqual(search_packages.call_count, 1)
+
+        # Never served to the users that cannot read the reference
+        other_service = SearchService(BasicAuthorizer([], []), self.search_manager, "other",
+                                      search_service._pages_cache)
+        _, after = search_service.search_packages_page(refs[1], None, limit=2)
+        with self.assertRaises(ForbiddenException):
+            other_service.search_packages_page(refs[1], None, after=after, limit=2)
+
     def remove_test(self):
         conan_ref2 = ConanFileReference("OpenCV", "3.0", "lasote", "stable")
         conan_ref3 = ConanFileReference("Assimp", "1.10", "lasote", "stable")
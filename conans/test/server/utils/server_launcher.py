@@ -13,6 +13,7 @@ from conans.search.search import DiskSearchAdapter, DiskSearchManager
 from conans.paths import SimplePaths
 import time
 import shutil
+import socket
 from conans import SERVER_CAPABILITIES
 
 
@@ -20,6 +21,16 @@ TESTING_REMOTE_PRIVATE_USER = "private_user"
 TESTING_REMOTE_PRIVATE_PASS = "private_pass"
 
 
+def free_port():
+    """ A local port not used now, for the servers launched by the tests
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("localhost", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
 class TestServerLauncher(object):
     port = 0
 
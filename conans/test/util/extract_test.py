@@ -0,0 +1,89 @@
+import io
+import os
+import platform
+import tarfile
+import unittest
+import zipfile
+
+from conans.test.utils.test_files import temp_folder
+from conans.util.extract import extract_zip, extract_tar
+from conans.util.files import save, load
+
+
+class ExtractTest(unittest.TestCase):
+
+    def zip_test(self):
+        tmp_dir = temp_folder()
+        zip_path = os.path.join(tmp_dir, "example.zip")
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for i in range(100):
+                zipf.writestr("src/folder%d/file%d.txt" % (i % 7, i), "contents %d" % i)
+            zipf.writestr("empty/", "")
+            zipf.writestr("../outside.txt", "outside")
+
+        output_dir = os.path.join(tmp_dir, "output")
+        extracted = []
+        extract_zip(zip_path, output_dir, progress=extracted.append, threads=4)
+        self.assertEqual(len(extracted), 101)
+        for i in range(100):
+            self.assertEqual(load(os.path.join(output_dir, "src/folder%d/file%d.txt"
+                                               % (i % 7, i))), "contents %d" % i)
+        self.assertTrue(os.path.isdir(os.path.join(output_dir, "empty")))
+        # As ZipFile.extract(), the parent folder references are removed
+        self.assertEqual(load(os.path.join(output_dir, "outside.txt")), "outside")
+        self.assertFalse(os.path.exists(os.path.join(tmp_dir, "outside.txt")))
+
+    def tar_stream_test(self):
+        tmp_dir = temp_folder()
+        save(os.path.join(tmp_dir, "src", "file.txt"), "contents")
+        save(os.path.join(tmp_dir, "outside.txt"), "outside")
+        evil = os.path.join(temp_folder(), "evil.txt")
+        save(evil, "evil")
+        tar_path = os.path.join(tmp_dir, "example.tgz")
+        with tarfile.open(tar_path, "w:gz") as tgz:
+            tgz.add(os.path.join(tmp_dir, "src"), "src")
+            tgz.add(evil, "../outside.txt")
+            tgz.add(os.path.join(tmp_dir, "src", "file.txt"), "src/hardlink.txt")
+
+        output_dir = os.path.join(tmp_dir, "output")
+        # Not seekable, as a download
+        stream = io.BufferedReader(io.FileIO(tar_path))
+        stream.seekable = lambda: False
+        extract_tar(destination=output_dir, fileobj=stream)
+        self.assertEqual(load(os.path.join(output_dir, "src", "file.txt")), "contents")
+        self.assertEqual(load(os.path.join(output_dir, "src", "hardlink.txt")), "contents")
+        self.assertEqual(sorted(os.listdir(output_dir)), ["src"])
+        self.assertEqual(load(os.path.join(tmp_dir, "outside.txt")), "outside")
+
+    def tar_stream_formats_test(self):
+        tmp_dir = temp_folder()
+        save(os.path.join(tmp_dir, "src", "file.txt"), "contents")
+        for ext, mode in (("tar", "w"), ("tgz", "w:gz"), ("tar.bz2", "w:bz2"),
+                          ("tar.xz", "w:xz")):
+            tar_path = os.path.join(tmp_dir, "example.%s" % ext)
+            with tarfile.open(tar_path, mode) as tgz:
+                tgz.add(os.path.join(tmp_dir, "src"), "src")
+            output_dir = os.path.join(tmp_dir, "output_%s" % ext)
+            with open(tar_path, "rb") as stream:
+                extract_tar(destination=output_dir, fileobj=stream)
+            self.assertEqual(load(os.path.join(output_dir, "src", "file.txt")), "contents")
+
+    def tar_symlink_test(self):
+        if platform.system() == "Windows":
+            return
+        tmp_dir = temp_folder()
+        outside = temp_folder()
+        evil = os.path.join(temp_folder(), "evil.txt")
+        save(evil, "evil")
+        tar_path = os.path.join(tmp_dir, "example.tgz")
+        with tarfile.open(tar_path, "w:gz") as tgz:
+            link = tarfile.TarInfo("link")
+            link.type = tarfile.SYMTYPE
+            link.linkname = outside
+            tgz.addfile(link)
+            tgz.add(evil, "link/evil.txt")
+
+        output_dir = os.path.join(tmp_dir, "output")
+        extract_tar(tar_path, output_dir)
+        self.assertTrue(os.path.islink(os.path.join(output_dir, "link")))
+        self.assertEqual(os.listdir(outside), [])
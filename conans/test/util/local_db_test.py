@@ -1,6 +1,7 @@
 import unittest
 from conans.client.store.localdb import LocalDB
 import os
+from multiprocessing.pool import ThreadPool
 from conans.test.utils.test_files import temp_folder
 
 
@@ -22,3 +23,14 @@ class LocalStoreTest(unittest.TestCase):
         self.assertEquals("pepe", user)
         self.assertEquals("token", token)
         self.assertEquals("pepe", localdb.get_username("myurl1"))
+
+    def threads_test(self):
+        localdb = LocalDB(os.path.join(temp_folder(), "dbfile"))
+        localdb.set_login(("pepe", "token"), "myurl1")
+        pool = ThreadPool(4)
+        try:
+            logins = pool.map(lambda _: localdb.get_login("myurl1"), range(20))
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(logins, [("pepe", "token")] * 20)
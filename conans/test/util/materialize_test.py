@@ -0,0 +1,89 @@
+import os
+import stat
+import unittest
+
+from conans import tools
+from conans.errors import ConanException
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, load
+from conans.util.materialize import (materialize_file, materialize_mode, materialize_tree,
+                                     COPY, REFLINK, HARDLINK, SYMLINK)
+
+
+def _make_read_only(path):
+    os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+
+class MaterializeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.src = os.path.join(self.folder, "src", "file.txt")
+        save(self.src, "contents")
+
+    def mode_test(self):
+        with tools.environment_append({"CONAN_MATERIALIZE_MODE": ""}):
+            self.assertEqual(materialize_mode(), COPY)
+        with tools.environment_append({"CONAN_MATERIALIZE_MODE": "symlink"}):
+            self.assertEqual(materialize_mode(), SYMLINK)
+            self.assertEqual(materialize_mode(HARDLINK), HARDLINK)
+            self.assertEqual(materialize_mode(REFLINK), REFLINK)
+        with tools.environment_append({"CONAN_MATERIALIZE_MODE": "reflink"}):
+            self.assertEqual(materialize_mode(SYMLINK), REFLINK)
+        with tools.environment_append({"CONAN_MATERIALIZE_MODE": "softlink"}):
+            with self.assertRaisesRegexp(ConanException, "Invalid CONAN_MATERIALIZE_MODE"):
+                materialize_mode()
+
+    def writable_files_are_copied_test(self):
+        for mode in (COPY, REFLINK, HARDLINK, SYMLINK):
+            dst = os.path.join(self.folder, "dst_%s.txt" % mode)
+            materialize_file(self.src, dst, mode)
+            self.assertFalse(os.path.islink(dst))
+            self.assertNotEqual(os.stat(dst).st_ino, os.stat(self.src).st_ino)
+            save(dst, "modified")
+            self.assertEqual(load(self.src), "contents")
+
+    def hardlink_test(self):
+        _make_read_only(self.src)
+        dst = os.path.join(self.folder, "dst.txt")
+        materialize_file(self.src, dst, HARDLINK)
+        self.assertEqual(os.stat(dst).st_ino, os.stat(self.src).st_ino)
+        self.assertEqual(load(dst), "contents")
+
+        # Copying over the hardlink never writes through it
+        other = os.path.join(self.folder, "other.txt")
+        save(other, "other")
+        materialize_file(other, dst, COPY)
+        self.assertNotEqual(os.stat(dst).st_ino, os.stat(self.src).st_ino)
+        self.assertEqual(load(dst), "other")
+        self.assertEqual(load(self.src), "contents")
+
+    def symlink_test(self):
+        _make_read_only(self.src)
+        dst = os.path.join(self.folder, "dst.txt")
+        materialize_file(self.src, dst, SYMLINK)
+        self.assertTrue(os.path.islink(dst))
+        self.assertEqual(load(dst), "contents")
+
+        # Copying over the link never writes through it
+        other = os.path.join(self.folder, "other.txt")
+        save(other, "other")
+        materialize_file(other, dst, COPY)
+        self.assertFalse(os.path.islink(dst))
+        self.assertEqual(load(dst), "other")
+        self.assertEqual(load(self.src), "contents")
+
+    def tree_test(self):
+        save(os.path.join(self.folder, "src", "sub", "writable.txt"), "writable")
+        save(os.path.join(self.folder, "src", "ignored"), "")
+        _make_read_only(self.src)
+        for mode in (COPY, REFLINK, HARDLINK, SYMLINK):
+            dst = os.path.join(self.folder, "tree_%s" % mode)
+            with tools.environment_append({"CONAN_MATERIALIZE_MODE": mode}):
+                materialize_tree(os.path.join(self.folder, "src"), dst, SYMLINK,
+                                 ignore=lambda _, names: [n for n in names if n == "ignored"])
+            self.assertEqual(sorted(os.listdir(dst)), ["file.txt", "sub"])
+            self.assertEqual(load(os.path.join(dst, "file.txt")), "contents")
+            self.assertEqual(load(os.path.join(dst, "sub", "writable.txt")), "writable")
+            self.assertFalse(os.path.islink(os.path.join(dst, "sub", "writable.txt")))
+            self.assertEqual(os.path.islink(os.path.join(dst, "file.txt")), mode == SYMLINK)
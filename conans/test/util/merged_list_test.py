@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from conans.util.merged_list import MergedList
+
+
+def merge_lists(seq1, seq2):
+    return [s for s in seq1 if s not in seq2] + seq2
+
+
+class MergedListTest(unittest.TestCase):
+
+    def basic_test(self):
+        merged = MergedList()
+        merged.merge(["a", "b", "c"])
+        merged.merge(["b", "d"])
+        self.assertEqual(merged.values(), ["a", "c", "b", "d"])
+
+        merged = MergedList(prepend=True)
+        merged.merge(["a", "b", "c"])
+        merged.merge(["b", "d"])
+        self.assertEqual(merged.values(), ["d", "a", "b", "c"])
+
+    def modified_values_test(self):
+        merged = MergedList()
+        merged.merge(["a", "b"])
+        merged.values().append("c")
+        merged.merge(["a"])
+        self.assertEqual(merged.values(), ["b", "c", "a"])
+        merged.set_values(["x", "y"])
+        merged.merge(["x", "z"])
+        self.assertEqual(merged.values(), ["y", "x", "z"])
+
+    def equivalent_to_merge_lists_test(self):
+        rand = random.Random(42)
+        for prepend in (False, True):
+            for _ in range(200):
+                merged = MergedList(prepend=prepend)
+                expected = []
+                for _ in range(rand.randint(1, 10)):
+                    # Repeated items too, merge_lists keeps them
+                    seq = [rand.choice("abcdefgh") for _ in range(rand.randint(0, 6))]
+                    merged.merge(seq)
+                    expected = merge_lists(seq, expected) if prepend else merge_lists(expected,
+                                                                                        seq)
+                    if rand.random() < 0.3:  # Reading the values in the middle is fine too
+                        self.assertEqual(merged.values(), expected)
+                self.assertEqual(merged.values(), expected)
@@ -24,6 +24,16 @@ class OutputTest(unittest.TestCase):
         self.assertIn("This is a very long line that ha ... esn't fit in the output terminal",
                       stream.getvalue())
 
+    def redirect_test(self):
+        stream, redirected = StringIO(), StringIO()
+        output = ConanOutput(stream)
+        with output.redirect(redirected):
+            output.info("Redirected")
+            self.assertIs(output.stream, redirected)
+        output.info("Restored")
+        self.assertEqual(redirected.getvalue(), "Redirected\n")
+        self.assertEqual(stream.getvalue(), "Restored\n")
+
     def error_test(self):
         client = TestClient()
         conanfile = """
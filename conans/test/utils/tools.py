@@ -2,6 +2,7 @@ import os
 import shlex
 import shutil
 import sys
+import threading
 import uuid
 from collections import Counter
 from contextlib import contextmanager
@@ -31,6 +32,7 @@ from conans.client.store.localdb import LocalDB
 from conans.client.userio import UserIO
 from conans.model.version import Version
 from conans.search.search import DiskSearchManager, DiskSearchAdapter
+from conans.server.service.upstream import UpstreamRemote
 from conans.test.server.utils.server_launcher import (TESTING_REMOTE_PRIVATE_USER,
                                                       TESTING_REMOTE_PRIVATE_PASS,
                                                       TestServerLauncher)
@@ -167,6 +169,34 @@ class TestRequester(object):
             headers.update(mock_request.headers)
 
 
+class ThreadedRequester(object):
+    """Calls the 'requester' methods in a new thread, for servers calling other servers
+    with a TestRequester, as the bottle request is a thread local global"""
+
+    def __init__(self, requester):
+        self._requester = requester
+
+    def __getattr__(self, name):
+        method = getattr(self._requester, name)
+
+        def call(*args, **kwargs):
+            result = []
+
+            def target():
+                try:
+                    result.append((method(*args, **kwargs), None))
+                except Exception as exc:
+                    result.append((None, exc))
+            thread = threading.Thread(target=target)
+            thread.start()
+            thread.join()
+            ret, exc = result[0]
+            if exc is not None:
+                raise exc
+            return ret
+        return call
+
+
 class TestServer(object):
     from conans import __version__ as SERVER_VERSION
     from conans.server.conf import MIN_CLIENT_COMPATIBLE_VERSION
@@ -175,12 +205,14 @@ class TestServer(object):
                  write_permissions=None, users=None, plugins=None, base_path=None,
                  server_version=Version(SERVER_VERSION),
                  min_client_compatible_version=Version(MIN_CLIENT_COMPATIBLE_VERSION),
-                 server_capabilities=None):
+                 server_capabilities=None, upstream=None):
         """
              'read_permissions' and 'write_permissions' is a list of:
                  [("opencv/2.3.4@lasote/testing", "user1, user2")]
 
              'users':  {username: plain-text-passwd}
+
+             'upstream': TestServer to fetch the missing recipes and packages from
         """
         # Unique identifier for this server, will be used by TestRequester
         # to determine where to call. Why? remote_manager just assing an url
@@ -202,6 +234,10 @@ class TestServer(object):
                                               server_version=server_version,
                                               min_client_compatible_version=min_client_ver,
                                               server_capabilities=server_capabilities)
+        if upstream:
+            self.test_server.ra.api_v1.upstream = UpstreamRemote(
+                upstream.fake_url, self.paths,
+                requester=ThreadedRequester(TestRequester({"upstream": upstream})))
         self.app = TestApp(self.test_server.ra.root_app)
 
     @property
@@ -396,7 +432,8 @@ class TestClient(object):
                                                  self.min_server_compatible_version, output)
 
         put_headers = self.client_cache.read_put_headers()
-        self.rest_api_client = RestApiClient(output, requester=self.requester, put_headers=put_headers)
+        self.rest_api_client = RestApiClient(output, requester=self.requester, put_headers=put_headers,
+                                             metadata_store=self.client_cache.metadata_store)
         # To store user and token
         self.localdb = LocalDB(self.client_cache.localdb)
         # Wraps RestApiClient to add authentication support (same interface)
@@ -0,0 +1,245 @@
+""" Archive extraction of tools.unzip() and tools.untargz()
+
+The zip members are decompressed in parallel, every thread with its own handle of the archive,
+after creating all the folders at once. The tar archives can only be read sequentially, but
+they can be extracted while they are read from a not seekable stream, as a download.
+Members outside the destination folder are never extracted.
+"""
+import multiprocessing
+import os
+import shutil
+import threading
+import zipfile
+from multiprocessing.pool import ThreadPool
+from os.path import abspath, realpath, join as joinpath
+
+import six
+
+EXTRACT_THREADS = 8  # zlib releases the GIL while decompressing, limited by the CPUs
+BUFFER_SIZE = 1024 * 1024
+CHUNK_MEMBERS = 16  # Members per task, most files of source archives are small
+
+
+def bad_path(path, base):
+    # joinpath will ignore base if path is absolute
+    return not realpath(abspath(joinpath(base, path))).startswith(base)
+
+
+class _PathChecker(object):
+    """ bad_path() resolving every parent folder once. The resolved folders have to be
+    clear()ed after creating any symlink
+    """
+    def __init__(self, base):
+        self._base = base
+        self._folders = {}
+
+    def clear(self):
+        self._folders.clear()
+
+    def _realpath(self, folder):
+        result = self._folders.get(folder)
+        if result is None:
+            result = self._folders[folder] = realpath(folder)
+        return result
+
+    def bad(self, path):
+        path = abspath(joinpath(self._base, path))
+        folder, name = os.path.split(path)
+        if name in ("", os.path.curdir, os.path.pardir):
+            return bad_path(path, self._base)
+        path = joinpath(self._realpath(folder), name)
+        if os.path.islink(path):
+            path = realpath(path)
+        return not path.startswith(self._base)
+
+
+def safe_tar_members(members, base, excluded=None, hard_links=False, sym_links=True):
+    """ The 'members' inside the 'base' folder, with the "\\" of the paths of tars created in
+    Windows fixed. The hard links are skipped, unless 'hard_links' and linking to a member
+    inside 'base', and the symlinks too if not 'sym_links'. The 'excluded' member names are
+    skipped too
+    """
+    checker = _PathChecker(base)
+    for finfo in members:
+        if checker.bad(finfo.name):
+            continue
+        if finfo.islnk() and (not hard_links or checker.bad(finfo.linkname)):
+            continue
+        if finfo.issym() and not sym_links:
+            continue
+        # Fixes unzip a windows zipped file in linux
+        finfo.name = finfo.name.replace("\\", "/")
+        if excluded and finfo.name in excluded:
+            continue
+        yield finfo
+        if finfo.issym():  # Extracted after yielding it
+            checker.clear()
+
+
+class _PrefixedStream(object):
+    """ The already read 'prefix' followed by the rest of the 'stream'
+    """
+    def __init__(self, prefix, stream):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size=-1):
+        if not self._prefix:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            result, self._prefix = self._prefix + self._stream.read(), b""
+            return result
+        result, self._prefix = self._prefix[:size], self._prefix[size:]
+        if len(result) < size:
+            result += self._stream.read(size - len(result))
+        return result
+
+
+def _decompressed_stream(fileobj):
+    """ The (stream, tarfile mode) to read the 'fileobj' tar. The gzip and bz2 ones are
+    decompressed here, much faster than with the tarfile "r|*" mode, that detects the others
+    """
+    if six.PY2:  # Its gzip and bz2 modules need seekable files
+        return fileobj, "r|*"
+    head = fileobj.read(3)
+    stream = _PrefixedStream(head, fileobj)
+    if head.startswith(b"\x1f\x8b"):
+        import gzip
+        return gzip.GzipFile(fileobj=stream, mode="rb"), "r|"
+    if head.startswith(b"BZh"):
+        import bz2
+        return bz2.BZ2File(stream, mode="rb"), "r|"
+    return stream, "r|*"  # xz, uncompressed...
+
+
+def extract_tar(filename=None, destination=".", fileobj=None, links=True):
+    """ Extracts the 'filename' tar, or reads it sequentially from 'fileobj', as a download.
+    Without 'links' the symlinks and hard links members are skipped
+    """
+    import tarfile
+    if fileobj is not None:
+        stream, mode = _decompressed_stream(fileobj)
+        the_tar = tarfile.open(fileobj=stream, mode=mode)
+    else:
+        the_tar = tarfile.open(filename, "r:*")
+    the_tar.copybufsize = BUFFER_SIZE
+    try:
+        base = realpath(abspath(destination))
+        the_tar.extractall(destination, members=safe_tar_members(the_tar, base,
+                                                                 hard_links=links,
+                                                                 sym_links=links))
+    finally:
+        the_tar.close()
+
+
+def _zip_target(name, base):
+    """ The extraction path of the 'name' member, as ZipFile.extract() computes it: without
+    drive, root or parent folder references, so always inside 'base'. None for the archive root
+    """
+    arcname = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    arcname = os.path.sep.join(x for x in arcname.split(os.path.sep)
+                               if x not in ("", os.path.curdir, os.path.pardir))
+    if os.path.sep == "\\" and hasattr(zipfile.ZipFile, "_sanitize_windows_name"):
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.path.sep)
+    if not arcname:
+        return None
+    return joinpath(base, arcname)
+
+
+def _permissions(member):
+    # Could be dangerous if the ZIP has been created in a non nix system
+    # https://bugs.python.org/issue15795
+    return member.external_attr >> 16 & 0xFFF
+
+
+def extract_zip(filename, destination=".", keep_permissions=False, progress=None, error=None,
+                threads=None):
+    """ Extracts the 'filename' zip, calling progress(member) after extracting every member,
+    and error(member, exception) for every member that could not be extracted
+    """
+    if threads is None:
+        threads = min(EXTRACT_THREADS, multiprocessing.cpu_count())
+    base = realpath(abspath(destination))
+    main_zip = zipfile.ZipFile(filename, "r")
+    try:
+        _extract_zip(main_zip, filename, base, keep_permissions, progress, error, threads)
+    finally:
+        main_zip.close()
+
+
+def _extract_zip(main_zip, filename, base, keep_permissions, progress, error, threads):
+    members = main_zip.infolist()
+
+    files, folders, folder_members = [], set([base]), []
+    for member in members:
+        target = _zip_target(member.filename, base)
+        if target is None:
+            continue
+        if member.filename.endswith("/"):
+            folders.add(target)
+            folder_members.append((member, target))
+        else:
+            folders.add(os.path.dirname(target))
+            files.append((member, target))
+    for folder in sorted(folders):
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+    handles = threading.local()
+    handles.zip = main_zip  # The other threads open their own handles
+    opened = []
+    lock = threading.Lock()
+
+    def extract(chunk):
+        the_zip = getattr(handles, "zip", None)
+        if the_zip is None:
+            the_zip = handles.zip = zipfile.ZipFile(filename, "r")
+            with lock:
+                opened.append(the_zip)
+        result = []
+        for member, target in chunk:
+            try:
+                source = the_zip.open(member)
+                try:
+                    with open(target, "wb") as handle:
+                        shutil.copyfileobj(source, handle, BUFFER_SIZE)
+                finally:
+                    source.close()
+                if keep_permissions:
+                    os.chmod(target, _permissions(member))
+                result.append((member, None))
+            except Exception as e:
+                result.append((member, e))
+        return result
+
+    chunks = [files[i:i + CHUNK_MEMBERS] for i in range(0, len(files), CHUNK_MEMBERS)]
+    threads = min(threads, len(chunks))
+    try:
+        if threads > 1:
+            pool = ThreadPool(threads)
+            try:
+                _notify(pool.imap_unordered(extract, chunks), progress, error)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            _notify(map(extract, chunks), progress, error)
+    finally:
+        for the_zip in opened:
+            the_zip.close()
+
+    if keep_permissions:  # After extracting their files, they could be read only
+        for member, target in folder_members:
+            os.chmod(target, _permissions(member))
+
+
+def _notify(chunk_results, progress, error):
+    for chunk_result in chunk_results:
+        for member, exc in chunk_result:
+            if exc is not None and error:
+                error(member, exc)
+            if progress:
+                progress(member)
@@ -3,10 +3,11 @@ import shutil
 from errno import ENOENT, EEXIST
 import hashlib
 import sys
-from os.path import abspath, realpath, join as joinpath
+from os.path import abspath, realpath
 import platform
 import re
 import six
+from conans.util.extract import safe_tar_members
 from conans.util.log import logger
 import tarfile
 import stat
@@ -16,10 +17,26 @@ def make_read_only(path):
     for root, _, files in os.walk(path):
         for f in files:
             full_path = os.path.join(root, f)
+            if os.path.islink(full_path):  # Never modify the linked file
+                continue
             mode = os.stat(full_path).st_mode
             os.chmod(full_path, mode & ~ stat.S_IWRITE)
 
 
+def make_writable(path):
+    """ Gives write permission to the user for the files of 'path', copied from read-only
+    ones (e.g. linked to the cache blobs), that the recipes can modify
+    """
+    for root, _, files in os.walk(path):
+        for f in files:
+            full_path = os.path.join(root, f)
+            if os.path.islink(full_path):  # Never modify the linked file
+                continue
+            mode = os.stat(full_path).st_mode
+            if not mode & stat.S_IWRITE:
+                os.chmod(full_path, mode | stat.S_IWRITE)
+
+
 _DIRTY_FOLDER = ".dirty"
 
 
@@ -111,6 +128,20 @@ def save(path, content, append=False):
         handle.write(to_file_bytes(content))
 
 
+def save_if_changed(path, content):
+    """ save() only if the file does not exist or has different contents, not to modify the
+    file timestamp otherwise. Returns True if the file is written
+    """
+    content = to_file_bytes(content)
+    try:
+        if os.path.getsize(path) == len(content) and load(path, binary=True) == content:
+            return False
+    except (IOError, OSError):  # Not existing
+        pass
+    save(path, content)
+    return True
+
+
 def to_file_bytes(content):
     if six.PY3:
         if not isinstance(content, bytes):
@@ -158,6 +189,17 @@ def rmdir(path):
         raise
 
 
+def replace_file(src, dst):
+    """Moves src to dst, overwriting dst. Atomic if both are in the same file system
+    (in Python 2 and Windows the existing dst has to be removed first)"""
+    if six.PY3:
+        os.replace(src, dst)
+    else:
+        if platform.system() == "Windows" and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
 def mkdir(path):
     """Recursive mkdir, doesnt fail if already existing"""
     try:
@@ -226,29 +268,15 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
     return t
 
 
-def tar_extract(fileobj, destination_dir):
+def tar_extract(fileobj, destination_dir, excluded=None):
     """Extract tar file controlling not absolute paths and fixing the routes
-    if the tar was zipped in windows"""
-    def badpath(path, base):
-        # joinpath will ignore base if path is absolute
-        return not realpath(abspath(joinpath(base, path))).startswith(base)
-
-    def safemembers(members):
-        base = realpath(abspath("."))
-
-        for finfo in members:
-            if badpath(finfo.name, base) or finfo.islnk():
-                continue
-            else:
-                # Fixes unzip a windows zipped file in linux
-                finfo.name = finfo.name.replace("\\", "/")
-                yield finfo
-
+    if the tar was zipped in windows. The 'excluded' members are not extracted"""
     the_tar = tarfile.open(fileobj=fileobj)
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error
-    the_tar.extractall(path=destination_dir, members=safemembers(the_tar))
+    the_tar.extractall(path=destination_dir,
+                       members=safe_tar_members(the_tar, realpath(abspath(".")), excluded))
     the_tar.close()
 
 
@@ -0,0 +1,140 @@
+""" Materialization of files and folders from the local cache: source -> build folders,
+export -> source folders, copied packages and imported files. The CONAN_MATERIALIZE_MODE
+env var (general.materialize_mode) selects the cheapest allowed way:
+
+    - copy: byte by byte copy, the default
+    - reflink: copy-on-write clone of the file (FICLONE ioctl: btrfs, xfs...), so no data
+               is duplicated until one of the files is modified. Falls back to copy
+    - hardlink: as reflink, but files without write permissions (read-only cache, see
+                CONAN_READ_ONLY_CACHE) are hardlinked where allowed
+    - symlink: as hardlink, but the read-only files are symlinked where allowed
+
+Every caller limits the mode with 'max_mode': the source and build folders can be modified
+by the recipes, so they never link to the cache content.
+"""
+import errno
+import os
+import shutil
+import stat
+
+from conans.errors import ConanException
+from conans.util.env_reader import get_env
+
+COPY, REFLINK, HARDLINK, SYMLINK = MATERIALIZE_MODES = ("copy", "reflink", "hardlink",
+                                                        "symlink")
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+
+# {(src device, dst device)} where reflinks are not supported, not to try them again
+_no_reflink_devices = set()
+
+
+def materialize_mode(max_mode=SYMLINK):
+    mode = get_env("CONAN_MATERIALIZE_MODE", COPY, environment=os.environ) or COPY
+    if mode not in MATERIALIZE_MODES:
+        raise ConanException("Invalid CONAN_MATERIALIZE_MODE '%s', allowed values: %s"
+                             % (mode, ", ".join(MATERIALIZE_MODES)))
+    return min(mode, max_mode, key=MATERIALIZE_MODES.index)
+
+
+def _read_only(path):
+    return not os.stat(path).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _reflink(src, dst):
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        return False
+    devices = (os.stat(src).st_dev, os.stat(os.path.dirname(dst) or ".").st_dev)
+    if devices in _no_reflink_devices:
+        return False
+    try:
+        with open(src, "rb") as src_file:
+            with open(dst, "wb") as dst_file:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    except (IOError, OSError) as exc:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        if exc.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL,
+                         errno.ENOSYS):
+            _no_reflink_devices.add(devices)
+            return False
+        raise
+    shutil.copystat(src, dst)
+    return True
+
+
+def materialize_file(src, dst, mode):
+    """ Materializes the 'src' file as 'dst', as shutil.copy2() does, with the given mode
+    """
+    # Never write through a previously linked file, it would modify the cache
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if mode in (HARDLINK, SYMLINK) and _read_only(src):
+        try:
+            if mode == SYMLINK:
+                os.symlink(os.path.abspath(src), dst)
+            else:
+                os.link(src, dst)
+            return dst
+        except (AttributeError, OSError):  # No links in this platform or file system
+            pass
+    if mode != COPY and _reflink(src, dst):
+        return dst
+    shutil.copy2(src, dst)
+    return dst
+
+
+def materialize_tree(src, dst, max_mode, symlinks=True, ignore=None):
+    """ shutil.copytree() materializing the files with the mode given by
+    CONAN_MATERIALIZE_MODE, limited to 'max_mode'
+    """
+    mode = materialize_mode(max_mode)
+    if mode == COPY:
+        shutil.copytree(src, dst, symlinks=symlinks, ignore=ignore)
+    else:
+        _materialize_tree(src, dst, mode, symlinks, ignore)
+
+
+def _materialize_tree(src, dst, mode, symlinks, ignore):
+    names = os.listdir(src)
+    ignored_names = ignore(src, names) if ignore is not None else set()
+    os.makedirs(dst)
+    for name in names:
+        if name in ignored_names:
+            continue
+        src_name = os.path.join(src, name)
+        dst_name = os.path.join(dst, name)
+        if symlinks and os.path.islink(src_name):
+            os.symlink(os.readlink(src_name), dst_name)
+        elif os.path.isdir(src_name):
+            _materialize_tree(src_name, dst_name, mode, symlinks, ignore)
+        else:
+            materialize_file(src_name, dst_name, mode)
+    shutil.copystat(src, dst)
+
+
+def link_tree(src, dst):
+    """ Creates 'dst' with the folders of 'src' and absolute symlinks to all its files, copied
+    where symlinks are not supported. Only for files that never change, as the ones of the
+    read-only lower caches. The symlinks of 'src' are copied as they are
+    """
+    for root, dirs, files in os.walk(src):
+        target = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+        os.makedirs(target)
+        for name in list(dirs):
+            if os.path.islink(os.path.join(root, name)):  # os.walk() does not follow them
+                dirs.remove(name)
+                os.symlink(os.readlink(os.path.join(root, name)), os.path.join(target, name))
+        for name in files:
+            src_file, dst_file = os.path.join(root, name), os.path.join(target, name)
+            if os.path.islink(src_file):
+                os.symlink(os.readlink(src_file), dst_file)
+                continue
+            try:
+                os.symlink(os.path.abspath(src_file), dst_file)
+            except (AttributeError, OSError):  # No symlinks in this platform or file system
+                shutil.copy2(src_file, dst_file)
+    shutil.copystat(src, dst)
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+
+
+class MergedList(object):
+    """ Accumulates lists with the ordering of merge_lists(seq1, seq2), which is
+    [s for s in seq1 if s not in seq2] + seq2, in time linear with the size of the merged
+    lists instead of scanning the accumulated list for every item:
+
+        MergedList().merge(seq)              <=> values = merge_lists(values, seq)
+        MergedList(prepend=True).merge(seq)  <=> values = merge_lists(seq, values)
+
+    The items are kept in an insertion ordered dict, keyed by (item, occurrence) so repeated
+    items are kept as merge_lists() does. Prepended items are stored reversed, so every
+    merge is an append. The resulting list is computed and cached by values(); if that list
+    is modified, it is taken as the new content in the next merge.
+    """
+    def __init__(self, prepend=False):
+        self._prepend = prepend
+        self._items = OrderedDict()  # {(item, occurrence): None}
+        self._counts = {}  # {item: occurrences}
+        self._values = None
+
+    def _append(self, items):
+        for item in items:
+            occurrence = self._counts.get(item, 0)
+            self._items[(item, occurrence)] = None
+            self._counts[item] = occurrence + 1
+
+    def _reset(self, values):
+        self._items.clear()
+        self._counts.clear()
+        self._append(reversed(values) if self._prepend else values)
+        self._values = None
+
+    def merge(self, seq):
+        if self._values is not None:
+            self._reset(self._values)
+        if self._prepend:
+            # merge_lists(seq, values): new items of seq, in front of the current ones
+            self._append(reversed([item for item in seq if item not in self._counts]))
+        else:
+            # merge_lists(values, seq): the items of seq are moved to the end
+            for item in set(seq):
+                for occurrence in range(self._counts.pop(item, 0)):
+                    del self._items[(item, occurrence)]
+            self._append(seq)
+
+    def values(self):
+        if self._values is None:
+            values = [item for item, _ in self._items]
+            if self._prepend:
+                values.reverse()
+            self._values = values  # Never published before being complete
+        return self._values
+
+    def set_values(self, values):
+        self._values = values  # The items are reset from it in the next merge
@@ -1,4 +1,9 @@
+import atexit
 import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
 from conans.errors import ConanException
 import fasteners
 
@@ -17,7 +22,8 @@ TRACER_ACTIONS = ["UPLOADED_RECIPE", "UPLOADED_PACKAGE",
                   "REST_API_CALL", "COMMAND",
                   "EXCEPTION",
                   "DOWNLOAD",
-                  "UNZIP", "ZIP"]
+                  "UNZIP", "ZIP",
+                  "SPAN"]
 
 MASKED_FIELD = "**********"
 
@@ -45,13 +51,84 @@ def _get_tracer_file():
     return trace_path
 
 
+class _TraceWriter(object):
+    """ Buffers the trace lines and writes them from a background thread, taking the
+    inter-process file lock once per batch instead of once per event. Pending lines are
+    written at exit and with flush(), called at the end of every API command
+    """
+    flush_interval = 0.5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._pid = None
+
+    def append(self, filepath, line):
+        with self._lock:
+            self._pending.append((filepath, line))
+            if self._pid != os.getpid():  # Not started yet, or forked process
+                self._pid = os.getpid()
+                thread = threading.Thread(target=self._run, name="conan_tracer")
+                thread.daemon = True
+                thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as exc:
+                logger.error("Error writing trace file: %s" % str(exc))
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            lines_by_file = OrderedDict()
+            for filepath, line in pending:
+                lines_by_file.setdefault(filepath, []).append(line)
+            for filepath, lines in lines_by_file.items():
+                with fasteners.InterProcessLock(filepath + ".lock", logger=logger):
+                    with open(filepath, "a") as logfile:
+                        logfile.write("".join(lines))
+
+
+_writer = _TraceWriter()
+atexit.register(_writer.flush)
+
+
+def flush_trace():
+    """Writes to the trace file all the buffered events"""
+    _writer.flush()
+
+
+def tracing_enabled():
+    return bool(_get_tracer_file())
+
+
+# Callables receiving every action (name, props), even without trace file, e.g. to
+# summarize the timings of a command
+_action_listeners = []
+
+
+def add_action_listener(listener):
+    _action_listeners.append(listener)
+
+
+def remove_action_listener(listener):
+    _action_listeners.remove(listener)
+
+
+def _recording():
+    return bool(_action_listeners) or tracing_enabled()
+
+
 def _append_to_log(obj):
-    """Add a new line to the log file locking the file to protect concurrent access"""
-    if _get_tracer_file():
-        filepath = _get_tracer_file()
-        with fasteners.InterProcessLock(filepath + ".lock", logger=logger):
-            with open(filepath, "a") as logfile:
-                logfile.write(json.dumps(obj, sort_keys=True) + "\n")
+    """Queue a new line for the log file, the background writer will append it"""
+    filepath = _get_tracer_file()
+    if filepath:
+        _writer.append(filepath, json.dumps(obj, sort_keys=True) + "\n")
 
 
 def _append_action(action_name, props):
@@ -59,19 +136,60 @@ def _append_action(action_name, props):
     _validate_action(action_name)
     props["_action"] = action_name
     props["time"] = time.time()
+    for listener in _action_listeners:
+        listener(action_name, props)
     _append_to_log(props)
 
 
+@contextmanager
+def trace_span(name, _id=None):
+    """Logs a SPAN action with the duration of the wrapped block, to know where the time goes"""
+    t1 = time.time()
+    try:
+        yield
+    finally:
+        if _recording():
+            _append_action("SPAN", {"name": name, "_id": _id, "duration": time.time() - t1})
+
+
+# Checksums computed while the files are transferred, so they are not read again just
+# to be logged {abs_path: (size, mtime, md5, sha1)}
+_transfer_checksums = {}
+
+
+def register_file_checksums(path, md5=None, sha1=None):
+    """Called by the transfer code with the checksums of an uploaded/downloaded file"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    _transfer_checksums[path] = (st.st_size, st.st_mtime, md5, sha1)
+
+
 # ############## LOG METHODS ######################
 
+def _file_documents(files):
+    """The files are only hashed if they are going to be written to the trace file"""
+    if not files or not tracing_enabled():
+        return []
+    return [_file_document(name, path) for name, path in files.items()]
+
+
 def _file_document(name, path):
-    return {"name": name, "path": path, "md5": md5sum(path), "sha1": sha1sum(path)}
+    md5 = sha1 = None
+    checksums = _transfer_checksums.pop(path, None)
+    if checksums:
+        st = os.stat(path)
+        if checksums[:2] == (st.st_size, st.st_mtime):
+            md5, sha1 = checksums[2:]
+    return {"name": name, "path": path, "md5": md5 or md5sum(path), "sha1": sha1 or sha1sum(path)}
 
 
 def log_recipe_upload(conan_reference, duration, files_uploaded, remote):
+    if not _recording():
+        return
     assert(isinstance(conan_reference, ConanFileReference))
-    files_uploaded = files_uploaded or {}
-    files_uploaded = [_file_document(name, path) for name, path in files_uploaded.items()]
+    files_uploaded = _file_documents(files_uploaded)
     _append_action("UPLOADED_RECIPE", {"_id": str(conan_reference),
                                        "duration": duration,
                                        "files": files_uploaded,
@@ -80,9 +198,10 @@ def log_recipe_upload(conan_reference, duration, files_uploaded, remote):
 
 def log_package_upload(package_ref, duration, files_uploaded, remote):
     """files_uploaded is a dict with relative path as keys and abs path as values"""
+    if not _recording():
+        return
     assert(isinstance(package_ref, PackageReference))
-    files_uploaded = files_uploaded or {}
-    files_uploaded = [_file_document(name, path) for name, path in files_uploaded.items()]
+    files_uploaded = _file_documents(files_uploaded)
     _append_action("UPLOADED_PACKAGE", {"_id": str(package_ref),
                                         "duration": duration,
                                         "files": files_uploaded,
@@ -90,9 +209,10 @@ def log_package_upload(package_ref, duration, files_uploaded, remote):
 
 
 def log_recipe_download(conan_reference, duration, remote, files_downloaded):
+    if not _recording():
+        return
     assert(isinstance(conan_reference, ConanFileReference))
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded)
     _append_action("DOWNLOADED_RECIPE", {"_id": str(conan_reference),
                                          "duration": duration,
                                          "remote": remote.name,
@@ -100,9 +220,10 @@ def log_recipe_download(conan_reference, duration, remote, files_downloaded):
 
 
 def log_recipe_sources_download(conan_reference, duration, remote, files_downloaded):
+    if not _recording():
+        return
     assert(isinstance(conan_reference, ConanFileReference))
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded)
     _append_action("DOWNLOADED_RECIPE_SOURCES", {"_id": str(conan_reference),
                                                  "duration": duration,
                                                  "remote": remote.name,
@@ -110,9 +231,10 @@ def log_recipe_sources_download(conan_reference, duration, remote, files_downloa
 
 
 def log_package_download(package_ref, duration, remote, files_downloaded):
+    if not _recording():
+        return
     assert(isinstance(package_ref, PackageReference))
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded)
     _append_action("DOWNLOADED_PACKAGE", {"_id": str(package_ref),
                                           "duration": duration,
                                           "remote": remote.name,
@@ -162,6 +284,7 @@ def log_uncompressed_file(src_path, duration, dest_folder):
 
 
 def log_compressed_files(files, duration, tgz_path):
-    files = files or {}
-    files_compressed = [_file_document(name, path) for name, path in files.items()]
+    if not _recording():
+        return
+    files_compressed = _file_documents(files)
     _append_action("ZIP", {"src": files_compressed, "dst": tgz_path, "duration": duration})